@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Alinhamento Transcrição × Diarização
+=================================================
+
+Gera sessões sintéticas (padrão: 4 horas) com turnos de diarização e
+segmentos do Whisper aleatórios e compara:
+- a varredura linear original pelo ponto médio do segmento;
+- a árvore de intervalos de `tools/speaker_alignment.py` (maior sobreposição).
+
+Também mede o caso de um turno longo, cobrindo a sessão inteira, somado a
+turnos curtos de um segundo (ex.: um participante cuja voz de fundo é
+detectada do início ao fim), que degradava índices baseados em varredura.
+
+Uso:
+    python benchmark_alignment.py               # Sessão de 4 horas
+    python benchmark_alignment.py --hours 8     # Sessão de 8 horas
+    python benchmark_alignment.py --repeat 5    # Média de 5 execuções
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "tools"))
+
+from speaker_alignment import assign_speakers
+
+
+def synthetic_session(hours: float, speakers: int = 25, seed: int = 42):
+    """Gera turnos de diarização e segmentos de transcrição para uma sessão."""
+    rng = random.Random(seed)
+    duration = hours * 3600
+
+    turns, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(1.5, 40.0)
+        turns.append({
+            "speaker": f"SPEAKER_{rng.randrange(speakers):02d}",
+            "start": t,
+            "end": t + length,
+            "duration": length,
+        })
+        # Pequenas sobreposições e pausas entre turnos
+        t += length + rng.uniform(-0.8, 1.5)
+
+    segments, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(1.0, 8.0)
+        segments.append({"start": t, "end": t + length, "text": " palavra" * int(length * 2.5)})
+        t += length + rng.uniform(0.0, 0.5)
+
+    return segments, turns
+
+
+def long_turn_session(hours: float, speakers: int = 25):
+    """Um turno do início ao fim da sessão mais turnos curtos de um segundo."""
+    duration = int(hours * 3600)
+    turns = [{"speaker": "SPEAKER_LONGO", "start": 0.0, "end": float(duration), "duration": float(duration)}]
+    turns += [{
+        "speaker": f"SPEAKER_{second % speakers:02d}",
+        "start": float(second),
+        "end": second + 0.9,
+        "duration": 0.9,
+    } for second in range(duration - 1)]
+    segments = [{"start": second + 0.1, "end": second + 0.8, "text": " palavra"}
+                for second in range(duration - 1)]
+    return segments, turns
+
+
+def legacy_assign(segments, speakers_info):
+    """Implementação original de AtaSystemUFS.transcribe_with_diarization."""
+    aligned = []
+    for segment in segments:
+        segment_center = (segment["start"] + segment["end"]) / 2
+        assigned_speaker = "PARTICIPANTE"
+        for speaker_info in speakers_info:
+            if speaker_info["start"] <= segment_center <= speaker_info["end"]:
+                assigned_speaker = speaker_info["speaker"]
+                break
+        aligned.append(assigned_speaker)
+    return aligned
+
+
+def measure(function, repeat: int) -> float:
+    """Menor tempo de execução em segundos entre `repeat` rodadas."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do alinhamento de participantes")
+    parser.add_argument('--hours', type=float, default=4.0, help='Duração da sessão sintética')
+    parser.add_argument('--repeat', type=int, default=3, help='Rodadas por implementação')
+    args = parser.parse_args()
+
+    segments, turns = synthetic_session(args.hours)
+    print(f"Sessão sintética: {args.hours:.1f} h, {len(turns)} turnos, {len(segments)} segmentos")
+
+    legacy = measure(lambda: legacy_assign(segments, turns), args.repeat)
+    indexed = measure(lambda: assign_speakers(segments, turns), args.repeat)
+
+    agreement = sum(
+        old == new["speaker"]
+        for old, new in zip(legacy_assign(segments, turns), assign_speakers(segments, turns))
+    ) / len(segments)
+
+    print(f"Varredura linear (ponto médio):      {legacy * 1000:10.1f} ms")
+    print(f"Árvore de intervalos (sobreposição): {indexed * 1000:10.1f} ms")
+    print(f"Speedup: {legacy / indexed:.1f}x")
+    print(f"Concordância entre os métodos: {agreement:.1%}")
+
+    segments, turns = long_turn_session(args.hours)
+    indexed = measure(lambda: assign_speakers(segments, turns), args.repeat)
+    print(f"\nTurno longo: 1 turno de {args.hours:.1f} h + {len(turns) - 1} turnos curtos, "
+          f"{len(segments)} segmentos")
+    print(f"Árvore de intervalos (sobreposição): {indexed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos Backends de Transcrição
+=====================================
+
+Transcreve o mesmo trecho fixo de uma sessão com cada backend de
+`tools/asr_backends.py` e compara:
+- fator de tempo real (RTF = tempo de transcrição / duração do áudio);
+- tempo de carregamento do modelo;
+- pico de memória residente (RSS) do processo;
+- concordância do texto com o primeiro backend da lista.
+
+Cada backend roda em um processo próprio, para que o pico de memória de um
+não contamine a medição do outro.
+
+Uso:
+    python benchmark_asr.py sessao.wav                          # 120 s iniciais, modelo small
+    python benchmark_asr.py sessao.wav --start 600 --seconds 300 --model base
+    python benchmark_asr.py sessao.wav --backends faster-whisper --threads 8
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import difflib
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Dict, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "tools"))
+
+from asr_backends import BACKENDS, FasterWhisperBackend, load_backend
+from audio_loader import SAMPLE_RATE, load_audio
+
+
+def run_backend(name: str, model: str, audio: str, start: float, seconds: float,
+                threads: int, language: str, queue):
+    """Executa um backend em processo isolado e devolve as medições pela fila."""
+    import numpy as np
+
+    samples = np.array(load_audio(audio)[int(start * SAMPLE_RATE):int((start + seconds) * SAMPLE_RATE)])
+
+    began = time.perf_counter()
+    if name == FasterWhisperBackend.name:
+        backend = load_backend(name, model, cpu_threads=threads)
+    else:
+        import torch
+
+        torch.set_num_threads(threads)
+        backend = load_backend(name, model, device="cpu")
+    load_time = time.perf_counter() - began
+
+    began = time.perf_counter()
+    result = backend.transcribe(samples, language=language)
+    elapsed = time.perf_counter() - began
+
+    queue.put({
+        "backend": name,
+        "duration": samples.size / SAMPLE_RATE,
+        "load_time": load_time,
+        "elapsed": elapsed,
+        # ru_maxrss está em KB no Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "segments": len(result["segments"]),
+        "text": result["text"].strip(),
+    })
+
+
+def collect_result(process, queue) -> Optional[Dict]:
+    """Aguarda as medições de um processo, ou None se ele terminar sem enviá-las."""
+    while True:
+        try:
+            return queue.get(timeout=5.0)
+        except Empty:
+            # Um processo que morreu (ex.: falta de memória) nunca enviará o resultado
+            if process.exitcode is not None:
+                try:
+                    return queue.get_nowait()
+                except Empty:
+                    return None
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de transcrição")
+    parser.add_argument('audio', help='Arquivo de áudio de referência')
+    parser.add_argument('--start', type=float, default=0.0, help='Início do trecho (s)')
+    parser.add_argument('--seconds', type=float, default=120.0, help='Duração do trecho (s)')
+    parser.add_argument('--model', default='small', help='Modelo Whisper (padrão: small)')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS),
+                        help='Backends comparados')
+    parser.add_argument('--threads', type=int, default=4, help='Threads por backend')
+    parser.add_argument('--language', default='pt', help='Idioma da transcrição')
+    args = parser.parse_args()
+
+    # Gera o .npy antes dos processos de medição (a decodificação não entra na conta)
+    load_audio(args.audio)
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in args.backends:
+        queue = context.Queue()
+        process = context.Process(target=run_backend, args=(
+            name, args.model, args.audio, args.start, args.seconds,
+            args.threads, args.language, queue))
+        process.start()
+        result = collect_result(process, queue)
+        process.join()
+        if result is None:
+            print(f"❌ {name}: processo encerrado sem resultado (código {process.exitcode})")
+            continue
+        results.append(result)
+
+    if not results:
+        sys.exit(1)
+
+    print(f"Trecho: {results[0]['duration']:.1f} s de {args.audio} | "
+          f"modelo {args.model} | {args.threads} threads")
+    print(f"{'Backend':<16}{'Carga':>9}{'Transcrição':>14}{'RTF':>8}{'Pico RSS':>12}{'Concordância':>15}")
+    reference = results[0]["text"].split()
+    for result in results:
+        agreement = difflib.SequenceMatcher(None, reference, result["text"].split()).ratio()
+        print(f"{result['backend']:<16}{result['load_time']:>8.1f}s{result['elapsed']:>13.1f}s"
+              f"{result['elapsed'] / result['duration']:>8.2f}{result['peak_rss_mb']:>9.0f} MB"
+              f"{agreement:>15.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Busca Semântica
+============================
+
+Mede a latência de consulta de `tools/semantic_index.py` conforme o acervo
+cresce. O índice é preenchido com vetores sintéticos normalizados (sem
+carregar o modelo de embeddings) e metadados aleatórios de conselho e data
+entre 2015 e 2025; a cada tamanho são medidas consultas:
+- sem filtro (varredura de toda a matriz);
+- filtradas por conselho (cerca de metade das linhas);
+- filtradas por conselho e ano (cerca de 5% das linhas).
+
+Uso:
+    python benchmark_semantic.py                                # 10 mil, 100 mil e 300 mil trechos
+    python benchmark_semantic.py --sizes 10000 1000000 --dim 384 --queries 50
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "tools"))
+
+from semantic_index import SemanticIndex
+
+CHUNK_ROWS = 50000
+
+
+def synthetic_rows(rng: np.random.Generator, first: int, count: int, dim: int):
+    """Metadados e vetores normalizados de `count` trechos sintéticos."""
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    councils = rng.choice(["consu", "conepe"], count)
+    years = rng.integers(2015, 2026, count)
+    entries = [{
+        "path": f"sintetico/{(first + i) // 400}", "kind": "transcricao",
+        "conselho": str(councils[i]), "data_reuniao": f"{years[i]}-06-15",
+        "numero_sessao": str((first + i) // 400), "speaker": "SPEAKER_00",
+        "start_ms": (i % 400) * 20000, "end_ms": (i % 400) * 20000 + 19000,
+        "text": f"trecho {first + i}",
+    } for i in range(count)]
+    return entries, vectors
+
+
+def measure(index: SemanticIndex, queries: np.ndarray, **filters) -> np.ndarray:
+    """Latências (ms) de cada consulta."""
+    latencies = []
+    for query in queries:
+        began = time.perf_counter()
+        index.search_vector(query, top_k=10, **filters)
+        latencies.append((time.perf_counter() - began) * 1000)
+    return np.array(latencies)
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark da busca semântica")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000],
+                        help='Tamanhos do acervo (trechos) medidos')
+    parser.add_argument('--dim', type=int, default=384, help='Dimensão dos vetores')
+    parser.add_argument('--queries', type=int, default=20, help='Consultas por medição')
+    parser.add_argument('--seed', type=int, default=42, help='Semente aleatória')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    directory = Path(tempfile.mkdtemp(prefix="semantic_bench_"))
+    index = SemanticIndex(directory=directory, dim=args.dim)
+    scenarios = [
+        ("sem filtro", {}),
+        ("conselho", {"council": "consu"}),
+        ("conselho+ano", {"council": "consu", "date_from": "2024-01-01", "date_to": "2024-12-31"}),
+    ]
+
+    print(f"Vetores de dimensão {args.dim} | {args.queries} consultas por medição | top 10")
+    print(f"{'Trechos':>10}{'Matriz':>10}{'Inserção':>11}" +
+          "".join(f"{name + ' p50/p95':>26}" for name, _ in scenarios))
+    try:
+        for size in sorted(args.sizes):
+            began = time.perf_counter()
+            while index.rows < size:
+                count = min(CHUNK_ROWS, size - index.rows)
+                index.add_vectors(*synthetic_rows(rng, index.rows, count, args.dim))
+            insert_time = time.perf_counter() - began
+
+            # Primeira consulta fora da medição: mapeia a matriz e aquece o cache de páginas
+            index.search_vector(queries[0])
+            columns = []
+            for _, filters in scenarios:
+                latencies = measure(index, queries, **filters)
+                columns.append(f"{np.median(latencies):>12.1f} / {np.percentile(latencies, 95):>6.1f} ms")
+            print(f"{size:>10}{index.statistics()['size_mb']:>7.0f} MB{insert_time:>10.1f}s" +
+                  "".join(f"{column:>26}" for column in columns))
+    finally:
+        index.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Servidor Local Compatível com a API de Chat da OpenAI
+=====================================================
+
+Servidor mínimo para testes e cargas sem custo: responde a
+`POST /v1/chat/completions` com uma ata fictícia, com latência configurável
+e, opcionalmente, uma fração de respostas 429 para exercitar as novas
+tentativas do gateway.
+
+Uso:
+    python mock_llm_server.py                        # Porta 8000
+    python mock_llm_server.py --latency 0.5          # 500 ms por resposta
+    python mock_llm_server.py --error-rate 0.2       # 20% de respostas 429
+
+    export OPENAI_BASE_URL=http://localhost:8000/v1
+    python ../tools/ata_demo.py --api-key mock
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_ATA = """## ATA DE REUNIÃO
+
+### PAUTA
+- Item de pauta fictício gerado pelo servidor de testes
+
+### DELIBERAÇÕES
+- Aprovado por unanimidade
+
+### ENCAMINHAMENTOS
+- Nenhum
+"""
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Trata as chamadas de chat completions."""
+
+    latency = 0.0
+    error_rate = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self._send(429, {"error": {"message": "rate limited"}}, {"Retry-After": "0.1"})
+            return
+
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        self._send(200, {
+            "id": "mock-completion",
+            "object": "chat.completion",
+            "model": payload.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": MOCK_ATA},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(MOCK_ATA) // 4},
+        })
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Servidor local compatível com a API da OpenAI")
+    parser.add_argument('--port', type=int, default=8000, help='Porta (padrão: 8000)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência por resposta em segundos')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas 429')
+    args = parser.parse_args()
+
+    MockHandler.latency = args.latency
+    MockHandler.error_rate = args.error_rate
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), MockHandler)
+    print(f"🧪 Servidor de testes em http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
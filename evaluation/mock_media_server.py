@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Servidor Local de Mídia para Testes do Scraper
+==============================================
+
+Serve os arquivos de um diretório por HTTP com suporte a `Range`, de modo
+que o yt-dlp (extrator genérico, URL direta) possa baixá-los e retomá-los.
+Com `--drop-after`, cada resposta é interrompida depois de N bytes,
+simulando quedas de conexão: o download só termina retomando o arquivo
+parcial (.part) em execuções sucessivas.
+
+Uso:
+    python mock_media_server.py --dir amostras/              # Porta 8001
+    python mock_media_server.py --dir amostras/ --drop-after 1000000
+
+    # Em outro terminal, a partir de tools/:
+    from youtube_scraper import YouTubeScraper
+    scraper = YouTubeScraper(base_dir="/tmp/scraper-teste")
+    scraper.download_videos([{
+        'video_id': 'teste1', 'title': 'Sala dos Conselhos | 01/08/2025 | Sessão CONSU | #01',
+        'url': 'http://127.0.0.1:8001/sessao.wav',
+        'data': '01/08/2025', 'conselho': 'consu', 'numero': '01',
+    }], workers=4)
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RANGE_PATTERN = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    """Entrega arquivos com respostas parciais (206) e quedas simuladas."""
+
+    root = Path(".")
+    drop_after = 0
+    latency = 0.0
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        path = (self.root / self.path.lstrip("/").split("?")[0]).resolve()
+        if self.root not in path.parents or not path.is_file():
+            self.send_error(404)
+            return
+
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        match = RANGE_PATTERN.match(self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)), size - 1)
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if not send_body:
+            return
+
+        remaining = end - start + 1
+        if self.drop_after:
+            remaining = min(remaining, self.drop_after)
+        with open(path, "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                block = f.read(min(65536, remaining))
+                if not block:
+                    break
+                self.wfile.write(block)
+                remaining -= len(block)
+                time.sleep(self.latency)
+        if self.drop_after:
+            # Encerrar a conexão antes de completar a resposta
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Servidor local de mídia com suporte a Range")
+    parser.add_argument('--dir', type=str, default=".", help='Diretório com os arquivos servidos')
+    parser.add_argument('--port', type=int, default=8001, help='Porta (padrão: 8001)')
+    parser.add_argument('--drop-after', type=int, default=0,
+                        help='Interromper cada resposta após N bytes (0 = nunca)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Pausa em segundos a cada bloco de 64 KB')
+    args = parser.parse_args()
+
+    MediaHandler.root = Path(args.dir).resolve()
+    MediaHandler.drop_after = args.drop_after
+    MediaHandler.latency = args.latency
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), MediaHandler)
+    print(f"🧪 Servindo {MediaHandler.root} em http://127.0.0.1:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ Data: 24/07/2025
 
 from pathlib import Path
 import os
+import re
 
 # Diretório base do projeto
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -45,7 +46,8 @@ class Directories:
     MODELS_WHISPER = MODELS / "whisper"
     
     # Arquivos de configuração e metadados
-    METADATA_FILE = AUDIO_RAW / "metadata.json"
+    METADATA_FILE = AUDIO_RAW / "metadata.json"  # Legado, migrado para METADATA_DB
+    METADATA_DB = AUDIO_RAW / "metadata.sqlite"
     LOG_FILE = BASE / "scraper.log"
 
 class YouTubeConfig:
@@ -64,7 +66,8 @@ class YouTubeConfig:
     AUDIO_QUALITY = "192"  # kbps
     SAMPLE_RATE = "16000"  # Hz (ideal para speech recognition)
     CHANNELS = "1"         # Mono
-    FORMAT = "wav"         # Formato de saída
+    FORMAT = "wav"         # Formato de saída (wav, flac ou opus)
+    OPUS_BITRATE = "32k"   # Taxa do Opus (fala mono a 16 kHz)
     
     # Limites padrão
     DEFAULT_SEARCH_LIMIT = 100
@@ -94,6 +97,12 @@ class FileNaming:
     # Formato para atas geradas: AAAA-MM-DD_conselho_#numero_ata.{format}
     ATA_FORMAT = "{date}_{council}_#{number}_ata.{extension}"
     
+    # Reconhece qualquer um dos formatos acima
+    FILENAME_PATTERN = re.compile(
+        r"^(\d{4}-\d{2}-\d{2})_(consu|conepe)_#(\w+?)(?:_(transcricao|ata))?\.(\w+)$",
+        re.IGNORECASE
+    )
+    
     @staticmethod
     def format_date(date_str: str) -> str:
         """
@@ -109,7 +118,8 @@ class FileNaming:
         return f"{year}-{month}-{day}"
     
     @staticmethod
-    def get_audio_filename(date_str: str, council: str, number: str) -> str:
+    def get_audio_filename(date_str: str, council: str, number: str,
+                           extension: str = "wav") -> str:
         """
         Gera nome de arquivo para áudio.
         
@@ -117,6 +127,7 @@ class FileNaming:
             date_str: Data no formato DD/MM/AAAA
             council: Nome do conselho (consu ou conepe)
             number: Número da sessão
+            extension: Extensão do arquivo (wav, flac ou opus)
             
         Returns:
             Nome do arquivo formatado
@@ -126,8 +137,77 @@ class FileNaming:
             date=formatted_date,
             council=council.lower(),
             number=number,
-            extension="wav"
+            extension=extension
+        )
+    
+    @staticmethod
+    def get_transcript_filename(date_str: str, council: str, number: str,
+                                extension: str = "txt") -> str:
+        """
+        Gera nome de arquivo para transcrição.
+        
+        Args:
+            date_str: Data no formato DD/MM/AAAA
+            council: Nome do conselho (consu ou conepe)
+            number: Número da sessão
+            extension: Extensão do arquivo (txt ou json)
+            
+        Returns:
+            Nome do arquivo formatado
+        """
+        return FileNaming.TRANSCRIPT_FORMAT.format(
+            date=FileNaming.format_date(date_str),
+            council=council.lower(),
+            number=number,
+            extension=extension
         )
+    
+    @staticmethod
+    def get_ata_filename(date_str: str, council: str, number: str,
+                         extension: str = "md") -> str:
+        """
+        Gera nome de arquivo para ata gerada.
+        
+        Args:
+            date_str: Data no formato DD/MM/AAAA
+            council: Nome do conselho (consu ou conepe)
+            number: Número da sessão
+            extension: Extensão do arquivo
+            
+        Returns:
+            Nome do arquivo formatado
+        """
+        return FileNaming.ATA_FORMAT.format(
+            date=FileNaming.format_date(date_str),
+            council=council.lower(),
+            number=number,
+            extension=extension
+        )
+    
+    @staticmethod
+    def parse_filename(filename: str):
+        """
+        Extrai os dados da sessão de um nome gerado pelos formatos acima.
+        
+        Args:
+            filename: Nome do arquivo (ex.: 2025-06-30_consu_#63_ata.md)
+            
+        Returns:
+            Dicionário com date (AAAA-MM-DD), council, number, kind
+            (audio, transcricao ou ata) e extension, ou None se o nome
+            não seguir o padrão
+        """
+        match = FileNaming.FILENAME_PATTERN.match(filename)
+        if not match:
+            return None
+        date, council, number, kind, extension = match.groups()
+        return {
+            'date': date,
+            'council': council.lower(),
+            'number': number,
+            'kind': (kind or 'audio').lower(),
+            'extension': extension.lower(),
+        }
 
 def ensure_directories():
     """Cria todos os diretórios necessários do projeto."""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de Reconhecimento de Fala (ASR)
+========================================
+
+Interface única para os motores de transcrição usados pelo sistema:
+
+- `openai-whisper`: implementação de referência em PyTorch
+- `faster-whisper`: CTranslate2 com quantização int8, várias vezes mais
+  rápido em CPU e com menos memória para o mesmo modelo
+
+Todos os backends expõem `transcribe(audio, language=..., initial_prompt=...,
+word_timestamps=...)` e devolvem `{"text", "segments", "language"}` no formato
+do `whisper.transcribe` (segmentos com `id`, `start`, `end`, `text` e, se
+pedido, `words`). Assim `StreamingTranscriber`, `ParallelTranscriber` e o
+alinhamento de participantes funcionam sem mudanças com qualquer backend.
+
+O backend é escolhido por `WHISPER_BACKEND` e o modelo por `WHISPER_MODEL`
+(config.py / config_template.py).
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class ASRBackend(ABC):
+    """Interface comum dos backends de transcrição."""
+
+    name = ""
+
+    def __init__(self, model_name: str = "small", device: str = "cpu"):
+        """
+        Args:
+            model_name: Tamanho do modelo (tiny, base, small, medium, large-v3...)
+            device: cpu ou cuda
+        """
+        self.model_name = model_name
+        self.device = device
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None,
+                   initial_prompt: Optional[str] = None,
+                   word_timestamps: bool = False, **kwargs) -> Dict:
+        """
+        Transcreve um vetor float32 mono a 16 kHz.
+
+        Returns:
+            Dicionário com `text`, `segments` e `language`
+        """
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper (PyTorch)."""
+
+    name = "openai-whisper"
+
+    def __init__(self, model_name: str = "small", device: str = "cpu"):
+        super().__init__(model_name, device)
+        import whisper
+
+        self.model = whisper.load_model(model_name, device=device)
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None,
+                   initial_prompt: Optional[str] = None,
+                   word_timestamps: bool = False, **kwargs) -> Dict:
+        kwargs.setdefault("fp16", self.device == "cuda")
+        return self.model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            **kwargs
+        )
+
+
+class FasterWhisperBackend(ASRBackend):
+    """faster-whisper (CTranslate2), int8 em CPU por padrão."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name: str = "small", device: str = "cpu",
+                 compute_type: Optional[str] = None, cpu_threads: int = 0,
+                 beam_size: int = 5):
+        """
+        Args:
+            model_name: Tamanho do modelo ou diretório de um modelo convertido
+            device: cpu ou cuda
+            compute_type: Quantização (padrão: int8 em CPU, float16 em GPU)
+            cpu_threads: Threads do CTranslate2 (0 = padrão da biblioteca)
+            beam_size: Largura do beam search (5, como no openai-whisper)
+        """
+        super().__init__(model_name, device)
+        from faster_whisper import WhisperModel
+
+        self.compute_type = compute_type or ("float16" if device == "cuda" else "int8")
+        self.beam_size = beam_size
+        self.model = WhisperModel(model_name, device=device,
+                                  compute_type=self.compute_type, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None,
+                   initial_prompt: Optional[str] = None,
+                   word_timestamps: bool = False, **kwargs) -> Dict:
+        # Opções exclusivas do openai-whisper (ex.: fp16) não se aplicam aqui
+        kwargs.pop("fp16", None)
+        kwargs.setdefault("beam_size", self.beam_size)
+        segments_iter, info = self.model.transcribe(
+            np.asarray(audio, dtype=np.float32),
+            language=language,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            **kwargs
+        )
+
+        segments: List[Dict] = []
+        for segment in segments_iter:
+            entry = {
+                "id": segment.id,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            if segment.words:
+                entry["words"] = [
+                    {"word": word.word, "start": word.start, "end": word.end,
+                     "probability": word.probability}
+                    for word in segment.words
+                ]
+            segments.append(entry)
+
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def load_backend(name: str = "openai-whisper", model_name: str = "small",
+                 **kwargs) -> ASRBackend:
+    """
+    Carrega o backend de transcrição indicado.
+
+    Args:
+        name: openai-whisper ou faster-whisper
+        model_name: Modelo a carregar
+        **kwargs: Parâmetros específicos do backend (device, compute_type...)
+
+    Returns:
+        Backend pronto para `transcribe`
+
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de transcrição desconhecido: {name} "
+                         f"(opções: {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_name, **kwargs)
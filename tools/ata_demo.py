@@ -13,77 +13,217 @@ Data: Agosto 2025
 """
 
 import gradio as gr
-import whisper
 import os
-from openai import OpenAI
 from pyannote.audio import Pipeline
 import torch
 from datetime import datetime
 import json
+import numpy as np
 import tempfile
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import warnings
 import argparse
 import sys
+import threading
+import time
+
+from asr_backends import FasterWhisperBackend, load_backend
+from audio_loader import as_pyannote_input, duration_seconds, load_audio
+from job_queue import STATUS_LABELS, JobQueue, JobWorkerPool
+from llm_cache import LLMCache
+from llm_gateway import GatewayConfig, LLMGateway, load_config_module
+from minutes_summarizer import MinutesSummarizer, format_timestamp
+from model_registry import shared_registry
+from parallel_transcriber import ParallelTranscriber
+from speaker_alignment import assign_speakers
+from speaker_analytics import SpeakerArchive, format_report, summarize_segments
+from speaker_registry import (DEFAULT_SPEAKER_EMBEDDING_MODEL, MATCH_THRESHOLD, SpeakerEmbedder,
+                              SpeakerRegistry, relabel, speaking_seconds)
+from streaming_transcriber import StreamingTranscriber
+from transcript_store import TranscriptStore
+from voice_activity import SpeechTimeline, detect_speech
+from transcription_cache import TranscriptionCache
 
 warnings.filterwarnings('ignore')
 
+# Segmentos por página na aba de transcrição
+TRANSCRIPT_PAGE_SIZE = 50
+
 class AtaSystemUFS:
     """Sistema de geração de atas da UFS"""
     
-    def __init__(self, openai_api_key=None):
+    def __init__(self, openai_api_key=None, streaming=False, workers=0, threads_per_worker=None,
+                 use_cache=True, split_on_speaker_change=False, use_vad=True, identify_speakers=True):
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.whisper_model = None
-        self.diarization_pipeline = None
+        config = load_config_module()
+        self.whisper_backend = getattr(config, "WHISPER_BACKEND", "openai-whisper")
+        self.whisper_model_name = getattr(config, "WHISPER_MODEL", "small")
+        self.whisper_compute_type = getattr(config, "WHISPER_COMPUTE_TYPE", None)
+        self.diarization_model_name = "pyannote/speaker-diarization@2.1"
+        self.language = "pt"
+        self.cache = TranscriptionCache() if use_cache else None
+        self.streaming = streaming
+        self.split_on_speaker_change = split_on_speaker_change
+        self.use_vad = use_vad
+        # Galeria de vozes: rótulos estáveis entre sessões (VOZ_0001...)
+        self.speaker_registry = None
+        if identify_speakers and getattr(config, "SPEAKER_REGISTRY", True):
+            self.speaker_registry = SpeakerRegistry(
+                threshold=getattr(config, "SPEAKER_MATCH_THRESHOLD", MATCH_THRESHOLD)
+            )
+        self.speaker_embedding_model_name = getattr(config, "SPEAKER_EMBEDDING_MODEL",
+                                                    DEFAULT_SPEAKER_EMBEDDING_MODEL)
+        # Estado por thread: vários workers da fila processam ao mesmo tempo
+        self._local = threading.local()
+        self.job_workers = getattr(config, "JOB_WORKERS", 1)
+        self.jobs = None
+        self.job_pool = None
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.parallel_transcriber = None
         self.client = None
-        self.diarization_available = False
+        self.summarizer = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        # Modelos carregados no primeiro uso e compartilhados no processo
+        self.models = shared_registry(getattr(config, "MODEL_MEMORY_BUDGET_MB", None))
+        self.whisper_key = f"whisper/{self.whisper_backend}/{self.whisper_model_name}/{self.device.type}"
+        self.diarization_key = f"diarization/{self.diarization_model_name}/{self.device.type}"
+        self.speaker_embedding_key = f"speaker-embedding/{self.speaker_embedding_model_name}/{self.device.type}"
+    
+    @property
+    def last_vad(self):
+        """Resumo do VAD do último áudio processado nesta thread"""
+        return getattr(self._local, "last_vad", None)
+    
+    @last_vad.setter
+    def last_vad(self, value):
+        self._local.last_vad = value
+    
+    @property
+    def whisper_model(self):
+        """Modelo de transcrição (carregado no primeiro acesso)"""
+        return self.models.get(self.whisper_key)
+    
+    @property
+    def diarization_pipeline(self):
+        """Pipeline de diarização (carregado no primeiro acesso)"""
+        return self.models.get(self.diarization_key)
+    
+    @property
+    def diarization_available(self):
+        """Diarização registrada e sem falha de carregamento"""
+        return (self.models.is_registered(self.diarization_key)
+                and self.models.load_error(self.diarization_key) is None)
+    
+    def _load_whisper(self):
+        """Carrega o backend de transcrição configurado"""
+        print(f"🔄 Carregando modelo Whisper ({self.whisper_backend}, {self.whisper_model_name})...")
+        backend_options = {"device": self.device.type}
+        if self.whisper_backend == FasterWhisperBackend.name:
+            backend_options["compute_type"] = self.whisper_compute_type
+        model = load_backend(self.whisper_backend, self.whisper_model_name, **backend_options)
+        print("✅ Whisper carregado!")
+        return model
+    
+    def _load_diarization(self):
+        """Carrega o pipeline de diarização no dispositivo disponível"""
+        print(f"🔄 Carregando pipeline de diarização ({self.device})...")
+        try:
+            pipeline = Pipeline.from_pretrained(self.diarization_model_name)
+            pipeline.to(self.device)
+        except Exception as e:
+            print(f"⚠️ Diarização não disponível: {e}")
+            print("   Sistema funcionará sem separação de speakers")
+            raise
+        print("✅ Pipeline de diarização configurado!")
+        return pipeline
         
+    def _load_speaker_embedder(self):
+        """Carrega o modelo de embedding de voz (pipelines sem `return_embeddings`)"""
+        print(f"🔄 Carregando modelo de embedding de voz ({self.speaker_embedding_model_name})...")
+        embedder = SpeakerEmbedder(self.speaker_embedding_model_name, device=self.device.type)
+        print("✅ Modelo de embedding de voz carregado!")
+        return embedder
+    
     def setup_models(self):
         """Configura todos os modelos necessários"""
         print("🔄 Iniciando configuração dos modelos...")
         
-        # OpenAI Client
+        # Gateway de LLM (pool de conexões, limite de taxa e novas tentativas)
         if self.openai_api_key:
-            self.client = OpenAI(api_key=self.openai_api_key)
-            print("✅ Cliente OpenAI configurado!")
+            # OPENAI_BASE_URL permite apontar para um servidor local compatível (testes)
+            config = load_config_module()
+            llm_cache = None
+            if self.cache and getattr(config, "LLM_CACHE_ENABLED", True):
+                llm_cache = LLMCache(
+                    ttl_days=getattr(config, "LLM_CACHE_TTL_DAYS", 30),
+                    max_size_mb=getattr(config, "LLM_CACHE_MAX_SIZE_MB", 256)
+                )
+            self.client = LLMGateway(GatewayConfig.from_config(api_key=self.openai_api_key), cache=llm_cache)
+            self.summarizer = MinutesSummarizer(
+                self.client,
+                chunk_tokens=getattr(config, "SUMMARY_CHUNK_TOKENS", 6000),
+                context_tokens=getattr(config, "SUMMARY_CONTEXT_TOKENS", 24000),
+                final_max_tokens=self.client.config.max_tokens,
+                max_concurrency=getattr(config, "SUMMARY_MAX_CONCURRENCY", 4)
+            )
+            print(f"✅ Cliente OpenAI configurado! ({self.client.config.model})")
         else:
             print("❌ ERRO: Chave da OpenAI API não configurada")
             print("   Configure a variável de ambiente OPENAI_API_KEY")
             return False
         
-        # Whisper
-        try:
-            print("🔄 Carregando modelo Whisper...")
-            self.whisper_model = whisper.load_model("small")
-            print("✅ Whisper carregado!")
-        except Exception as e:
-            print(f"❌ Erro ao carregar Whisper: {e}")
-            return False
+        # Whisper e diarização: apenas registrados, carregados no primeiro uso
+        self.models.register(self.whisper_key, self._load_whisper)
+        self.models.register(self.diarization_key, self._load_diarization)
+        if self.speaker_registry is not None:
+            self.models.register(self.speaker_embedding_key, self._load_speaker_embedder)
         
-        # Diarização (opcional)
-        try:
-            print("🔄 Configurando pipeline de diarização...")
-            print(f"   Dispositivo: {self.device}")
-            self.diarization_pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization@2.1")
-            self.diarization_pipeline.to(self.device)
-            self.diarization_available = True
-            print("✅ Pipeline de diarização configurado!")
-        except Exception as e:
-            print(f"⚠️ Diarização não disponível: {e}")
-            print("   Sistema funcionará sem separação de speakers")
-            self.diarization_available = False
+        if self.workers:
+            self.parallel_transcriber = ParallelTranscriber(
+                model_name=self.whisper_model_name,
+                language=self.language,
+                workers=self.workers,
+                threads_per_worker=self.threads_per_worker,
+                backend=self.whisper_backend,
+                compute_type=self.whisper_compute_type
+            )
+            print(f"✅ Transcrição paralela: {self.parallel_transcriber.workers} workers "
+                  f"× {self.parallel_transcriber.threads_per_worker} threads")
         
         print("✅ Configuração concluída!")
         return True
     
-    def perform_diarization(self, audio_path):
-        """Realiza diarização do áudio"""
+    def warm_models(self):
+        """Pré-carrega em segundo plano os modelos que o modo atual vai usar"""
+        names = [self.diarization_key]
+        if not self.parallel_transcriber:
+            names.insert(0, self.whisper_key)
+        return self.models.warm_async(names)
+    
+    def perform_diarization(self, audio_path, samples=None, timeline=None):
+        """
+        Realiza diarização do áudio (a partir do buffer decodificado, se fornecido).
+        
+        Com `timeline` (VAD), o pipeline recebe só a fala e os turnos são
+        devolvidos na linha do tempo original. No modo streaming a fala não
+        é concatenada em memória: o pipeline recebe o áudio mapeado e os
+        turnos fora da fala são descartados.
+        """
         if not self.diarization_available:
             return []
         
         try:
-            diarization = self.diarization_pipeline(audio_path)
+            if samples is None:
+                samples = load_audio(audio_path)
+            speech = samples
+            if timeline is not None:
+                if not timeline.regions:
+                    return []
+                if not self.streaming:
+                    speech = timeline.compact(samples)
+            with self.models.use(self.diarization_key) as pipeline:
+                diarization, embeddings = self._run_diarization(pipeline, as_pyannote_input(speech))
             speakers_info = []
             
             for turn, _, speaker in diarization.itertracks(yield_label=True):
@@ -94,60 +234,215 @@ class AtaSystemUFS:
                     "duration": turn.end - turn.start
                 })
             
+            if timeline is not None:
+                speakers_info = (timeline.clip_turns(speakers_info) if self.streaming
+                                 else timeline.map_turns(speakers_info))
+            if self.speaker_registry is not None and speakers_info:
+                speakers_info = self.identify_speakers(samples, speakers_info, embeddings,
+                                                       session=os.path.basename(audio_path))
             return speakers_info
         except Exception as e:
             print(f"Erro na diarização: {e}")
             return []
     
-    def transcribe_with_diarization(self, audio_path, speakers_info):
-        """Transcreve áudio com informações de diarização"""
+    def _run_diarization(self, pipeline, audio_input):
+        """Diarização; com o registro de vozes, pede também um embedding por participante"""
+        if self.speaker_registry is not None:
+            try:
+                diarization, embeddings = pipeline(audio_input, return_embeddings=True)
+            except TypeError:
+                # Pipeline sem `return_embeddings` (pyannote < 3.1): o
+                # embedding é extraído depois pelo SpeakerEmbedder
+                pass
+            else:
+                return diarization, {
+                    label: embedding for label, embedding in zip(diarization.labels(), embeddings)
+                    if np.all(np.isfinite(embedding))
+                }
+        return pipeline(audio_input), None
+    
+    def identify_speakers(self, samples, speakers_info, embeddings=None, session=None):
+        """Troca os rótulos da diarização pelos identificadores estáveis do registro de vozes"""
         try:
-            result = self.whisper_model.transcribe(audio_path, language="pt")
-            full_transcription = result["text"]
-            segments = result.get("segments", [])
-            
-            if not speakers_info or not segments:
-                return [], full_transcription
-            
-            speaker_transcriptions = []
-            
-            for segment in segments:
-                segment_center = (segment["start"] + segment["end"]) / 2
-                assigned_speaker = "PARTICIPANTE"
-                
-                for speaker_info in speakers_info:
-                    if speaker_info["start"] <= segment_center <= speaker_info["end"]:
-                        assigned_speaker = speaker_info["speaker"]
-                        break
-                
-                speaker_transcriptions.append({
-                    "speaker": assigned_speaker,
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": segment["text"].strip(),
-                    "duration": segment["end"] - segment["start"]
-                })
-            
-            return speaker_transcriptions, full_transcription
+            if embeddings is None:
+                with self.models.use(self.speaker_embedding_key) as embedder:
+                    embeddings = embedder.embed(samples, speakers_info)
+            mapping = self.speaker_registry.identify(embeddings, speaking_seconds(speakers_info),
+                                                     session=session)
+        except Exception as e:
+            print(f"⚠️ Identificação de participantes indisponível: {e}")
+            return speakers_info
+        return relabel(speakers_info, mapping)
+    
+    def name_speakers(self, segments):
+        """Segmentos com os nomes atribuídos às vozes no registro (quando houver)"""
+        if self.speaker_registry is None or not segments:
+            return segments
+        return relabel(segments, self.speaker_registry.display_names())
+    
+    def iter_transcription(self, audio):
+        """Gera segmentos transcritos em janelas, com memória constante"""
+        with self.models.use(self.whisper_key) as model:
+            transcriber = StreamingTranscriber(model, language=self.language)
+            yield from transcriber.iter_segments(audio)
+    
+    def transcribe_audio(self, audio_path, samples=None, timeline=None, on_segments=None):
+        """
+        Transcreve o áudio e retorna (segmentos do Whisper, texto completo).
+        
+        Com `timeline` (VAD), apenas as regiões de fala são transcritas e os
+        tempos dos segmentos voltam para a linha do tempo original.
+        `on_segments(segmentos)` recebe os segmentos assim que ficam prontos
+        (um a um no modo streaming, por trecho no modo paralelo).
+        """
+        try:
+            if timeline is not None and not timeline.regions:
+                return [], ""
+            if self.parallel_transcriber:
+                regions = timeline.regions if timeline is not None else None
+                result = self.parallel_transcriber.transcribe(audio_path, regions=regions,
+                                                              on_segments=on_segments)
+                return result["segments"], result["text"]
+            
+            if timeline is not None:
+                if samples is None:
+                    samples = load_audio(audio_path)
+                # Streaming: a fala é lida janela a janela do vetor mapeado
+                samples = (timeline.speech_view(samples) if self.streaming
+                           else timeline.compact(samples))
+            
+            if self.streaming:
+                segments = []
+                for segment in self.iter_transcription(audio_path if samples is None else samples):
+                    if timeline is not None:
+                        segment = timeline.map_segments([segment])[0]
+                    segments.append(segment)
+                    if on_segments:
+                        on_segments([segment])
+                full_transcription = " ".join(segment["text"] for segment in segments)
+            else:
+                if samples is None:
+                    samples = load_audio(audio_path)
+                with self.models.use(self.whisper_key) as model:
+                    result = model.transcribe(
+                        np.asarray(samples),
+                        language=self.language,
+                        word_timestamps=self.split_on_speaker_change
+                    )
+                full_transcription = result["text"]
+                segments = result.get("segments", [])
+                if timeline is not None:
+                    segments = timeline.map_segments(segments)
+                if on_segments and segments:
+                    on_segments(segments)
+            
+            return segments, full_transcription
         
         except Exception as e:
             print(f"Erro na transcrição: {e}")
             return [], ""
     
-    def generate_speaker_stats(self, speaker_transcriptions):
-        """Gera estatísticas dos participantes"""
-        speaker_stats = defaultdict(lambda: {"total_time": 0, "segments": 0, "words": 0})
+    def align_speakers(self, segments, speakers_info):
+        """Associa cada segmento transcrito ao participante da diarização"""
+        if not speakers_info or not segments:
+            return []
+        
+        return assign_speakers(
+            segments,
+            speakers_info,
+            split_on_speaker_change=self.split_on_speaker_change
+        )
+    
+    def transcribe_with_diarization(self, audio_path, speakers_info):
+        """Transcreve áudio com informações de diarização"""
+        segments, full_transcription = self.transcribe_audio(audio_path)
+        return self.align_speakers(segments, speakers_info), full_transcription
+    
+    def _cache_key(self, audio_path):
+        """Chave do cache para o áudio com os modelos e opções atuais"""
+        return self.cache.make_key(
+            audio_path,
+            model=(self.whisper_model_name if self.whisper_backend == "openai-whisper"
+                   else f"{self.whisper_backend}:{self.whisper_model_name}"),
+            language=self.language,
+            diarization_model=self.diarization_model_name if self.diarization_available else None,
+            options={"split_on_speaker_change": self.split_on_speaker_change,
+                     "vad": self.use_vad,
+                     "speaker_registry": self.speaker_registry is not None,
+                     # Quantização e modo de execução mudam o texto transcrito
+                     "compute_type": self.whisper_compute_type,
+                     "streaming": self.streaming,
+                     "parallel_chunk_seconds": (self.parallel_transcriber.chunk_seconds
+                                                if self.parallel_transcriber else None)}
+        )
+    
+    def diarize_and_transcribe(self, audio_path, on_stage_done=None, on_segments=None,
+                               on_speakers=None):
+        """
+        Diarização e transcrição, reaproveitando resultados do cache quando possível.
+        
+        As duas etapas são independentes até o alinhamento e rodam ao mesmo tempo
+        em threads separadas (o PyTorch libera o GIL durante a inferência).
+        `on_stage_done(etapa)` é chamado na thread atual quando "diarization" ou
+        "transcription" termina; `on_speakers(turnos)` recebe o resultado da
+        diarização e `on_segments(segmentos)` os segmentos parciais da transcrição.
+        """
+        if self.cache:
+            cached = self.cache.get(self._cache_key(audio_path))
+            if cached:
+                self.last_vad = cached.get("vad")
+                return cached["speakers_info"], cached["segments"], cached["full_transcription"]
+        
+        # Decodifica uma única vez; as duas etapas recebem o mesmo buffer mapeado
+        samples = load_audio(audio_path)
+        
+        # Silêncios e intervalos ficam fora da diarização e da transcrição
+        timeline = None
+        self.last_vad = None
+        if self.use_vad:
+            timeline = SpeechTimeline(detect_speech(samples), duration_seconds(samples))
+            self.last_vad = timeline.summary()
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                executor.submit(self.perform_diarization, audio_path, samples, timeline): "diarization",
+                executor.submit(self.transcribe_audio, audio_path, samples, timeline,
+                                on_segments): "transcription"
+            }
+            results = {}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if on_speakers and futures[future] == "diarization":
+                    on_speakers(results["diarization"])
+                if on_stage_done:
+                    on_stage_done(futures[future])
         
-        for segment in speaker_transcriptions:
-            speaker = segment["speaker"]
-            speaker_stats[speaker]["total_time"] += segment["duration"]
-            speaker_stats[speaker]["segments"] += 1
-            speaker_stats[speaker]["words"] += len(segment["text"].split())
+        speakers_info = results["diarization"]
+        segments, full_transcription = results["transcription"]
+        speaker_transcriptions = self.align_speakers(segments, speakers_info)
         
-        return dict(speaker_stats)
+        if self.cache and full_transcription:
+            # Chave recalculada: o pipeline de diarização pode ter falhado ao carregar
+            self.cache.put(self._cache_key(audio_path), {
+                "speakers_info": speakers_info,
+                "segments": speaker_transcriptions,
+                "full_transcription": full_transcription,
+                "vad": self.last_vad
+            }, source=os.path.basename(audio_path))
+        
+        return speakers_info, speaker_transcriptions, full_transcription
+    
+    def generate_speaker_stats(self, speaker_transcriptions):
+        """Gera estatísticas dos participantes (tempo, turnos, interrupções)"""
+        return summarize_segments(speaker_transcriptions)
     
-    def generate_meeting_minutes(self, transcription, speaker_stats=None):
-        """Gera ata de reunião usando OpenAI"""
+    def generate_meeting_minutes(self, transcription, speaker_stats=None, speaker_transcriptions=None):
+        """
+        Gera ata de reunião usando OpenAI.
+        
+        Transcrições que não cabem no contexto do modelo são resumidas em blocos
+        (map-reduce) antes da redação da ata.
+        """
         try:
             speaker_context = ""
             if speaker_stats:
@@ -169,6 +464,14 @@ class AtaSystemUFS:
             Use linguagem formal, objetiva e organize as informações de forma clara e hierárquica.
             Identifique decisões importantes, pontos de consenso e discordância quando aplicável."""
             
+            if not self.summarizer.fits_single_call(transcription + speaker_context):
+                return self.summarizer.generate(
+                    system_prompt,
+                    speaker_transcriptions or [],
+                    full_transcription=transcription,
+                    speaker_context=speaker_context
+                )
+            
             user_prompt = f"""TRANSCRIÇÃO DA REUNIÃO:
             {transcription}
             {speaker_context}
@@ -176,70 +479,118 @@ class AtaSystemUFS:
             Por favor, gere uma ata completa, formal e bem estruturada baseada nesta transcrição.
             Organize as informações de forma profissional adequada para o ambiente universitário."""
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2,
-                max_tokens=3000
-            )
-            
-            return response.choices[0].message.content
+            return self.client.complete_sync([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ])
         
         except Exception as e:
             return f"Erro na geração da ata: {str(e)}"
     
-    def process_audio_file(self, audio_file, progress=gr.Progress()):
-        """Função principal que processa o arquivo de áudio"""
+    def format_speaker_stats(self, speaker_stats):
+        """Linhas em Markdown da participação por speaker"""
+        if not speaker_stats:
+            return "\n- Não foi possível separar por participantes"
+        return "".join(
+            f"\n- **{speaker}**: {stats['total_time']:.1f}s ({stats['turns']} turnos, {stats['segments']} intervenções, "
+            f"{stats['words']} palavras, {stats['interruptions']} interrupções)"
+            for speaker, stats in sorted(speaker_stats.items())
+        )
+    
+    def format_segments(self, segments):
+        """Segmentos em Markdown, com horário e participante"""
+        return "\n\n".join(
+            f"**[{format_timestamp(segment['start'])}]"
+            f"{' ' + segment['speaker'] if segment.get('speaker') else ''}:** {segment['text'].strip()}"
+            for segment in segments
+        )
+    
+    def process_audio_file(self, audio_file, progress=gr.Progress(), display_name=None, store=None):
+        """
+        Função principal que processa o arquivo de áudio.
+        
+        Com `store` (TranscriptStore), os segmentos e os turnos da diarização
+        são gravados em disco à medida que ficam prontos, e a transcrição
+        completa fica disponível para leitura paginada.
+        """
         if audio_file is None:
             return "❌ Nenhum arquivo de áudio foi enviado.", "", "", ""
         
         try:
             progress(0, desc="🎵 Carregando arquivo de áudio...")
             
-            # Etapa 1: Diarização
-            progress(0.1, desc="🎭 Identificando participantes (diarização)...")
-            speakers_info = self.perform_diarization(audio_file)
+            # Etapas 1 e 2: Diarização e transcrição em paralelo (com cache)
+            progress(0.1, desc="🎭🎤 Diarização e transcrição em andamento...")
+            stage_labels = {"diarization": "🎭 Diarização", "transcription": "🎤 Transcrição"}
+            stages_done = []
+            
+            def on_stage_done(stage):
+                stages_done.append(stage)
+                pending = [label for key, label in stage_labels.items() if key not in stages_done]
+                desc = f"✅ {stage_labels[stage]} concluída"
+                if pending:
+                    desc += f" — aguardando {pending[0]}..."
+                progress(0.1 + 0.25 * len(stages_done), desc=desc)
+            
+            on_segments = on_speakers = None
+            if store is not None:
+                total_seconds = max(duration_seconds(load_audio(audio_file)), 1e-9)
+                
+                def on_segments(segments):
+                    store.append_segments(segments)
+                    done = min(segments[-1]["end"] / total_seconds, 1.0)
+                    progress(0.1 + 0.45 * done, desc=f"🎤 Transcrevendo... {format_timestamp(segments[-1]['end'])}")
+                
+                on_speakers = store.save_speakers
             
-            num_speakers = len(set([s['speaker'] for s in speakers_info])) if speakers_info else 1
+            speakers_info, speaker_transcriptions, full_transcription = self.diarize_and_transcribe(
+                audio_file, on_stage_done=on_stage_done, on_segments=on_segments, on_speakers=on_speakers
+            )
             
-            # Etapa 2: Transcrição
-            progress(0.4, desc="🎤 Transcrevendo áudio...")
-            speaker_transcriptions, full_transcription = self.transcribe_with_diarization(audio_file, speakers_info)
+            num_speakers = len(set([s['speaker'] for s in speakers_info])) if speakers_info else 1
             
             if not full_transcription:
                 return "❌ Erro na transcrição do áudio.", "", "", ""
             
-            # Etapa 3: Estatísticas
+            # Etapa 3: Estatísticas (com os nomes do registro de vozes)
             progress(0.6, desc="📊 Calculando estatísticas...")
+            speaker_transcriptions = self.name_speakers(speaker_transcriptions)
             speaker_stats = self.generate_speaker_stats(speaker_transcriptions)
+            if store is not None:
+                if speaker_transcriptions:
+                    store.write_final(speaker_transcriptions)
+                elif store.count() == 0:
+                    # Resultado do cache sem diarização: só há o texto completo
+                    store.write_final([{"start": 0.0, "end": 0.0, "text": full_transcription}])
             
             # Etapa 4: Geração da ata
             progress(0.8, desc="📝 Gerando ata de reunião...")
-            meeting_minutes = self.generate_meeting_minutes(full_transcription, speaker_stats)
+            meeting_minutes = self.generate_meeting_minutes(full_transcription, speaker_stats, speaker_transcriptions)
             
             progress(1.0, desc="✅ Processamento concluído!")
             
             # Formatação dos resultados
+            vad_line = ""
+            if self.last_vad:
+                skipped = self.last_vad["skipped_seconds"]
+                share = 100 * skipped / max(self.last_vad["total_seconds"], 1e-9)
+                vad_line = f"**Silêncio ignorado:** {skipped / 60:.1f} min ({share:.0f}%)\n"
             stats_text = f"""## 📊 Estatísticas da Reunião
 
 **Participantes identificados:** {num_speakers}
+**Duração do áudio:** {duration_seconds(load_audio(audio_file)) / 60:.1f} min
 **Duração da transcrição:** {len(full_transcription)} caracteres
-**Processado em:** {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}
+{vad_line}**Processado em:** {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}
 
 ### Participação por Speaker:
 """
+            stats_text += self.format_speaker_stats(speaker_stats)
             
-            if speaker_stats:
-                for speaker, stats in sorted(speaker_stats.items()):
-                    stats_text += f"\n- **{speaker}**: {stats['total_time']:.1f}s ({stats['segments']} intervenções, {stats['words']} palavras)"
+            # Transcrição formatada (paginada a partir do disco, quando disponível)
+            if store is not None:
+                transcription_display = self.render_transcript_page(store, 1)
             else:
-                stats_text += "\n- Não foi possível separar por participantes"
-            
-            # Transcrição formatada
-            transcription_display = f"""## 🎤 Transcrição Completa
+                transcription_display = f"""## 🎤 Transcrição Completa
 
 {full_transcription[:2000]}{'...' if len(full_transcription) > 2000 else ''}
 """
@@ -252,7 +603,7 @@ class AtaSystemUFS:
             
             success_msg = f"""✅ **Processamento concluído com sucesso!**
 
-🎯 **Arquivo processado:** {os.path.basename(audio_file)}
+🎯 **Arquivo processado:** {display_name or os.path.basename(audio_file)}
 🕒 **Horário:** {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}
 👥 **Participantes:** {num_speakers} identificados
 📄 **Transcrição:** {len(full_transcription)} caracteres
@@ -264,6 +615,129 @@ class AtaSystemUFS:
             error_msg = f"❌ **Erro no processamento:** {str(e)}"
             return error_msg, "", "", ""
     
+    def start_job_workers(self):
+        """Abre a fila persistente e inicia os workers do pipeline"""
+        self.jobs = JobQueue(recover=True)
+        if self.jobs.recovered:
+            print(f"♻️ {self.jobs.recovered} trabalho(s) interrompido(s) de volta à fila")
+        self.job_pool = JobWorkerPool(self.jobs, self.run_job, workers=self.job_workers)
+        self.job_pool.start()
+        print(f"✅ Fila de processamento: {self.job_workers} worker(s)")
+    
+    def run_job(self, job, progress):
+        """Executa um trabalho da fila e devolve as saídas da interface"""
+        status, stats, transcription, ata = self.process_audio_file(
+            job["audio_path"], progress=progress, display_name=job["original_name"],
+            store=TranscriptStore.for_job(job["job_id"])
+        )
+        if not stats:
+            raise RuntimeError(status.replace("❌", "").replace("**", "").strip())
+        return {"status": status, "stats": stats, "transcription": transcription, "ata": ata}
+    
+    def submit_job(self, audio_file):
+        """Enfileira o áudio enviado e devolve o identificador na hora"""
+        if audio_file is None:
+            return "", "❌ Nenhum arquivo de áudio foi enviado."
+        job_id = self.jobs.submit(audio_file, os.path.basename(audio_file))
+        return job_id, f"📥 Trabalho **{job_id}** na fila. Guarde o código para consultar o resultado depois."
+    
+    def follow_job(self, job_id, poll_seconds=2.0):
+        """
+        Acompanha um trabalho até o fim, atualizando o status na interface.
+        
+        Fechar o navegador interrompe apenas o acompanhamento: o trabalho
+        continua na fila e o resultado pode ser consultado pelo código.
+        """
+        job_id = (job_id or "").strip()
+        if not job_id:
+            yield "❌ Informe o código do trabalho.", "", "", ""
+            return
+        
+        store = TranscriptStore.for_job(job_id)
+        live_stats, live_transcript = "", ""
+        seen = (-1, None)
+        while True:
+            job = self.jobs.get(job_id)
+            if job is None:
+                yield f"❌ Trabalho não encontrado: {job_id}", "", "", ""
+                return
+            if job["status"] == "done":
+                result = job["result"]
+                yield result["status"], result["stats"], result["transcription"], result["ata"]
+                return
+            if job["status"] == "failed":
+                yield f"❌ **Erro no processamento ({job_id}):** {job['error']}", "", "", ""
+                return
+            
+            if job["status"] == "queued":
+                ahead = self.jobs.position(job_id)
+                detail = f"{ahead} trabalho(s) à frente" if ahead else "próximo a ser processado"
+            else:
+                detail = f"{job['progress']:.0%} — {job['stage'] or 'iniciando'}"
+                # Segmentos e estatísticas parciais, relidos só quando mudam
+                current = (store.count(), store.speakers_path.exists())
+                if current != seen:
+                    seen = current
+                    live_stats, live_transcript = self.render_live_preview(store)
+            yield f"{STATUS_LABELS[job['status']]} **{job_id}**: {detail}", live_stats, live_transcript, ""
+            time.sleep(poll_seconds)
+    
+    def render_live_preview(self, store, tail_segments=30):
+        """Estatísticas parciais e últimos segmentos de um trabalho em andamento"""
+        segments = store.segments()
+        if not segments:
+            return "", ""
+        
+        speakers_info = store.speakers()
+        if speakers_info:
+            speaker_stats = self.generate_speaker_stats(
+                self.name_speakers(self.align_speakers(segments, speakers_info)))
+            stats_text = "## 📊 Estatísticas Parciais\n\n### Participação por Speaker:\n"
+            stats_text += self.format_speaker_stats(speaker_stats)
+            segments = self.name_speakers(self.align_speakers(segments[-tail_segments:], speakers_info))
+        else:
+            stats_text = "## 📊 Estatísticas Parciais\n\n🎭 Diarização em andamento..."
+            segments = segments[-tail_segments:]
+        
+        transcript_text = (f"## 🎤 Transcrição ao Vivo\n\n_{store.count()} segmentos até "
+                           f"{format_timestamp(segments[-1]['end'])} — últimos abaixo_\n\n"
+                           + self.format_segments(segments))
+        return stats_text, transcript_text
+    
+    def render_transcript_page(self, store, page, page_size=TRANSCRIPT_PAGE_SIZE):
+        """Uma página da transcrição completa, lida do disco"""
+        total = store.count()
+        pages = max(1, -(-total // page_size))
+        page = min(max(int(page or 1), 1), pages)
+        return (f"## 🎤 Transcrição Completa\n\n_Página {page} de {pages} ({total} segmentos)_\n\n"
+                + self.format_segments(store.page(page, page_size)))
+    
+    def show_transcript_page(self, job_id, page):
+        """Navegação entre as páginas da transcrição de um trabalho"""
+        job_id = (job_id or "").strip()
+        if not job_id or self.jobs.get(job_id) is None:
+            return "❌ Informe o código de um trabalho.", 1
+        store = TranscriptStore.for_job(job_id)
+        pages = max(1, -(-store.count() // TRANSCRIPT_PAGE_SIZE))
+        page = min(max(int(page or 1), 1), pages)
+        return self.render_transcript_page(store, page), page
+    
+    def archive_report(self, council):
+        """Relatório de participação de todas as sessões transcritas"""
+        archive = SpeakerArchive()
+        archive.update()
+        names = self.speaker_registry.display_names() if self.speaker_registry is not None else None
+        return format_report(archive.report(council=None if council == "Todos" else council.lower()),
+                             names=names)
+    
+    def list_jobs(self):
+        """Tabela com os trabalhos mais recentes"""
+        lines = ["| Código | Arquivo | Status | Progresso | Enviado em |", "|---|---|---|---|---|"]
+        for job in self.jobs.recent():
+            lines.append(f"| `{job['job_id']}` | {job['original_name']} | {STATUS_LABELS[job['status']]} "
+                         f"| {job['progress']:.0%} | {job['created_at'][:16].replace('T', ' ')} |")
+        return "\n".join(lines)
+    
     def create_interface(self):
         """Cria a interface Gradio"""
         
@@ -295,10 +769,11 @@ class AtaSystemUFS:
             gr.Markdown("""
             ### 📋 Como usar:
             1. **Faça upload** de um arquivo de áudio (.mp3, .wav, .m4a)
-            2. **Clique em "Processar Áudio"** e aguarde
+            2. **Clique em "Processar Áudio"**: o envio entra na fila e recebe um código
             3. **Visualize os resultados** nas abas abaixo
             
-            > ⚡ O processamento pode levar alguns minutos dependendo do tamanho do arquivo
+            > ⚡ O processamento pode levar alguns minutos dependendo do tamanho do arquivo.
+            > Se a página for fechada, consulte o resultado depois pelo código do trabalho.
             """)
             
             # Input de áudio
@@ -316,6 +791,11 @@ class AtaSystemUFS:
                 size="lg"
             )
             
+            # Consulta de trabalhos enviados
+            with gr.Row():
+                job_id_input = gr.Textbox(label="🔖 Código do trabalho", scale=3)
+                lookup_btn = gr.Button("🔎 Consultar", scale=1)
+            
             # Outputs organizados em abas
             with gr.Tabs():
                 
@@ -324,18 +804,48 @@ class AtaSystemUFS:
                     stats_output = gr.Markdown(label="Estatísticas")
                 
                 with gr.TabItem("🎤 Transcrição"):
+                    with gr.Row():
+                        prev_page_btn = gr.Button("◀ Anterior", scale=1)
+                        page_input = gr.Number(label="Página", value=1, precision=0, scale=1)
+                        next_page_btn = gr.Button("Próxima ▶", scale=1)
                     transcription_output = gr.Markdown(label="Transcrição Completa")
                 
                 with gr.TabItem("📋 Ata Gerada"):
                     ata_output = gr.Markdown(label="Ata de Reunião")
-            
-            # Conectar o botão com a função
+                
+                with gr.TabItem("🗂️ Fila"):
+                    jobs_output = gr.Markdown(label="Trabalhos recentes")
+                    refresh_btn = gr.Button("🔄 Atualizar")
+                
+                with gr.TabItem("📈 Acervo"):
+                    with gr.Row():
+                        council_input = gr.Dropdown(["Todos", "CONSU", "CONEPE"], value="Todos",
+                                                    label="Conselho", scale=3)
+                        report_btn = gr.Button("📊 Gerar relatório", scale=1)
+                    archive_output = gr.Markdown(label="Participação no acervo")
+            
+            # Enviar para a fila e acompanhar o trabalho
+            outputs = [status_output, stats_output, transcription_output, ata_output]
             process_btn.click(
-                fn=self.process_audio_file,
+                fn=self.submit_job,
                 inputs=[audio_input],
-                outputs=[status_output, stats_output, transcription_output, ata_output],
-                show_progress=True
+                outputs=[job_id_input, status_output]
+            ).then(
+                fn=self.follow_job,
+                inputs=[job_id_input],
+                outputs=outputs
             )
+            lookup_btn.click(fn=self.follow_job, inputs=[job_id_input], outputs=outputs)
+            page_input.submit(fn=self.show_transcript_page, inputs=[job_id_input, page_input],
+                              outputs=[transcription_output, page_input])
+            prev_page_btn.click(fn=lambda job_id, page: self.show_transcript_page(job_id, (page or 1) - 1),
+                                inputs=[job_id_input, page_input],
+                                outputs=[transcription_output, page_input])
+            next_page_btn.click(fn=lambda job_id, page: self.show_transcript_page(job_id, (page or 1) + 1),
+                                inputs=[job_id_input, page_input],
+                                outputs=[transcription_output, page_input])
+            refresh_btn.click(fn=self.list_jobs, inputs=[], outputs=[jobs_output])
+            report_btn.click(fn=self.archive_report, inputs=[council_input], outputs=[archive_output])
             
             # Rodapé
             gr.HTML("""
@@ -354,12 +864,17 @@ class AtaSystemUFS:
             print("❌ Falha na configuração. Encerrando.")
             return
         
+        # A interface sobe enquanto os modelos carregam em segundo plano
+        self.warm_models()
+        self.start_job_workers()
+        
         print("🎯 Iniciando Sistema de Geração de Atas - UFS")
         print("📱 A interface será aberta em uma nova aba/janela")
         print("🔗 Ou acesse o link que será exibido abaixo")
         print("\n" + "="*50)
         
         interface = self.create_interface()
+        interface.queue()
         interface.launch(
             server_name="0.0.0.0",
             server_port=server_port,
@@ -375,6 +890,20 @@ def main():
     parser.add_argument("--api-key", help="Chave da API OpenAI")
     parser.add_argument("--port", type=int, default=7860, help="Porta do servidor (padrão: 7860)")
     parser.add_argument("--no-share", action="store_true", help="Não criar link público")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Transcrever em janelas com memória constante (sessões longas)")
+    parser.add_argument("--split-speakers", action="store_true",
+                        help="Dividir segmentos nas trocas de participante (timestamps por palavra)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não reaproveitar diarizações e transcrições em cache")
+    parser.add_argument("--no-vad", action="store_true",
+                        help="Transcrever o áudio inteiro, sem remover os silêncios")
+    parser.add_argument("--no-speaker-id", action="store_true",
+                        help="Manter os rótulos SPEAKER_XX, sem o registro de vozes entre sessões")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Processos de transcrição paralela em CPU (0 = desativado)")
+    parser.add_argument("--threads-per-worker", type=int,
+                        help="Threads do PyTorch por processo de transcrição (padrão: 2)")
     
     args = parser.parse_args()
     
@@ -389,7 +918,16 @@ def main():
         sys.exit(1)
     
     # Criar e executar o sistema
-    sistema = AtaSystemUFS(openai_api_key=api_key)
+    sistema = AtaSystemUFS(
+        openai_api_key=api_key,
+        streaming=args.streaming,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        use_cache=not args.no_cache,
+        split_on_speaker_change=args.split_speakers,
+        use_vad=not args.no_vad,
+        identify_speakers=not args.no_speaker_id
+    )
     sistema.run(share=not args.no_share, server_port=args.port)
 
 
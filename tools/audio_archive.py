@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo Compactado dos Áudios das Sessões
+=========================================
+
+As sessões em WAV PCM 16 kHz ocupam 200–330 MB cada. Este módulo converte o
+acervo para FLAC (sem perdas, ~50% do tamanho) ou Opus (fala a 32 kbit/s,
+~6% do tamanho) e oferece leitura de trechos `[start, end)` sem decodificar
+o arquivo inteiro:
+
+- FLAC: o demuxer localiza o quadro pelo cabeçalho (ou SEEKTABLE, se houver)
+  e decodifica apenas os quadros do trecho; com `soundfile` instalado, a
+  leitura é feita pela libsndfile com precisão de amostra.
+- Opus (Ogg): as posições de grânulo das páginas Ogg funcionam como índice
+  de busca; o FFmpeg localiza a página por bisseção e decodifica a partir do
+  pre-roll.
+
+A duração é lida dos cabeçalhos (STREAMINFO do FLAC, última página Ogg do
+Opus), o que permite informar o tamanho equivalente em PCM sem decodificar.
+
+`ArchiveAudio` expõe um arquivo FLAC/Opus como vetor fatiável: cada fatia
+decodifica só o trecho pedido com `read_range`. É o que `load_audio` devolve
+para esses formatos, de modo que VAD, transcrição em streaming/paralela e
+estatísticas leem apenas os trechos de que precisam, sem gerar um `.npy`
+float32 (o dobro do WAV) ao lado do arquivo.
+
+Uso:
+    python audio_archive.py --convert flac              # Converte o acervo WAV
+    python audio_archive.py --convert opus --keep-source
+    python audio_archive.py --clip sessao.flac --start 3600 --end 3630 --output trecho.wav
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import AudioConfig, YouTubeConfig
+
+try:
+    import soundfile
+except ImportError:  # soundfile é opcional
+    soundfile = None
+
+SAMPLE_RATE = AudioConfig.SAMPLE_RATE
+
+# Formatos do acervo lidos por trechos (sem .npy decodificado)
+ARCHIVE_SUFFIXES = ('.flac', '.opus', '.ogg')
+
+# Parâmetros do ffmpeg por formato (16 kHz mono, ver YouTubeConfig)
+AUDIO_CODECS = {
+    'wav': ['-c:a', 'pcm_s16le', '-f', 'wav'],
+    'flac': ['-c:a', 'flac', '-compression_level', '8', '-f', 'flac'],
+    'opus': ['-c:a', 'libopus', '-b:a', YouTubeConfig.OPUS_BITRATE,
+             '-application', 'voip', '-f', 'ogg'],
+}
+
+
+def audio_duration(path: Union[str, Path]) -> Optional[float]:
+    """
+    Duração em segundos lida apenas dos cabeçalhos (WAV, FLAC ou Ogg Opus).
+
+    Args:
+        path: Arquivo de áudio
+
+    Returns:
+        Duração em segundos, ou None se o formato não for reconhecido
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+
+        if head[:4] == b'RIFF':
+            with wave.open(str(path), 'rb') as wav:
+                return wav.getnframes() / wav.getframerate()
+
+        if head[:4] == b'fLaC':
+            # STREAMINFO: taxa (20 bits), canais (3), bits (5), total de amostras (36)
+            info = int.from_bytes(head[18:26], 'big')
+            sample_rate = info >> 44
+            total_samples = info & ((1 << 36) - 1)
+            return total_samples / sample_rate if sample_rate and total_samples else None
+
+        if head[:4] == b'OggS' and b'OpusHead' in head:
+            start = head.index(b'OpusHead')
+            pre_skip = int.from_bytes(head[start + 10:start + 12], 'little')
+            size = path.stat().st_size
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+            last_page = tail.rfind(b'OggS')
+            if last_page < 0:
+                return None
+            granule = int.from_bytes(tail[last_page + 6:last_page + 14], 'little')
+            return max(0, granule - pre_skip) / 48000
+
+    return None
+
+
+def raw_size_bytes(duration: float, sample_rate: int = SAMPLE_RATE) -> int:
+    """Tamanho equivalente em WAV PCM 16-bit mono."""
+    return int(duration * sample_rate) * 2 + 44
+
+
+def compress_audio(source: Union[str, Path], audio_format: str = 'flac',
+                   remove_source: bool = True) -> Path:
+    """
+    Converte um áudio para o formato de arquivo (16 kHz mono).
+
+    A saída é gravada em `<arquivo>.part` e renomeada ao final; a fonte só é
+    removida depois que a duração da cópia confere com a original.
+
+    Args:
+        source: Arquivo de origem (normalmente o WAV do scraper)
+        audio_format: flac ou opus
+        remove_source: Apagar a origem após a conversão
+
+    Returns:
+        Caminho do arquivo convertido
+
+    Raises:
+        RuntimeError: Se o ffmpeg falhar ou a duração não conferir
+    """
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("FFmpeg não encontrado para converter o áudio")
+
+    source = Path(source)
+    target = source.with_suffix(f".{audio_format}")
+    part_path = target.with_name(target.name + '.part')
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostdin', '-y', '-loglevel', 'error',
+         '-i', str(source), '-vn', '-ar', str(SAMPLE_RATE), '-ac', str(AudioConfig.CHANNELS),
+         *AUDIO_CODECS[audio_format], str(part_path)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        part_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg falhou: {result.stderr.strip()[-500:]}")
+
+    original, converted = audio_duration(source), audio_duration(part_path)
+    if original and (converted is None or abs(original - converted) > 1.0):
+        part_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Duração divergente após a conversão: {original:.1f}s → {converted}")
+
+    os.replace(part_path, target)
+    if remove_source and source != target:
+        source.unlink()
+        # O .npy decodificado do WAV não é usado pelo arquivo compactado
+        source.with_suffix('.npy').unlink(missing_ok=True)
+    return target
+
+
+def read_range(path: Union[str, Path], start: float, end: float,
+               sample_rate: int = SAMPLE_RATE):
+    """
+    Decodifica apenas o trecho [start, end) de um áudio do acervo.
+
+    Args:
+        path: Arquivo WAV, FLAC ou Opus
+        start: Início do trecho em segundos
+        end: Fim do trecho em segundos
+        sample_rate: Taxa de amostragem desejada
+
+    Returns:
+        Amostras float32 mono do trecho (numpy.ndarray)
+    """
+    # Importado aqui: o scraper usa apenas conversão e cabeçalhos, sem numpy
+    from streaming_transcriber import read_audio_range
+
+    if soundfile is not None and Path(path).suffix.lower() == '.flac':
+        with soundfile.SoundFile(str(path)) as f:
+            if f.samplerate == sample_rate and f.channels == 1:
+                f.seek(min(int(start * sample_rate), f.frames))
+                return f.read(int((end - start) * sample_rate), dtype='float32')
+    return read_audio_range(str(path), start, end, sample_rate)
+
+
+class ArchiveAudio:
+    """
+    Áudio do acervo (FLAC/Opus) visto como vetor float32 1-D a 16 kHz.
+
+    Aceita `len`, `shape` e fatias contíguas (`audio[a:b]`); cada fatia
+    decodifica apenas o trecho com `read_range`. `np.asarray(audio)`
+    decodifica o arquivo inteiro em memória (transcrição em passada única).
+    """
+
+    def __init__(self, path: Union[str, Path], sample_rate: int = SAMPLE_RATE):
+        """
+        Args:
+            path: Arquivo FLAC ou Opus
+
+        Raises:
+            ValueError: Se a duração não puder ser lida dos cabeçalhos
+        """
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        duration = audio_duration(self.path)
+        if duration is None:
+            raise ValueError(f"Duração não encontrada nos cabeçalhos: {self.path}")
+        self.shape = (int(round(duration * sample_rate)),)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        import numpy as np
+
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("ArchiveAudio aceita apenas fatias contíguas")
+        first, last, _ = key.indices(len(self))
+        if last <= first:
+            return np.zeros(0, dtype=np.float32)
+        samples = read_range(self.path, first / self.sample_rate, last / self.sample_rate,
+                             self.sample_rate)[:last - first]
+        if samples.size < last - first:
+            # Arredondamento da duração do cabeçalho: completar com silêncio
+            samples = np.concatenate((samples, np.zeros(last - first - samples.size, np.float32)))
+        return samples
+
+    def __array__(self, dtype=None, copy=None):
+        samples = self[0:len(self)]
+        return samples if dtype is None else samples.astype(dtype, copy=False)
+
+
+def file_sizes(path: Union[str, Path]) -> Dict[str, Optional[float]]:
+    """Tamanho em disco, tamanho equivalente em PCM (MB) e duração de um áudio."""
+    path = Path(path)
+    duration = audio_duration(path)
+    size_mb = path.stat().st_size / 1024 / 1024
+    return {
+        'file_size_mb': round(size_mb, 1),
+        'raw_size_mb': round(raw_size_bytes(duration) / 1024 / 1024, 1) if duration else None,
+        'duration_seconds': round(duration, 1) if duration else None,
+    }
+
+
+def main():
+    """Função principal para converter o acervo ou extrair trechos."""
+    parser = argparse.ArgumentParser(description="Arquivo compactado dos áudios das sessões")
+    parser.add_argument('--convert', choices=['flac', 'opus'],
+                        help='Converter os WAVs baixados para o formato indicado')
+    parser.add_argument('--keep-source', action='store_true', help='Manter os WAVs originais')
+    parser.add_argument('--clip', type=str, help='Arquivo de onde extrair um trecho')
+    parser.add_argument('--start', type=float, default=0.0, help='Início do trecho (s)')
+    parser.add_argument('--end', type=float, default=30.0, help='Fim do trecho (s)')
+    parser.add_argument('--output', type=str, default='trecho.wav', help='WAV do trecho extraído')
+    args = parser.parse_args()
+
+    if args.clip:
+        import numpy as np
+
+        samples = read_range(args.clip, args.start, args.end)
+        with wave.open(args.output, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+        print(f"✂️ Trecho {args.start:.1f}s–{args.end:.1f}s salvo em {args.output}")
+        return
+
+    if args.convert:
+        from metadata_store import MetadataStore, resolve_output_path
+
+        store = MetadataStore()
+        before = after = 0.0
+        for entry in store.all():
+            source = resolve_output_path(entry)
+            if source.suffix.lower() != '.wav' or not source.exists():
+                continue
+            size = source.stat().st_size / 1024 / 1024
+            try:
+                target = compress_audio(source, args.convert, remove_source=not args.keep_source)
+            except RuntimeError as e:
+                print(f"❌ {source.name}: {e}")
+                continue
+            sizes = file_sizes(target)
+            store.add({**entry, 'output_path': str(target), **sizes})
+            before += size
+            after += sizes['file_size_mb']
+            print(f"✅ {source.name} → {target.name} ({size:.1f} → {sizes['file_size_mb']} MB)")
+        print(f"\n📦 Total: {before:.1f} MB → {after:.1f} MB")
+        return
+
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
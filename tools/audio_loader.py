@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carregamento Único de Áudio com Memória Mapeada
+===============================================
+
+Decodifica cada áudio uma única vez para PCM float32 mono a 16 kHz (os
+parâmetros de `AudioConfig`) e guarda o resultado em um `.npy` ao lado do
+arquivo original. As execuções seguintes abrem esse `.npy` com `np.load(...,
+mmap_mode='c')`, sem chamar o FFmpeg e sem copiar o sinal para a memória.
+
+Diarização, transcrição, VAD e estatísticas recebem visões NumPy do mesmo
+buffer: fatias (`audio[a:b]`) e `torch.from_numpy` compartilham as páginas
+mapeadas em vez de duplicá-las.
+
+Arquivos do acervo compactado (FLAC/Opus, ver audio_archive.py) não geram
+`.npy`: `load_audio` devolve um `ArchiveAudio`, que decodifica apenas os
+trechos fatiados, e o pyannote recebe o caminho do arquivo para ler os
+trechos por conta própria.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import AudioConfig
+from audio_archive import ARCHIVE_SUFFIXES, ArchiveAudio
+from streaming_transcriber import open_pcm_reader, read_samples
+
+SAMPLE_RATE = AudioConfig.SAMPLE_RATE
+
+# Amostras decodificadas por bloco ao gerar o .npy (memória constante)
+DECODE_BLOCK = SAMPLE_RATE * 60
+
+# Tamanho fixo do cabeçalho .npy (versão 1.0) de um vetor float32 1-D
+_NPY_HEADER_SIZE = 128
+
+
+def sidecar_path(audio_path: Union[str, Path]) -> Path:
+    """Caminho do .npy decodificado correspondente a um áudio."""
+    return Path(audio_path).with_suffix(".npy")
+
+
+def temp_pattern(npy_path: Union[str, Path]) -> str:
+    """Padrão glob dos temporários de `decode_to_npy` para um .npy."""
+    return f"{Path(npy_path).stem}.*.npy.tmp"
+
+
+def _is_fresh(audio_path: Path, npy_path: Path) -> bool:
+    """O .npy existe e é mais novo que o áudio de origem."""
+    return npy_path.exists() and npy_path.stat().st_mtime >= audio_path.stat().st_mtime
+
+
+def _iter_blocks(audio_path: Union[str, Path]):
+    """Decodifica o áudio em blocos de DECODE_BLOCK amostras."""
+    reader, closer = open_pcm_reader(str(audio_path), SAMPLE_RATE)
+    try:
+        while True:
+            block = read_samples(reader, DECODE_BLOCK)
+            if not block.size:
+                break
+            yield block
+    finally:
+        closer()
+
+
+def decode_to_npy(audio_path: Union[str, Path], npy_path: Union[str, Path]) -> Path:
+    """
+    Decodifica o áudio em blocos diretamente para um arquivo .npy.
+
+    Os dados são gravados após um cabeçalho reservado e o cabeçalho é escrito
+    no final, quando o número de amostras é conhecido; assim a decodificação
+    não precisa manter o sinal inteiro em memória. Cada chamada grava em um
+    temporário próprio: processos que decodificam o mesmo áudio ao mesmo
+    tempo não se atrapalham e o último `os.replace` prevalece.
+
+    Args:
+        audio_path: Arquivo de áudio em qualquer formato suportado pelo FFmpeg
+        npy_path: Arquivo .npy de destino
+
+    Returns:
+        Caminho do .npy gerado
+    """
+    npy_path = Path(npy_path)
+    fd, tmp_name = tempfile.mkstemp(dir=npy_path.parent, prefix=f"{npy_path.stem}.",
+                                    suffix=".npy.tmp")
+    tmp_path = Path(tmp_name)
+
+    try:
+        total = 0
+        with os.fdopen(fd, 'wb') as f:
+            f.seek(_NPY_HEADER_SIZE)
+            for block in _iter_blocks(audio_path):
+                f.write(block.astype('<f4', copy=False).tobytes())
+                total += block.size
+
+            f.seek(0)
+            np.lib.format.write_array_header_1_0(
+                f, {'descr': '<f4', 'fortran_order': False, 'shape': (total,)}
+            )
+            if f.tell() != _NPY_HEADER_SIZE:
+                raise RuntimeError("Cabeçalho .npy com tamanho inesperado")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, npy_path)
+    return npy_path
+
+
+def load_audio(audio_path: Union[str, Path],
+               cache: bool = True) -> Union[np.ndarray, ArchiveAudio]:
+    """
+    Retorna o áudio como vetor float32 mono a 16 kHz mapeado em memória.
+
+    Args:
+        audio_path: Caminho do arquivo de áudio
+        cache: Reaproveitar/gerar o .npy ao lado do áudio
+
+    Returns:
+        Vetor NumPy (memmap copy-on-write) com as amostras, ou `ArchiveAudio`
+        (leitura por trechos) para arquivos FLAC/Opus do acervo
+    """
+    audio_path = Path(audio_path)
+    if audio_path.suffix == ".npy":
+        return np.load(audio_path, mmap_mode='c')
+    if audio_path.suffix.lower() in ARCHIVE_SUFFIXES:
+        return ArchiveAudio(audio_path, SAMPLE_RATE)
+
+    npy_path = sidecar_path(audio_path)
+    if not cache:
+        return np.concatenate(list(_iter_blocks(audio_path)) or [np.zeros(0, np.float32)])
+
+    if not _is_fresh(audio_path, npy_path):
+        decode_to_npy(audio_path, npy_path)
+    return np.load(npy_path, mmap_mode='c')
+
+
+def duration_seconds(samples: np.ndarray) -> float:
+    """Duração em segundos de um vetor de amostras a 16 kHz."""
+    return samples.shape[0] / SAMPLE_RATE
+
+
+def as_pyannote_input(samples: Union[np.ndarray, ArchiveAudio]) -> Dict:
+    """
+    Entrada em memória para pipelines do pyannote, sem cópia do sinal.
+
+    Args:
+        samples: Vetor float32 mono a 16 kHz (ou `ArchiveAudio`)
+
+    Returns:
+        Dicionário com `waveform` (tensor 1 × N) e `sample_rate`, ou com
+        `audio` (caminho do arquivo) para o acervo compactado
+    """
+    if isinstance(samples, ArchiveAudio):
+        # O pyannote lê do arquivo apenas os trechos de cada janela
+        return {"audio": str(samples.path)}
+
+    import torch
+
+    return {
+        "waveform": torch.from_numpy(np.asarray(samples)).unsqueeze(0),
+        "sample_rate": SAMPLE_RATE,
+    }
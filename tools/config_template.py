@@ -18,6 +18,41 @@ OPENAI_TEMPERATURE = 0.2
 # Máximo de tokens para resposta
 OPENAI_MAX_TOKENS = 3000
 
+# URL base de um servidor compatível com a API da OpenAI (None = api.openai.com)
+# Ex.: "http://localhost:8000/v1" para um servidor local de testes
+OPENAI_BASE_URL = None
+
+# Limites de taxa da conta (requisições e tokens por minuto)
+OPENAI_REQUESTS_PER_MINUTE = 500
+OPENAI_TOKENS_PER_MINUTE = 200000
+
+# Conexões HTTP simultâneas no pool do gateway
+OPENAI_MAX_CONNECTIONS = 16
+
+# Novas tentativas em erros transitórios (429, 5xx, timeouts) e timeout em segundos
+OPENAI_MAX_RETRIES = 5
+OPENAI_TIMEOUT = 120
+
+# Cache de respostas (data/processed/llm_cache.sqlite): mesma transcrição e
+# mesmo prompt não pagam a chamada novamente
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL_DAYS = 30
+LLM_CACHE_MAX_SIZE_MB = 256
+
+# ===========================================
+# CONFIGURAÇÕES DA ATA PARA SESSÕES LONGAS
+# ===========================================
+
+# Tokens de entrada aceitos em uma única chamada; acima disso a transcrição
+# é resumida em blocos (map-reduce) antes da redação da ata
+SUMMARY_CONTEXT_TOKENS = 24000
+
+# Tokens de transcrição por bloco resumido
+SUMMARY_CHUNK_TOKENS = 6000
+
+# Chamadas simultâneas ao modelo durante os resumos parciais
+SUMMARY_MAX_CONCURRENCY = 4
+
 # ===========================================
 # CONFIGURAÇÕES DO WHISPER
 # ===========================================
@@ -26,9 +61,31 @@ OPENAI_MAX_TOKENS = 3000
 # tiny = mais rápido, large = mais preciso
 WHISPER_MODEL = "small"
 
+# Backend de transcrição (openai-whisper ou faster-whisper)
+# faster-whisper usa CTranslate2 com quantização int8 em CPU: várias vezes
+# mais rápido e com menos memória (pip install faster-whisper)
+WHISPER_BACKEND = "openai-whisper"
+
+# Quantização do faster-whisper (int8, int8_float32, float16, float32;
+# None = int8 em CPU, float16 em GPU)
+WHISPER_COMPUTE_TYPE = None
+
+# Memória máxima (MB) somada dos modelos mantidos carregados (Whisper,
+# diarização). Modelos ociosos são descartados para caber no orçamento e
+# recarregados no próximo uso (None = sem limite)
+MODEL_MEMORY_BUDGET_MB = None
+
+# Trabalhos da fila processados ao mesmo tempo pela interface; os demais
+# envios aguardam na fila (data/processed/jobs.sqlite)
+JOB_WORKERS = 1
+
 # Idioma para transcrição (pt para português)
 WHISPER_LANGUAGE = "pt"
 
+# Modelo de embeddings da busca semântica (semantic_index.py), executado
+# localmente em CPU (pip install sentence-transformers)
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
 # ===========================================
 # CONFIGURAÇÕES DA DIARIZAÇÃO
 # ===========================================
@@ -39,6 +96,18 @@ USE_DIARIZATION = True
 # Modelo de diarização
 DIARIZATION_MODEL = "pyannote/speaker-diarization@2.1"
 
+# Registro de vozes entre sessões (data/processed/speakers.sqlite): troca os
+# rótulos SPEAKER_XX por identificadores estáveis (VOZ_0001...) ou pelos
+# nomes atribuídos com `python speaker_registry.py --name`
+SPEAKER_REGISTRY = True
+
+# Similaridade de cosseno mínima para reconhecer uma voz já cadastrada
+SPEAKER_MATCH_THRESHOLD = 0.6
+
+# Modelo de embedding de voz, usado quando o pipeline de diarização não
+# devolve os embeddings (pyannote < 3.1)
+SPEAKER_EMBEDDING_MODEL = "pyannote/wespeaker-voxceleb-resnet34-LM"
+
 # ===========================================
 # CONFIGURAÇÕES DA INTERFACE
 # ===========================================
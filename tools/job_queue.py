@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fila Persistente de Processamento de Atas
+=========================================
+
+Desacopla a interface Gradio do pipeline (diarização, transcrição e ata):
+
+- `JobQueue`: fila em SQLite (modo WAL) em `data/processed/jobs.sqlite`.
+  Cada envio recebe um identificador na hora; estado, progresso e resultado
+  ficam gravados e podem ser consultados depois, mesmo que o navegador seja
+  fechado ou a aplicação reiniciada
+- `JobWorkerPool`: threads que retiram trabalhos da fila e executam o
+  pipeline; o número de workers limita quantas sessões disputam os modelos
+  ao mesmo tempo, e os demais envios aguardam na fila
+
+Trabalhos que estavam em execução quando o processo parou voltam para a
+fila na próxima inicialização do servidor (`recover=True`); a consulta pela
+linha de comando não mexe nos trabalhos de um servidor em execução. A cópia
+do áudio enviado (e o `.npy` decodificado ao lado dela) é apagada quando o
+trabalho termina, com sucesso ou falha.
+
+Uso:
+    python job_queue.py --list            # Últimos trabalhos
+    python job_queue.py --show ID         # Estado e resultado de um trabalho
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories
+
+DEFAULT_DB_PATH = Directories.DATA_PROCESSED / "jobs.sqlite"
+DEFAULT_UPLOAD_DIR = Directories.DATA_PROCESSED / "uploads"
+
+STATUS_LABELS = {
+    "queued": "⏳ Na fila",
+    "running": "⚙️ Em processamento",
+    "done": "✅ Concluído",
+    "failed": "❌ Falhou",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    audio_path TEXT NOT NULL,
+    original_name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    stage TEXT,
+    worker TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+"""
+
+
+class JobQueue:
+    """Fila de trabalhos em SQLite, segura para uso entre threads."""
+
+    def __init__(self, db_path: Optional[Path] = None, upload_dir: Optional[Path] = None,
+                 recover: bool = False):
+        """
+        Abre (ou cria) a fila.
+
+        Args:
+            db_path: Arquivo SQLite (padrão: data/processed/jobs.sqlite)
+            upload_dir: Onde os áudios enviados são guardados até o processamento
+            recover: Devolver à fila os trabalhos 'running' de uma execução
+                anterior (apenas na inicialização do servidor que os executa)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.upload_dir = Path(upload_dir or DEFAULT_UPLOAD_DIR)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Sinaliza aos workers que há trabalho novo
+        self._available = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.recovered = self._requeue_interrupted() if recover else 0
+
+    def _requeue_interrupted(self) -> int:
+        """Trabalhos 'running' de uma execução anterior voltam para a fila."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', progress = 0, stage = NULL, "
+                "worker = NULL, started_at = NULL WHERE status = 'running'"
+            )
+        return cursor.rowcount
+
+    def submit(self, audio_path: str, original_name: Optional[str] = None) -> str:
+        """
+        Enfileira um áudio e devolve o identificador do trabalho.
+
+        O arquivo é copiado para `upload_dir`: os temporários do Gradio podem
+        ser apagados antes de o trabalho sair da fila.
+
+        Args:
+            audio_path: Arquivo enviado
+            original_name: Nome exibido (padrão: nome do arquivo)
+
+        Returns:
+            Identificador do trabalho
+        """
+        job_id = uuid.uuid4().hex[:12]
+        source = Path(audio_path)
+        stored = self.upload_dir / f"{job_id}{source.suffix}"
+        shutil.copy2(source, stored)
+
+        with self._available:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, status, audio_path, original_name, created_at) "
+                    "VALUES (?, 'queued', ?, ?, ?)",
+                    (job_id, str(stored), original_name or source.name, datetime.now().isoformat())
+                )
+            self._available.notify()
+        return job_id
+
+    def claim(self, worker: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Retira o trabalho mais antigo da fila, aguardando até `timeout` segundos.
+
+        Args:
+            worker: Nome do worker que assume o trabalho
+            timeout: Espera máxima por um trabalho (None = indefinida)
+
+        Returns:
+            O trabalho (já marcado como 'running') ou None
+        """
+        with self._available:
+            while True:
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = 'queued' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'running', worker = ?, started_at = ? "
+                            "WHERE job_id = ?",
+                            (worker, datetime.now().isoformat(), row["job_id"])
+                        )
+                    return self._get(row["job_id"])
+                if not self._available.wait(timeout):
+                    return None
+
+    def update_progress(self, job_id: str, progress: float, stage: Optional[str] = None):
+        """Registra o progresso (0 a 1) e a etapa atual."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, stage = COALESCE(?, stage) WHERE job_id = ?",
+                (progress, stage, job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict):
+        """Marca o trabalho como concluído e guarda o resultado."""
+        self._finish(job_id, "done", result=json.dumps(result, ensure_ascii=False))
+
+    def fail(self, job_id: str, error: str, result: Optional[Dict] = None):
+        """Marca o trabalho como falho."""
+        self._finish(job_id, "failed", error=error,
+                     result=json.dumps(result, ensure_ascii=False) if result else None)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, progress = 1, result = ?, error = ? "
+                "WHERE job_id = ?",
+                (status, datetime.now().isoformat(), result, error, job_id)
+            )
+
+    def discard_upload(self, job: Dict):
+        """Apaga a cópia do áudio enviado e o `.npy` decodificado ao lado dela."""
+        stored = Path(job["audio_path"])
+        if stored.parent.resolve() != self.upload_dir.resolve():
+            return
+        # Mesmos nomes usados por audio_loader.sidecar_path e audio_loader.temp_pattern
+        leftovers = list(stored.parent.glob(f"{stored.stem}.*.npy.tmp"))
+        for path in (stored, stored.with_suffix(".npy"), *leftovers):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Não foi possível apagar {path.name}: {e}")
+
+    def _get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Estado completo de um trabalho (com o resultado decodificado), ou None."""
+        with self._lock:
+            return self._get(job_id.strip())
+
+    def position(self, job_id: str) -> int:
+        """Quantos trabalhos estão à frente deste na fila (0 se não estiver na fila)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < "
+                "(SELECT created_at FROM jobs WHERE job_id = ? AND status = 'queued')",
+                (job_id,)
+            ).fetchone()
+        return row[0]
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """Trabalhos mais recentes, sem o resultado."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, status, original_name, created_at, finished_at, progress, stage "
+                "FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def wake_all(self):
+        """Acorda os workers em espera (usado no encerramento)."""
+        with self._available:
+            self._available.notify_all()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobWorkerPool:
+    """Threads que executam os trabalhos da fila."""
+
+    def __init__(self, queue: JobQueue,
+                 handler: Callable[[Dict, Callable[..., None]], Dict],
+                 workers: int = 1):
+        """
+        Args:
+            queue: Fila de trabalhos
+            handler: `handler(job, progress)` executa o pipeline e devolve o
+                resultado; `progress(valor, desc=...)` registra o andamento.
+                Exceções marcam o trabalho como falho.
+            workers: Trabalhos executados simultaneamente
+        """
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def start(self):
+        """Inicia os workers (chamadas repetidas não criam novas threads)."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(f"worker-{index + 1}",),
+                                      name=f"job-worker-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait: bool = True):
+        """Encerra os workers após o trabalho em andamento."""
+        self._stop.set()
+        self.queue.wake_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _run(self, worker: str):
+        while not self._stop.is_set():
+            job = self.queue.claim(worker, timeout=5.0)
+            if job is None:
+                continue
+
+            job_id = job["job_id"]
+
+            def progress(value, desc=None):
+                self.queue.update_progress(job_id, float(value), desc)
+
+            try:
+                self.queue.complete(job_id, self.handler(job, progress))
+            except Exception as e:
+                print(f"❌ Trabalho {job_id} falhou: {e}")
+                self.queue.fail(job_id, str(e))
+            finally:
+                self.queue.discard_upload(job)
+
+
+def main():
+    """Função principal para consultar a fila via linha de comando."""
+    parser = argparse.ArgumentParser(description="Fila de processamento de atas")
+    parser.add_argument('--list', action='store_true', help='Listar os últimos trabalhos')
+    parser.add_argument('--show', type=str, help='Mostrar estado e resultado de um trabalho')
+    parser.add_argument('--limit', type=int, default=20, help='Trabalhos listados')
+    parser.add_argument('--db', type=str, help='Arquivo SQLite da fila')
+    args = parser.parse_args()
+
+    queue = JobQueue(db_path=args.db)
+
+    if args.show:
+        job = queue.get(args.show)
+        if job is None:
+            print(f"❌ Trabalho não encontrado: {args.show}")
+            sys.exit(1)
+        print(json.dumps(job, ensure_ascii=False, indent=2))
+        return
+
+    print("\n=== FILA DE PROCESSAMENTO ===")
+    for job in queue.recent(args.limit):
+        print(f"{job['job_id']}  {STATUS_LABELS[job['status']]:<22} {job['progress']:>4.0%}  "
+              f"{job['created_at'][:19]}  {job['original_name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache Persistente de Respostas do Modelo de Linguagem
+=====================================================
+
+Guarda em SQLite (`data/processed/llm_cache.sqlite`) as respostas das
+chamadas de chat feitas pelo `LLMGateway`. A chave combina modelo,
+temperatura, limite de tokens, o hash do prompt de sistema e o hash do
+conteúdo enviado (transcrição ou resumo parcial).
+
+Como cada resumo parcial da fase map é uma chamada separada, uma mudança
+apenas no prompt da ata final (fase reduce) reaproveita todos os resumos de
+blocos que não mudaram.
+
+As entradas expiram por idade (TTL) e, acima do tamanho máximo, as menos
+usadas são descartadas.
+
+Uso:
+    python llm_cache.py --stats            # Resumo do cache
+    python llm_cache.py --purge            # Remove todas as entradas
+    python llm_cache.py --purge-expired    # Remove apenas as expiradas
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories
+
+DEFAULT_DB_PATH = Directories.DATA_PROCESSED / "llm_cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created);
+"""
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Cache SQLite de respostas de chat, com TTL e limite de tamanho."""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_days: float = 30.0,
+                 max_size_mb: float = 256.0):
+        """
+        Inicializa o cache.
+
+        Args:
+            db_path: Arquivo SQLite (padrão: data/processed/llm_cache.sqlite)
+            ttl_days: Idade máxima das entradas em dias
+            max_size_mb: Tamanho máximo das respostas armazenadas em MB
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int,
+                 messages: List[Dict]) -> Dict[str, str]:
+        """
+        Gera a chave de uma chamada.
+
+        O prompt de sistema e o conteúdo (mensagens do usuário) são
+        hasheados separadamente para permitir inspeção por prompt.
+
+        Returns:
+            Dicionário com `key`, `prompt_hash` e `input_hash`
+        """
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        content = json.dumps([m for m in messages if m["role"] != "system"],
+                             ensure_ascii=False, sort_keys=True)
+        prompt_hash, input_hash = sha256(system), sha256(content)
+        key = sha256(f"{model}|{temperature}|{max_tokens}|{prompt_hash}|{input_hash}")
+        return {"key": key, "prompt_hash": prompt_hash, "input_hash": input_hash}
+
+    def get(self, key: str) -> Optional[str]:
+        """Resposta armazenada e ainda válida, ou None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key_info: Dict[str, str], model: str, response: str):
+        """Armazena uma resposta e aplica os limites de idade e tamanho."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, prompt_hash, input_hash, response, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key_info["key"], model, key_info["prompt_hash"], key_info["input_hash"],
+                 response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Remove entradas expiradas e, se necessário, as menos usadas."""
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def purge(self, expired_only: bool = False) -> int:
+        """Remove entradas (todas ou apenas as expiradas) e retorna quantas foram removidas."""
+        with self._lock:
+            if expired_only:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,)
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def statistics(self) -> Dict:
+        """Resumo de ocupação do cache."""
+        with self._lock:
+            entries, size, hits, prompts = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0), "
+                "COUNT(DISTINCT prompt_hash) FROM responses"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_mb": round(size / 1024 / 1024, 2),
+            "max_size_mb": round(self.max_size_bytes / 1024 / 1024, 2),
+            "hits": hits,
+            "distinct_prompts": prompts,
+            "db_path": str(self.db_path),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Função principal para inspecionar ou limpar o cache via linha de comando."""
+    parser = argparse.ArgumentParser(description="Cache de respostas do modelo de linguagem")
+    parser.add_argument('--stats', action='store_true', help='Mostrar resumo do cache')
+    parser.add_argument('--purge', action='store_true', help='Remover todas as entradas')
+    parser.add_argument('--purge-expired', action='store_true', help='Remover entradas expiradas')
+    parser.add_argument('--db', type=str, help='Arquivo SQLite do cache')
+    args = parser.parse_args()
+
+    cache = LLMCache(db_path=args.db)
+    if args.purge:
+        print(f"🗑️ Entradas removidas: {cache.purge()}")
+    elif args.purge_expired:
+        print(f"🗑️ Entradas removidas: {cache.purge(expired_only=True)}")
+
+    stats = cache.statistics()
+    print("\n=== CACHE DE RESPOSTAS DO LLM ===")
+    print(f"Banco: {stats['db_path']}")
+    print(f"Entradas: {stats['entries']} ({stats['distinct_prompts']} prompts distintos)")
+    print(f"Tamanho: {stats['size_mb']} / {stats['max_size_mb']} MB")
+    print(f"Acertos acumulados: {stats['hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gateway Assíncrono para Modelos de Linguagem
+============================================
+
+Cliente assíncrono compatível com a API de chat da OpenAI
+(`POST {base_url}/chat/completions`) usado na geração das atas:
+
+- Pool de conexões HTTP reaproveitadas (httpx.AsyncClient)
+- Limitador token-bucket de requisições e de tokens por minuto
+- Novas tentativas com backoff exponencial e jitter (429, 5xx, timeouts),
+  respeitando o cabeçalho Retry-After (limitado a MAX_RETRY_AFTER)
+- Cache opcional de respostas em SQLite (llm_cache.py), consultado em
+  `asyncio.to_thread` para não bloquear o event loop compartilhado
+- Configuração em `config.py` (cópia de `config_template.py`): OPENAI_MODEL,
+  OPENAI_MAX_TOKENS, OPENAI_BASE_URL etc.
+
+O gateway mantém seu próprio event loop em uma thread de fundo, de modo que
+código síncrono (handlers do Gradio, pipeline em lote) compartilha o mesmo
+pool e os mesmos limites via `complete_sync`.
+
+Uso (teste de carga contra um servidor local, ver evaluation/mock_llm_server.py):
+    python llm_gateway.py --base-url http://localhost:8000/v1 --requests 200
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+from minutes_summarizer import count_tokens
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Espera máxima pedida por um Retry-After (segundos); valores maiores
+# prenderiam os workers da fila por tempo indefinido
+MAX_RETRY_AFTER = 120.0
+
+
+def load_config_module():
+    """Carrega `config.py` se existir, senão os valores padrão de `config_template.py`."""
+    try:
+        import config
+    except ImportError:
+        import config_template as config
+    return config
+
+
+@dataclass
+class GatewayConfig:
+    """Parâmetros do gateway (ver config_template.py)."""
+
+    api_key: Optional[str] = None
+    base_url: str = "https://api.openai.com/v1"
+    model: str = "gpt-4o-mini"
+    temperature: float = 0.2
+    max_tokens: int = 3000
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 200000
+    max_connections: int = 16
+    max_retries: int = 5
+    timeout: float = 120.0
+
+    @classmethod
+    def from_config(cls, api_key: Optional[str] = None) -> "GatewayConfig":
+        """Monta a configuração a partir de config.py / variáveis de ambiente."""
+        config = load_config_module()
+        configured_key = getattr(config, "OPENAI_API_KEY", None)
+        if configured_key == "your-openai-api-key-here":
+            configured_key = None
+        return cls(
+            api_key=api_key or os.getenv("OPENAI_API_KEY") or configured_key,
+            base_url=(os.getenv("OPENAI_BASE_URL") or getattr(config, "OPENAI_BASE_URL", None)
+                      or cls.base_url),
+            model=getattr(config, "OPENAI_MODEL", cls.model),
+            temperature=getattr(config, "OPENAI_TEMPERATURE", cls.temperature),
+            max_tokens=getattr(config, "OPENAI_MAX_TOKENS", cls.max_tokens),
+            requests_per_minute=getattr(config, "OPENAI_REQUESTS_PER_MINUTE", cls.requests_per_minute),
+            tokens_per_minute=getattr(config, "OPENAI_TOKENS_PER_MINUTE", cls.tokens_per_minute),
+            max_connections=getattr(config, "OPENAI_MAX_CONNECTIONS", cls.max_connections),
+            max_retries=getattr(config, "OPENAI_MAX_RETRIES", cls.max_retries),
+            timeout=getattr(config, "OPENAI_TIMEOUT", cls.timeout),
+        )
+
+
+class LLMError(Exception):
+    """Falha definitiva em uma chamada ao modelo de linguagem."""
+
+
+class TokenBucket:
+    """Balde de tokens assíncrono com reposição contínua."""
+
+    def __init__(self, capacity: float, per_seconds: float = 60.0):
+        """
+        Args:
+            capacity: Quantidade máxima consumível por janela
+            per_seconds: Duração da janela de reposição
+        """
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        """Aguarda até que `amount` tokens estejam disponíveis e os consome."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class LLMGateway:
+    """Cliente assíncrono com pool de conexões, limite de taxa e novas tentativas."""
+
+    def __init__(self, config: Optional[GatewayConfig] = None, cache=None):
+        """
+        Args:
+            config: Parâmetros do gateway (padrão: config.py)
+            cache: LLMCache para reaproveitar respostas idênticas (opcional)
+        """
+        self.config = config or GatewayConfig.from_config()
+        self.cache = cache
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._request_bucket = None
+        self._token_bucket = None
+        self._start_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "cache_hits": 0}
+
+    def _ensure_started(self):
+        """Inicia o event loop de fundo e cria o pool HTTP dentro dele."""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+    async def _setup(self):
+        headers = {"Content-Type": "application/json"}
+        if self.config.api_key:
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        self._client = httpx.AsyncClient(
+            base_url=self.config.base_url.rstrip("/"),
+            headers=headers,
+            timeout=self.config.timeout,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_connections,
+            ),
+        )
+        self._request_bucket = TokenBucket(self.config.requests_per_minute)
+        self._token_bucket = TokenBucket(self.config.tokens_per_minute)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Espera antes da próxima tentativa (full jitter, limitado a 60 s)."""
+        if retry_after:
+            try:
+                return min(max(0.0, float(retry_after)), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return random.uniform(0, min(60.0, 2 ** attempt))
+
+    def _parse_content(self, response: httpx.Response) -> str:
+        """
+        Texto da primeira escolha de uma resposta 200.
+
+        Raises:
+            LLMError: Se o corpo não estiver no formato da API de chat
+        """
+        try:
+            content = response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self.stats["failures"] += 1
+            raise LLMError(f"Resposta inválida do modelo ({type(e).__name__}): "
+                           f"{response.text[:200]}") from e
+        if not isinstance(content, str):
+            self.stats["failures"] += 1
+            raise LLMError(f"Resposta sem texto do modelo: {response.text[:200]}")
+        return content
+
+    async def complete(self, messages: List[Dict], max_tokens: Optional[int] = None,
+                       temperature: Optional[float] = None, model: Optional[str] = None) -> str:
+        """
+        Executa uma chamada de chat e devolve o texto gerado.
+
+        Args:
+            messages: Mensagens no formato da API de chat
+            max_tokens: Tokens máximos da resposta (padrão: OPENAI_MAX_TOKENS)
+            temperature: Temperatura (padrão: OPENAI_TEMPERATURE)
+            model: Modelo (padrão: OPENAI_MODEL)
+
+        Returns:
+            Conteúdo da primeira escolha
+
+        Raises:
+            LLMError: Se todas as tentativas falharem ou a resposta for inválida
+        """
+        max_tokens = max_tokens or self.config.max_tokens
+        payload = {
+            "model": model or self.config.model,
+            "messages": messages,
+            "temperature": self.config.temperature if temperature is None else temperature,
+            "max_tokens": max_tokens,
+        }
+        key_info = None
+        if self.cache is not None:
+            key_info = self.cache.make_key(payload["model"], payload["temperature"], max_tokens, messages)
+            cached = await asyncio.to_thread(self.cache.get, key_info["key"])
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        estimated_tokens = sum(count_tokens(m["content"]) for m in messages) + max_tokens
+
+        last_error = None
+        for attempt in range(self.config.max_retries + 1):
+            await self._request_bucket.acquire()
+            await self._token_bucket.acquire(estimated_tokens)
+            self.stats["requests"] += 1
+            retry_after = None
+            try:
+                response = await self._client.post("/chat/completions", json=payload)
+                if response.status_code == 200:
+                    content = self._parse_content(response)
+                    if key_info is not None:
+                        await asyncio.to_thread(self.cache.put, key_info, payload["model"], content)
+                    return content
+                last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRY_STATUS:
+                    break
+                retry_after = response.headers.get("retry-after")
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+
+            if attempt < self.config.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        self.stats["failures"] += 1
+        raise LLMError(last_error)
+
+    def run(self, coroutine):
+        """Executa uma corrotina no event loop do gateway e aguarda o resultado."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def complete_sync(self, messages: List[Dict], **kwargs) -> str:
+        """Versão síncrona de `complete` para código que não é assíncrono."""
+        return self.run(self.complete(messages, **kwargs))
+
+    def close(self):
+        """Fecha o pool HTTP e encerra o event loop de fundo."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+
+def main():
+    """Teste de carga do gateway contra um servidor compatível (ex.: mock local)."""
+    parser = argparse.ArgumentParser(description="Teste de carga do gateway de LLM")
+    parser.add_argument('--base-url', default="http://localhost:8000/v1", help='URL base da API')
+    parser.add_argument('--requests', type=int, default=100, help='Número de chamadas')
+    parser.add_argument('--rpm', type=int, default=6000, help='Limite de requisições por minuto')
+    parser.add_argument('--connections', type=int, default=16, help='Conexões no pool')
+    args = parser.parse_args()
+
+    gateway = LLMGateway(GatewayConfig(
+        api_key="mock",
+        base_url=args.base_url,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=10 ** 9,
+        max_connections=args.connections,
+    ))
+
+    async def load():
+        messages = [{"role": "user", "content": "Resuma a pauta da sessão."}]
+        results = await asyncio.gather(
+            *(gateway.complete(messages, max_tokens=50) for _ in range(args.requests)),
+            return_exceptions=True,
+        )
+        return sum(not isinstance(result, Exception) for result in results)
+
+    started = time.perf_counter()
+    ok = gateway.run(load())
+    elapsed = time.perf_counter() - started
+    gateway.close()
+
+    print(f"Chamadas bem-sucedidas: {ok}/{args.requests}")
+    print(f"Tempo total: {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"Tentativas extras: {gateway.stats['retries']}  Falhas: {gateway.stats['failures']}")
+
+
+if __name__ == "__main__":
+    main()
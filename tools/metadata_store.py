@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento Indexado dos Metadados de Download
+================================================
+
+Substitui o `metadata.json` do scraper por um banco SQLite em modo WAL
+(`data/raw/audio/metadata.sqlite`):
+
+- Chave primária `video_id` e índices por conselho, data e número da sessão
+- Verificação de "já baixado" em O(1) (conjunto de IDs em memória)
+- Cada download é gravado em uma transação própria, sem reescrever o arquivo
+  inteiro; leitores (pipeline em lote) não bloqueiam o scraper
+- Importação do `metadata.json` legado sem alterá-lo: o arquivo (versionado
+  no git) fica intacto e só é importado de novo se mudar (tamanho e data de
+  modificação guardados na tabela `info`)
+- Vídeos já vistos no canal e cursor da sincronização incremental
+
+Uso:
+    python metadata_store.py --stats               # Resumo dos downloads
+    python metadata_store.py --list --council consu
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import BASE_DIR, Directories, FileNaming
+
+COLUMNS = ["video_id", "title", "output_path", "download_date", "conselho",
+           "data_reuniao", "numero_sessao", "file_size_mb", "raw_size_mb", "duration_seconds"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    download_date TEXT NOT NULL,
+    conselho TEXT NOT NULL,
+    data_reuniao TEXT NOT NULL,
+    numero_sessao TEXT NOT NULL,
+    file_size_mb REAL,
+    raw_size_mb REAL,
+    duration_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS idx_downloads_conselho ON downloads(conselho);
+CREATE INDEX IF NOT EXISTS idx_downloads_data ON downloads(data_reuniao);
+CREATE INDEX IF NOT EXISTS idx_downloads_sessao ON downloads(conselho, numero_sessao);
+CREATE TABLE IF NOT EXISTS channel_videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    listed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def resolve_output_path(entry: Dict) -> Path:
+    """
+    Caminho do áudio de uma entrada dos metadados.
+
+    Metadados migrados do Windows guardam caminhos relativos com `\\`
+    (ex.: `data\\raw\\audio\\conepe\\2025-07-21_conepe_#63.wav`): eles são
+    convertidos e resolvidos a partir da raiz do projeto. Se o caminho
+    gravado não existir, vale o caminho padrão do FileNaming (com a extensão
+    gravada, caso o áudio tenha sido convertido).
+
+    Args:
+        entry: Entrada com output_path, data_reuniao, conselho e numero_sessao
+
+    Returns:
+        Caminho existente do áudio, ou o caminho padrão se nenhum existir
+    """
+    council = entry['conselho']
+    default = Directories.AUDIO_RAW / council / FileNaming.get_audio_filename(
+        entry['data_reuniao'], council, entry['numero_sessao'])
+    if not entry.get('output_path'):
+        return default
+
+    recorded = Path(entry['output_path'].replace('\\', '/'))
+    if not recorded.is_absolute():
+        recorded = BASE_DIR / recorded
+    if recorded.exists():
+        return recorded
+    if recorded.suffix and default.with_suffix(recorded.suffix).exists():
+        return default.with_suffix(recorded.suffix)
+    return default
+
+
+class MetadataStore:
+    """Metadados dos downloads em SQLite, seguros para uso entre threads."""
+
+    def __init__(self, db_path: Optional[Path] = None, json_path: Optional[Path] = None):
+        """
+        Abre (ou cria) o banco e importa o metadata.json legado, se houver.
+
+        Args:
+            db_path: Arquivo SQLite (padrão: data/raw/audio/metadata.sqlite)
+            json_path: metadata.json legado (padrão: ao lado do banco)
+        """
+        self.db_path = Path(db_path or Directories.METADATA_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.json_path = Path(json_path) if json_path else self.db_path.with_name("metadata.json")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._add_missing_columns()
+
+        self.migrated = self._migrate_json()
+        self._ids = {row[0] for row in self._conn.execute("SELECT video_id FROM downloads")}
+        self._listed_ids = {row[0] for row in self._conn.execute("SELECT video_id FROM channel_videos")}
+
+    def _add_missing_columns(self):
+        """Acrescenta colunas novas a bancos criados por versões anteriores."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(downloads)")}
+        for column in ("raw_size_mb", "duration_seconds"):
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE downloads ADD COLUMN {column} REAL")
+        self._conn.commit()
+
+    def _migrate_json(self) -> int:
+        """
+        Importa o metadata.json legado e retorna quantas entradas vieram.
+
+        O arquivo não é renomeado nem alterado (abrir o banco em modos de
+        consulta, como `--dry-run`, não mexe na árvore de trabalho); a marca
+        `json_imported` evita reimportar o mesmo conteúdo. Entradas já
+        presentes no banco prevalecem sobre as do JSON.
+        """
+        if not self.json_path.exists():
+            return 0
+        stat = self.json_path.stat()
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if self._get_info("json_imported") == signature:
+            return 0
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            legacy = json.load(f)
+
+        downloads = legacy.get("downloads", [])
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO downloads ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                [tuple(entry.get(column) for column in COLUMNS) for entry in downloads]
+            )
+            self._set_info("json_imported", signature)
+            if legacy.get("last_update") and not self._get_info("last_update"):
+                self._set_info("last_update", legacy["last_update"])
+        return len(downloads)
+
+    def _get_info(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, value))
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, entry: Dict):
+        """
+        Registra (ou atualiza) um download em uma transação atômica.
+
+        Args:
+            entry: Dicionário com as colunas de COLUMNS
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO downloads ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                tuple(entry.get(column) for column in COLUMNS)
+            )
+            self._set_info("last_update", datetime.now().isoformat())
+            self._ids.add(entry["video_id"])
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """Entrada de um vídeo, ou None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM downloads WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find(self, conselho: Optional[str] = None, data_reuniao: Optional[str] = None,
+             numero_sessao: Optional[str] = None) -> List[Dict]:
+        """
+        Busca downloads pelos campos indexados.
+
+        Args:
+            conselho: consu ou conepe
+            data_reuniao: Data no formato DD/MM/AAAA
+            numero_sessao: Número da sessão
+
+        Returns:
+            Lista de entradas na ordem de download
+        """
+        conditions, params = [], []
+        for column, value in (("conselho", conselho), ("data_reuniao", data_reuniao),
+                              ("numero_sessao", numero_sessao)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM downloads {where} ORDER BY download_date", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def all(self) -> List[Dict]:
+        """Todas as entradas, na ordem de download."""
+        return self.find()
+
+    def is_known(self, video_id: str) -> bool:
+        """Indica se o vídeo já foi visto no canal ou baixado."""
+        return video_id in self._listed_ids or video_id in self._ids
+
+    def add_listed(self, entries: List[Dict], cursor: Optional[str] = None):
+        """
+        Registra vídeos vistos no canal e, opcionalmente, o novo cursor.
+
+        Args:
+            entries: Entradas do canal com `id`, `title` e `url`
+            cursor: `video_id` mais recente do canal após a sincronização
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO channel_videos (video_id, title, url, listed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(entry['id'], entry['title'], entry['url'], now) for entry in entries]
+            )
+            if cursor:
+                self._set_info("sync_cursor", cursor)
+            self._set_info("last_sync", now)
+            self._listed_ids.update(entry['id'] for entry in entries)
+
+    def listed(self) -> List[Dict]:
+        """Vídeos vistos no canal, no formato das entradas do yt-dlp (mais recentes primeiro)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id AS id, title, url FROM channel_videos "
+                "ORDER BY listed_at DESC, rowid ASC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @property
+    def sync_cursor(self) -> Optional[str]:
+        """`video_id` mais recente visto na última sincronização."""
+        with self._lock:
+            return self._get_info("sync_cursor")
+
+    @property
+    def last_update(self) -> Optional[str]:
+        with self._lock:
+            return self._get_info("last_update")
+
+    def statistics(self) -> Dict:
+        """
+        Totais por conselho e tamanhos acumulados.
+
+        `total_size_mb` é o espaço em disco; `raw_size_mb` é o equivalente em
+        WAV PCM (entradas antigas, sempre WAV, contam o próprio tamanho).
+        """
+        with self._lock:
+            total, consu, conepe, size, raw = self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(conselho = 'consu'), 0), "
+                "COALESCE(SUM(conselho = 'conepe'), 0), "
+                "COALESCE(SUM(file_size_mb), 0), "
+                "COALESCE(SUM(COALESCE(raw_size_mb, file_size_mb)), 0) FROM downloads"
+            ).fetchone()
+        return {
+            "total": total,
+            "consu": consu,
+            "conepe": conepe,
+            "total_size_mb": round(size, 1),
+            "raw_size_mb": round(raw, 1),
+            "compression_ratio": round(raw / size, 1) if size else None,
+            "last_update": self.last_update
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Função principal para consultar os metadados via linha de comando."""
+    parser = argparse.ArgumentParser(description="Metadados dos downloads das reuniões")
+    parser.add_argument('--stats', action='store_true', help='Mostrar resumo dos downloads')
+    parser.add_argument('--list', action='store_true', help='Listar downloads')
+    parser.add_argument('--council', choices=['consu', 'conepe'], help='Filtrar por conselho')
+    parser.add_argument('--db', type=str, help='Arquivo SQLite dos metadados')
+    args = parser.parse_args()
+
+    store = MetadataStore(db_path=args.db)
+    if store.migrated:
+        print(f"📦 {store.migrated} entradas importadas de {store.json_path}")
+
+    if args.list:
+        for entry in store.find(conselho=args.council):
+            print(f"[{entry['conselho'].upper()}] {entry['data_reuniao']} #{entry['numero_sessao']}"
+                  f"  {entry['video_id']}  {entry['output_path']}")
+
+    if args.stats or not args.list:
+        stats = store.statistics()
+        print("\n=== METADADOS DOS DOWNLOADS ===")
+        print(f"Banco: {store.db_path}")
+        print(f"Total: {stats['total']} (CONSU: {stats['consu']}, CONEPE: {stats['conepe']})")
+        print(f"Tamanho total: {stats['total_size_mb']} MB (PCM equivalente: {stats['raw_size_mb']} MB)")
+        print(f"Última atualização: {stats['last_update']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geração Hierárquica de Atas (Map-Reduce)
+========================================
+
+Sessões longas dos conselhos ultrapassam o contexto do modelo de linguagem.
+Este módulo divide a transcrição atribuída a participantes em blocos com
+orçamento de tokens, resume os blocos em paralelo (com concorrência
+limitada) e depois combina os resumos na ata final com as seções PAUTA,
+DELIBERAÇÕES e ENCAMINHAMENTOS.
+
+Se a soma dos resumos parciais ainda não couber no orçamento, eles são
+combinados em níveis sucessivos até caberem.
+
+As chamadas passam pelo `LLMGateway` (llm_gateway.py), que limita a taxa e
+repete falhas transitórias; apontando-o (OPENAI_BASE_URL) para um servidor
+local de testes, o fluxo inteiro pode ser exercitado sem custo.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken é opcional
+    _ENCODING = None
+
+
+MAP_SYSTEM_PROMPT = """Você é um assistente que resume trechos de reuniões de conselhos universitários.
+Para o trecho recebido, liste de forma objetiva:
+- PAUTA: assuntos discutidos no trecho
+- DELIBERAÇÕES: decisões, votações e resultados (com números de votos quando citados)
+- ENCAMINHAMENTOS: ações futuras, responsáveis e prazos
+- FALAS RELEVANTES: posicionamentos importantes, indicando o participante
+Não invente informações ausentes do trecho."""
+
+REDUCE_SYSTEM_PROMPT = """Você combina resumos parciais consecutivos de uma mesma reunião.
+Una os itens repetidos, preserve a ordem cronológica e mantenha as seções
+PAUTA, DELIBERAÇÕES, ENCAMINHAMENTOS e FALAS RELEVANTES."""
+
+
+def count_tokens(text: str) -> int:
+    """Conta tokens com tiktoken quando disponível, ou estima (~4 caracteres por token)."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4 + 1
+
+
+def format_timestamp(seconds: float) -> str:
+    """Converte segundos em HH:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def transcript_lines(speaker_transcriptions: List[Dict]) -> List[str]:
+    """Linhas "[HH:MM:SS] PARTICIPANTE: texto", agrupando falas consecutivas do mesmo participante."""
+    lines = []
+    current_speaker, current_start, current_text = None, 0.0, []
+    for segment in speaker_transcriptions:
+        if segment["speaker"] != current_speaker and current_text:
+            lines.append(f"[{format_timestamp(current_start)}] {current_speaker}: {' '.join(current_text)}")
+            current_text = []
+        if not current_text:
+            current_speaker, current_start = segment["speaker"], segment["start"]
+        current_text.append(segment["text"])
+    if current_text:
+        lines.append(f"[{format_timestamp(current_start)}] {current_speaker}: {' '.join(current_text)}")
+    return lines
+
+
+def split_into_chunks(lines: List[str], max_tokens: int) -> List[str]:
+    """
+    Agrupa linhas consecutivas em blocos de até `max_tokens` tokens.
+
+    Linhas maiores que o orçamento são quebradas por palavras.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for line in lines:
+        tokens = count_tokens(line)
+        if tokens > max_tokens:
+            words = line.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            pieces = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            pieces = [line]
+
+        for piece in pieces:
+            piece_tokens = count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class MinutesSummarizer:
+    """Gera atas de transcrições longas em duas fases (map e reduce)."""
+
+    def __init__(self, llm, chunk_tokens: int = 6000, context_tokens: int = 24000,
+                 map_max_tokens: int = 800, final_max_tokens: int = 3000,
+                 max_concurrency: int = 4):
+        """
+        Inicializa o sumarizador.
+
+        Args:
+            llm: LLMGateway (ou objeto com `complete` assíncrono e `run`)
+            chunk_tokens: Tokens de transcrição por bloco na fase map
+            context_tokens: Tokens de entrada aceitos em uma única chamada
+            map_max_tokens: Tokens máximos de cada resumo parcial
+            final_max_tokens: Tokens máximos da ata final
+            max_concurrency: Chamadas simultâneas ao modelo
+        """
+        self.llm = llm
+        self.chunk_tokens = chunk_tokens
+        self.context_tokens = context_tokens
+        self.map_max_tokens = map_max_tokens
+        self.final_max_tokens = final_max_tokens
+        self.max_concurrency = max_concurrency
+
+    async def complete(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+        """Executa uma chamada de chat e devolve o texto gerado."""
+        return await self.llm.complete(
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens
+        )
+
+    async def _parallel(self, function: Callable[..., Awaitable], items: List) -> List:
+        """Aplica `function` aos itens com no máximo `max_concurrency` chamadas simultâneas."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(item):
+            async with semaphore:
+                return await function(item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+    async def summarize_chunk(self, chunk: str) -> str:
+        """Fase map: resumo estruturado de um bloco da transcrição."""
+        return await self.complete(
+            MAP_SYSTEM_PROMPT,
+            f"TRECHO DA TRANSCRIÇÃO:\n{chunk}",
+            self.map_max_tokens
+        )
+
+    async def combine(self, summaries: List[str]) -> str:
+        """Combina resumos parciais consecutivos em um único resumo."""
+        joined = "\n\n".join(f"--- PARTE {i} ---\n{summary}" for i, summary in enumerate(summaries, 1))
+        return await self.complete(REDUCE_SYSTEM_PROMPT, joined, self.map_max_tokens * 2)
+
+    async def reduce(self, summaries: List[str]) -> List[str]:
+        """Combina resumos em níveis até que caibam no contexto de uma chamada."""
+        budget = self.context_tokens - self.final_max_tokens
+        while len(summaries) > 1 and sum(count_tokens(s) for s in summaries) > budget:
+            groups, current, current_tokens = [], [], 0
+            for summary in summaries:
+                tokens = count_tokens(summary)
+                if current and current_tokens + tokens > self.chunk_tokens:
+                    groups.append(current)
+                    current, current_tokens = [], 0
+                current.append(summary)
+                current_tokens += tokens
+            groups.append(current)
+
+            if len(groups) == len(summaries):
+                # Cada resumo já ocupa um grupo inteiro: combinar em pares
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            summaries = await self._parallel(self.combine, groups)
+        return summaries
+
+    def chunks_for(self, speaker_transcriptions: List[Dict],
+                   full_transcription: str = "") -> List[str]:
+        """Blocos da transcrição (atribuída a participantes, se houver)."""
+        if speaker_transcriptions:
+            lines = transcript_lines(speaker_transcriptions)
+        else:
+            lines = [line for line in full_transcription.split(". ") if line]
+        return split_into_chunks(lines, self.chunk_tokens)
+
+    async def agenerate(self, system_prompt: str, speaker_transcriptions: List[Dict],
+                        full_transcription: str = "", speaker_context: str = "") -> str:
+        """
+        Gera a ata completa de uma transcrição longa.
+
+        Args:
+            system_prompt: Instruções da ata final (mesmas da chamada única)
+            speaker_transcriptions: Segmentos com `speaker`, `start` e `text`
+            full_transcription: Texto completo, usado se não houver segmentos
+            speaker_context: Resumo de participação por participante
+
+        Returns:
+            Texto da ata
+        """
+        chunks = self.chunks_for(speaker_transcriptions, full_transcription)
+        summaries = await self._parallel(self.summarize_chunk, chunks)
+        summaries = await self.reduce(summaries)
+
+        user_prompt = (
+            "RESUMOS SEQUENCIAIS DA REUNIÃO (na ordem em que ocorreram):\n\n"
+            + "\n\n".join(f"--- PARTE {i} ---\n{s}" for i, s in enumerate(summaries, 1))
+            + f"\n{speaker_context}\n\n"
+            "Por favor, gere uma ata completa, formal e bem estruturada baseada nestes resumos, "
+            "com as seções PAUTA, DELIBERAÇÕES e ENCAMINHAMENTOS."
+        )
+        return await self.complete(system_prompt, user_prompt, self.final_max_tokens)
+
+    def generate(self, system_prompt: str, speaker_transcriptions: List[Dict],
+                 full_transcription: str = "", speaker_context: str = "") -> str:
+        """Versão síncrona de `agenerate`, executada no event loop do gateway."""
+        return self.llm.run(self.agenerate(
+            system_prompt, speaker_transcriptions, full_transcription, speaker_context
+        ))
+
+    def fits_single_call(self, text: str, reserve: Optional[int] = None) -> bool:
+        """Indica se a transcrição cabe em uma única chamada ao modelo."""
+        reserve = self.final_max_tokens if reserve is None else reserve
+        return count_tokens(text) + reserve + 1000 <= self.context_tokens
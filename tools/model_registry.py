@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de Modelos Compartilhados e Carregados sob Demanda
+===========================================================
+
+Carregar o Whisper e o pipeline do pyannote leva dezenas de segundos e
+vários GB de memória. O registro guarda apenas a receita de cada modelo
+(`register`) e o carrega no primeiro uso:
+
+- Uma única instância por nome, compartilhada entre requisições e threads;
+  chamadas simultâneas ao mesmo modelo esperam o mesmo carregamento
+- Inferência serializada: o Whisper e o pyannote não são seguros entre
+  threads, então cada `use` de um modelo exclusivo (padrão) segura o lock
+  de inferência dele durante todo o bloco `with`
+- `warm_async` pré-carrega os modelos em segundo plano: a interface sobe
+  na hora e a primeira requisição espera no máximo o carregamento restante
+- Orçamento de memória: antes de carregar um modelo, os modelos ociosos
+  (sem uso em andamento) menos usados recentemente são descartados até que
+  o novo caiba no orçamento
+- `shared_registry()` devolve o registro do processo, para que demo,
+  pipeline em lote e notebooks reaproveitem os mesmos modelos
+
+Uso:
+    registry = shared_registry()
+    registry.register("whisper", lambda: load_backend("faster-whisper", "small"))
+    with registry.use("whisper") as model:
+        model.transcribe(samples, language="pt")
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+def current_rss_mb() -> float:
+    """Memória residente atual do processo (MB)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        # Fora do Linux: pico de memória (KB no Linux, bytes no macOS)
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+class _Entry:
+    """Estado de um modelo registrado."""
+
+    def __init__(self, loader: Callable[[], Any], size_mb: Optional[float], exclusive: bool):
+        self.loader = loader
+        self.exclusive = exclusive
+        self.size_hint_mb = size_mb
+        self.size_mb = size_mb or 0.0
+        self.model = None
+        self.in_use = 0
+        self.last_used = 0.0
+        self.load_seconds = None
+        self.error = None
+        self.lock = threading.Lock()
+        # Reentrante: um `use` aninhado do mesmo modelo na mesma thread não trava
+        self.inference_lock = threading.RLock()
+
+
+class ModelRegistry:
+    """Modelos carregados no primeiro uso, compartilhados e mantidos aquecidos."""
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        """
+        Args:
+            memory_budget_mb: Memória máxima somada dos modelos carregados
+                (None = sem limite)
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        # Um carregamento por vez: a medição de memória de cada modelo não
+        # se mistura com a de outro e o pico de memória fica limitado
+        self._load_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], size_mb: Optional[float] = None,
+                 exclusive: bool = True):
+        """
+        Registra a receita de um modelo, sem carregá-lo.
+
+        Args:
+            name: Nome do modelo no registro
+            loader: Função sem argumentos que carrega e devolve o modelo
+            size_mb: Memória estimada (se omitida, é medida no carregamento)
+            exclusive: Serializar a inferência: um `use` por vez, entre
+                todas as threads (False apenas para modelos thread-safe)
+        """
+        with self._lock:
+            current = self._entries.get(name)
+            if current is not None and current.model is not None:
+                return
+            self._entries[name] = _Entry(loader, size_mb, exclusive)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._entries
+
+    def load_error(self, name: str) -> Optional[Exception]:
+        """Erro do último carregamento do modelo, se houver."""
+        entry = self._entries.get(name)
+        return entry.error if entry is not None else None
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.model is not None
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Modelo não registrado: {name}") from None
+
+    def get(self, name: str) -> Any:
+        """
+        Devolve o modelo, carregando-o se necessário.
+
+        Prefira `use` quando o modelo for usado por um tempo prolongado: o
+        modelo em uso não é descartado pelo orçamento de memória.
+
+        Raises:
+            KeyError: Se o modelo não estiver registrado
+            Exception: O erro do carregamento (repetido nas chamadas seguintes)
+        """
+        entry = self._entry(name)
+        with entry.lock:
+            if entry.model is None:
+                if entry.error is not None:
+                    raise entry.error
+                self._load(name, entry)
+            entry.last_used = time.monotonic()
+            return entry.model
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """
+        Empresta o modelo; enquanto emprestado ele não é descartado.
+
+        Para modelos exclusivos, o bloco inteiro roda com o lock de
+        inferência do modelo: outras threads esperam a vez em `use`.
+        """
+        entry = self._entry(name)
+        with self._lock:
+            entry.in_use += 1
+        try:
+            if entry.exclusive:
+                with entry.inference_lock:
+                    yield self.get(name)
+            else:
+                yield self.get(name)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+            # Modelos carregados enquanto este estava em uso podem ter
+            # ultrapassado o orçamento
+            self._make_room(0.0, keep=None)
+
+    def _load(self, name: str, entry: _Entry):
+        """Carrega o modelo (chamado com `entry.lock` adquirido)."""
+        with self._load_lock:
+            if entry.size_hint_mb:
+                self._make_room(entry.size_hint_mb, keep=name)
+            before = current_rss_mb()
+            began = time.perf_counter()
+            try:
+                entry.model = entry.loader()
+            except Exception as e:
+                entry.error = e
+                raise
+            entry.load_seconds = time.perf_counter() - began
+            if not entry.size_hint_mb:
+                entry.size_mb = max(0.0, current_rss_mb() - before)
+                self._make_room(0.0, keep=name)
+
+    def _make_room(self, needed_mb: float, keep: Optional[str]):
+        """Descarta modelos ociosos (LRU) até caber `needed_mb` no orçamento."""
+        if self.memory_budget_mb is None:
+            return
+        with self._lock:
+            loaded = [(n, e) for n, e in self._entries.items() if e.model is not None]
+            used = sum(e.size_mb for _, e in loaded)
+            if used + needed_mb <= self.memory_budget_mb:
+                return
+            idle = sorted(
+                ((n, e) for n, e in loaded if n != keep and e.in_use == 0),
+                key=lambda item: item[1].last_used
+            )
+        for name, entry in idle:
+            if used + needed_mb <= self.memory_budget_mb:
+                break
+            # Sem bloquear: um modelo sendo obtido agora não é descartado
+            if entry.lock.acquire(blocking=False):
+                try:
+                    if entry.in_use == 0 and entry.model is not None:
+                        used -= entry.size_mb
+                        entry.model = None
+                        print(f"♻️ Modelo ocioso descartado: {name} ({entry.size_mb:.0f} MB)")
+                finally:
+                    entry.lock.release()
+        gc.collect()
+
+    def evict(self, name: str) -> bool:
+        """Descarta um modelo carregado que não esteja em uso."""
+        entry = self._entry(name)
+        with entry.lock:
+            if entry.model is None or entry.in_use:
+                return False
+            entry.model = None
+        gc.collect()
+        return True
+
+    def warm(self, names: Optional[Iterable[str]] = None):
+        """Carrega os modelos indicados (padrão: todos), ignorando falhas."""
+        for name in list(names or self._entries):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ Falha ao pré-carregar {name}: {e}")
+
+    def warm_async(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Pré-carrega os modelos em uma thread de segundo plano."""
+        thread = threading.Thread(target=self.warm, args=(names,),
+                                  name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Dict]:
+        """Estado de cada modelo: carregado, em uso, memória e tempo de carga."""
+        with self._lock:
+            return {
+                name: {
+                    "loaded": entry.model is not None,
+                    "in_use": entry.in_use,
+                    "exclusive": entry.exclusive,
+                    "size_mb": round(entry.size_mb, 1),
+                    "load_seconds": round(entry.load_seconds, 1) if entry.load_seconds else None,
+                    "error": str(entry.error) if entry.error else None,
+                }
+                for name, entry in self._entries.items()
+            }
+
+
+_shared_registry: Optional[ModelRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def shared_registry(memory_budget_mb: Optional[float] = None) -> ModelRegistry:
+    """
+    Registro único do processo.
+
+    Args:
+        memory_budget_mb: Orçamento aplicado ao registro (mantém o atual se None)
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ModelRegistry(memory_budget_mb)
+        elif memory_budget_mb is not None:
+            _shared_registry.memory_budget_mb = memory_budget_mb
+        return _shared_registry
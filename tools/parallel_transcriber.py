@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcrição Paralela em CPU
+===========================
+
+Divide uma sessão em trechos alinhados a silêncios e transcreve cada trecho
+em um processo separado de um `ProcessPoolExecutor`. Cada worker carrega o
+seu próprio modelo (openai-whisper ou faster-whisper, ver asr_backends.py)
+uma única vez e limita o número de threads do backend, de modo que
+`workers × threads_por_worker` corresponda aos núcleos disponíveis na
+máquina (8 a 64 núcleos nos servidores do projeto).
+
+Os resultados são reunidos no mesmo formato de `segments` devolvido pelo
+Whisper e usado por `AtaSystemUFS.transcribe_with_diarization`.
+
+Com as regiões de fala do VAD (voice_activity.py), os blocos contêm apenas
+fala concatenada e os silêncios não chegam aos workers.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from asr_backends import FasterWhisperBackend, load_backend
+from audio_loader import load_audio
+from streaming_transcriber import SAMPLE_RATE, iter_audio_windows, read_audio_range
+from voice_activity import SpeechTimeline, pack_regions
+
+# Modelo carregado em cada processo worker (inicializado por _init_worker)
+_worker_model = None
+
+
+def _init_worker(backend: str, model_name: str, threads: int,
+                 compute_type: Optional[str] = None):
+    """Carrega o modelo de transcrição uma vez por processo worker."""
+    global _worker_model
+    if backend == FasterWhisperBackend.name:
+        _worker_model = load_backend(backend, model_name, device="cpu",
+                                     compute_type=compute_type, cpu_threads=threads)
+        return
+
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_model = load_backend(backend, model_name, device="cpu")
+
+
+def _transcribe_chunk(audio_path: str, start: float, end: float,
+                      language: str) -> List[Dict]:
+    """Transcreve um trecho no worker e devolve segmentos com tempos absolutos."""
+    # O .npy já foi gerado pelo processo principal: o worker apenas o mapeia
+    # (FLAC/Opus do acervo: só o trecho é decodificado, ver ArchiveAudio)
+    samples = read_audio_range(load_audio(audio_path), start, end)
+    result = _worker_model.transcribe(samples, language=language, fp16=False)
+
+    return [
+        {
+            "start": start + segment["start"],
+            "end": min(start + segment["end"], end),
+            "text": segment["text"],
+        }
+        for segment in result.get("segments", [])
+    ]
+
+
+def _transcribe_regions(audio_path: str, regions: List[Tuple[float, float]],
+                        language: str) -> List[Dict]:
+    """Transcreve regiões de fala concatenadas e devolve segmentos com tempos absolutos."""
+    timeline = SpeechTimeline(regions, regions[-1][1])
+    samples = timeline.compact(load_audio(audio_path))
+    result = _worker_model.transcribe(samples, language=language, fp16=False)
+    return timeline.map_segments([
+        {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+        for segment in result.get("segments", [])
+    ])
+
+
+def find_silence_cuts(audio: Union[str, np.ndarray], chunk_seconds: float = 300.0,
+                      search_seconds: float = 20.0,
+                      frame_seconds: float = 0.1) -> List[Tuple[float, float]]:
+    """
+    Divide o áudio em trechos cujas fronteiras caem em momentos de silêncio.
+
+    A energia RMS é calculada em quadros curtos lendo o arquivo em streaming;
+    cada corte é posicionado no quadro de menor energia dentro de uma janela
+    de busca em torno do ponto ideal.
+
+    Args:
+        audio: Caminho do arquivo de áudio ou vetor float32 a 16 kHz
+        chunk_seconds: Duração alvo de cada trecho
+        search_seconds: Tolerância em torno do ponto ideal de corte
+        frame_seconds: Duração de cada quadro de energia
+
+    Returns:
+        Lista de tuplas (inicio, fim) em segundos
+    """
+    frame = int(frame_seconds * SAMPLE_RATE)
+    energies = []
+    for _, samples, _ in iter_audio_windows(audio, 60.0, 0.0):
+        usable = samples[:samples.size - samples.size % frame]
+        if usable.size:
+            energies.append(np.sqrt(np.mean(usable.reshape(-1, frame) ** 2, axis=1)))
+        if usable.size < samples.size:
+            energies.append(np.array([np.sqrt(np.mean(samples[usable.size:] ** 2))]))
+
+    if not energies:
+        return []
+    energy = np.concatenate(energies)
+    total = energy.size * frame_seconds
+
+    frames_per_chunk = int(chunk_seconds / frame_seconds)
+    radius = int(search_seconds / frame_seconds)
+
+    cuts = [0]
+    target = frames_per_chunk
+    while target + radius < energy.size:
+        low, high = target - radius, target + radius
+        cut = low + int(np.argmin(energy[low:high]))
+        cuts.append(cut)
+        target = cut + frames_per_chunk
+
+    bounds = [round(cut * frame_seconds, 3) for cut in cuts] + [round(total, 3)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class ParallelTranscriber:
+    """Transcreve uma sessão em paralelo usando um pool de processos."""
+
+    def __init__(self, model_name: str = "small", language: str = "pt",
+                 workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None,
+                 chunk_seconds: float = 300.0,
+                 backend: str = "openai-whisper",
+                 compute_type: Optional[str] = None):
+        """
+        Inicializa o transcritor paralelo.
+
+        Args:
+            model_name: Modelo Whisper carregado em cada worker
+            language: Idioma da transcrição
+            workers: Número de processos (padrão: núcleos / threads_per_worker)
+            threads_per_worker: Threads do backend por processo (padrão: 2)
+            chunk_seconds: Duração alvo de cada trecho
+            backend: openai-whisper ou faster-whisper
+            compute_type: Quantização do faster-whisper (ex.: int8, int8_float32;
+                None = padrão do backend em CPU)
+        """
+        cpus = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or min(2, cpus)
+        self.workers = workers or max(1, cpus // self.threads_per_worker)
+        self.model_name = model_name
+        self.backend = backend
+        self.compute_type = compute_type
+        self.language = language
+        self.chunk_seconds = chunk_seconds
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Cria o pool sob demanda e o reaproveita entre sessões."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.backend, self.model_name, self.threads_per_worker,
+                          self.compute_type),
+            )
+        return self._executor
+
+    def transcribe(self, audio_path: str,
+                   regions: Optional[List[Tuple[float, float]]] = None,
+                   on_segments: Optional[Callable[[List[Dict]], None]] = None) -> Dict:
+        """
+        Transcreve o áudio completo.
+
+        Args:
+            audio_path: Caminho do arquivo de áudio
+            regions: Regiões de fala (VAD); se fornecidas, só elas são transcritas
+            on_segments: Chamado com os segmentos de cada trecho, na ordem do áudio
+
+        Returns:
+            Dicionário com `text` e `segments`, como `whisper.transcribe`
+        """
+        executor = self._get_executor()
+
+        if regions is not None:
+            futures = [
+                executor.submit(_transcribe_regions, str(audio_path), chunk, self.language)
+                for chunk in pack_regions(regions, self.chunk_seconds)
+            ]
+        else:
+            # Decodifica uma única vez; os workers reutilizam o .npy mapeado
+            chunks = find_silence_cuts(load_audio(audio_path), self.chunk_seconds)
+            futures = [
+                executor.submit(_transcribe_chunk, str(audio_path), start, end, self.language)
+                for start, end in chunks
+            ]
+
+        segments = []
+        for future in futures:
+            chunk_segments = future.result()
+            segments.extend(chunk_segments)
+            if on_segments and chunk_segments:
+                on_segments(chunk_segments)
+        segments.sort(key=lambda segment: segment["start"])
+
+        for index, segment in enumerate(segments):
+            segment["id"] = index
+
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+        }
+
+    def close(self):
+        """Encerra os processos workers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Processamento em Lote do Acervo de Reuniões CONSU e CONEPE
+==========================================================
+
+Lê os metadados do scraper e processa todas as sessões pendentes sem passar
+pela interface Gradio: diarização, transcrição e geração da ata.
+
+As etapas rodam em pipeline: enquanto o modelo de linguagem redige a ata de
+uma sessão, a próxima sessão já está sendo transcrita.
+
+Arquivos gerados (padrão FileNaming):
+- data/transcricoes/AAAA-MM-DD_conselho_#XX_transcricao.txt
+- data/transcricoes/AAAA-MM-DD_conselho_#XX_transcricao.json
+- data/atas-geradas/AAAA-MM-DD_conselho_#XX_ata.md
+
+Cada transcrição e cada ata entram no índice de busca (search_index.py)
+assim que são gravadas; com --semantic, as sessões processadas também são
+embutidas no índice semântico (semantic_index.py) ao final do lote.
+
+Uso:
+    python run_pipeline.py                   # Processa todas as sessões pendentes
+    python run_pipeline.py --council consu   # Apenas sessões do CONSU
+    python run_pipeline.py --limit 3         # No máximo 3 sessões
+    python run_pipeline.py --dry-run         # Lista as sessões pendentes
+    python run_pipeline.py --semantic        # Atualiza também a busca semântica
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories, FileNaming
+from metadata_store import MetadataStore, resolve_output_path
+from search_index import SearchIndex
+
+
+class BatchPipeline:
+    """Pipeline de duas etapas (áudio → transcrição, transcrição → ata)."""
+
+    def __init__(self, sistema, max_pending_atas: int = 2):
+        """
+        Inicializa o pipeline.
+
+        Args:
+            sistema: Instância de AtaSystemUFS com os modelos configurados
+            max_pending_atas: Transcrições aguardando a etapa de ata antes
+                de a transcrição da próxima sessão ser pausada
+        """
+        self.sistema = sistema
+        self.max_pending_atas = max_pending_atas
+        self.results = {"processed": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self.search_index = SearchIndex()
+
+    @staticmethod
+    def load_sessions() -> List[Dict]:
+        """Lê as sessões baixadas a partir dos metadados do scraper."""
+        if not (Directories.METADATA_DB.exists() or Directories.METADATA_FILE.exists()):
+            return []
+        store = MetadataStore(Directories.METADATA_DB, Directories.METADATA_FILE)
+        downloads = store.all()
+        store.close()
+
+        sessions = []
+        for download in downloads:
+            date, council, number = (download['data_reuniao'],
+                                     download['conselho'],
+                                     download['numero_sessao'])
+            sessions.append({
+                'video_id': download['video_id'],
+                'title': download['title'],
+                'data': date,
+                'conselho': council,
+                'numero': number,
+                'audio_path': resolve_output_path(download),
+                'transcript_txt': Directories.DATA_TRANSCRICOES / FileNaming.get_transcript_filename(date, council, number, "txt"),
+                'transcript_json': Directories.DATA_TRANSCRICOES / FileNaming.get_transcript_filename(date, council, number, "json"),
+                'ata_path': Directories.DATA_ATAS_GERADAS / FileNaming.get_ata_filename(date, council, number, "md"),
+            })
+        return sessions
+
+    @classmethod
+    def pending_sessions(cls, council: Optional[str] = None) -> List[Dict]:
+        """Sessões com áudio disponível e ata ainda não gerada."""
+        return [
+            session for session in cls.load_sessions()
+            if session['audio_path'].exists()
+            and not session['ata_path'].exists()
+            and (council is None or session['conselho'] == council)
+        ]
+
+    def transcribe_session(self, session: Dict) -> Optional[Dict]:
+        """
+        Etapa 1: diarização e transcrição, com gravação dos arquivos de transcrição.
+
+        Se a transcrição já existir em disco (execução anterior interrompida),
+        ela é reaproveitada.
+        """
+        if session['transcript_json'].exists():
+            with open(session['transcript_json'], 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        audio_path = str(session['audio_path'])
+        _, segments, full_transcription = self.sistema.diarize_and_transcribe(audio_path)
+        if not full_transcription:
+            return None
+
+        result = {
+            "session": {key: session[key] for key in ('video_id', 'title', 'data', 'conselho', 'numero')},
+            "full_transcription": full_transcription,
+            "segments": segments,
+        }
+
+        Directories.DATA_TRANSCRICOES.mkdir(parents=True, exist_ok=True)
+        with open(session['transcript_txt'], 'w', encoding='utf-8') as f:
+            if segments:
+                for segment in segments:
+                    f.write(f"[{segment['start']:.1f}s - {segment['end']:.1f}s] "
+                            f"{segment['speaker']}: {segment['text']}\n")
+            else:
+                f.write(full_transcription)
+        with open(session['transcript_json'], 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        self.search_index.index_file(session['transcript_json'])
+
+        return result
+
+    def generate_ata(self, session: Dict, result: Dict) -> bool:
+        """Etapa 2: geração da ata pelo modelo de linguagem."""
+        # Transcrições guardam os identificadores das vozes; a ata usa os nomes
+        segments = self.sistema.name_speakers(result["segments"])
+        speaker_stats = self.sistema.generate_speaker_stats(segments)
+        meeting_minutes = self.sistema.generate_meeting_minutes(
+            result["full_transcription"], speaker_stats, segments
+        )
+        if meeting_minutes.startswith("Erro na geração da ata"):
+            print(f"❌ {session['title']}: {meeting_minutes}")
+            return False
+
+        Directories.DATA_ATAS_GERADAS.mkdir(parents=True, exist_ok=True)
+        with open(session['ata_path'], 'w', encoding='utf-8') as f:
+            f.write(meeting_minutes)
+        self.search_index.index_file(session['ata_path'])
+        return True
+
+    def _ata_worker(self, pending: "queue.Queue"):
+        """Consome transcrições prontas e gera as atas em paralelo à transcrição."""
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            session, result = item
+            try:
+                ok = self.generate_ata(session, result)
+            except Exception as e:
+                # Uma sessão com erro não pode derrubar o consumidor: o
+                # produtor ficaria bloqueado na fila cheia
+                print(f"❌ Erro ao gerar a ata de {session['title']}: {e}")
+                ok = False
+            with self._lock:
+                self.results["processed" if ok else "failed"] += 1
+            if ok:
+                print(f"📋 Ata gerada: {session['ata_path'].name}")
+
+    @staticmethod
+    def _enqueue(pending: "queue.Queue", item, consumer: threading.Thread) -> bool:
+        """Coloca `item` na fila enquanto o consumidor estiver vivo (False se ele parou)."""
+        while consumer.is_alive():
+            try:
+                pending.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self, sessions: List[Dict]) -> Dict:
+        """
+        Processa as sessões em pipeline.
+
+        Args:
+            sessions: Sessões a processar (ver pending_sessions)
+
+        Returns:
+            Dicionário com estatísticas de throughput
+        """
+        started = time.perf_counter()
+        pending = queue.Queue(maxsize=self.max_pending_atas)
+        ata_thread = threading.Thread(target=self._ata_worker, args=(pending,), daemon=True)
+        ata_thread.start()
+
+        try:
+            for i, session in enumerate(sessions, 1):
+                print(f"🎤 [{i}/{len(sessions)}] Transcrevendo: {session['title']}")
+                try:
+                    result = self.transcribe_session(session)
+                except Exception as e:
+                    print(f"❌ Erro ao transcrever {session['title']}: {e}")
+                    result = None
+
+                if result is None:
+                    with self._lock:
+                        self.results["failed"] += 1
+                    continue
+                if not self._enqueue(pending, (session, result), ata_thread):
+                    print("❌ Geração de atas interrompida; encerrando o lote")
+                    with self._lock:
+                        self.results["failed"] += 1
+                    break
+        finally:
+            self._enqueue(pending, None, ata_thread)
+            ata_thread.join()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "sessions": len(sessions),
+            "processed": self.results["processed"],
+            "failed": self.results["failed"],
+            "elapsed_s": round(elapsed, 1),
+            "sessions_per_hour": round(self.results["processed"] / (elapsed / 3600), 2) if elapsed else 0.0,
+        }
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description="Processar em lote as sessões baixadas (transcrições e atas)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--council', choices=['consu', 'conepe'],
+                        help='Processar apenas um conselho')
+    parser.add_argument('--limit', type=int,
+                        help='Número máximo de sessões a processar')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Apenas listar as sessões pendentes')
+    parser.add_argument('--api-key', help='Chave da API OpenAI')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Transcrever em janelas com memória constante')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Processos de transcrição paralela em CPU (0 = desativado)')
+    parser.add_argument('--threads-per-worker', type=int,
+                        help='Threads do PyTorch por processo de transcrição')
+    parser.add_argument('--no-vad', action='store_true',
+                        help='Transcrever o áudio inteiro, sem remover os silêncios')
+    parser.add_argument('--no-speaker-id', action='store_true',
+                        help='Manter os rótulos SPEAKER_XX, sem o registro de vozes entre sessões')
+    parser.add_argument('--semantic', action='store_true',
+                        help='Atualizar o índice semântico ao final do lote')
+    args = parser.parse_args()
+
+    sessions = BatchPipeline.pending_sessions(args.council)
+    if args.limit:
+        sessions = sessions[:args.limit]
+
+    print("🏛️ Processamento em Lote - Reuniões CONSU e CONEPE")
+    print("=" * 50)
+    print(f"Sessões pendentes: {len(sessions)}")
+
+    if args.dry_run or not sessions:
+        for session in sessions:
+            print(f"  - [{session['conselho'].upper()}] {session['data']} #{session['numero']}")
+        return
+
+    api_key = args.api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("❌ ERRO: Chave da OpenAI API não fornecida (--api-key ou OPENAI_API_KEY)")
+        sys.exit(1)
+
+    from ata_demo import AtaSystemUFS
+
+    sistema = AtaSystemUFS(
+        openai_api_key=api_key,
+        streaming=args.streaming,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        use_vad=not args.no_vad,
+        identify_speakers=not args.no_speaker_id
+    )
+    if not sistema.setup_models():
+        print("❌ Falha na configuração. Encerrando.")
+        sys.exit(1)
+
+    try:
+        stats = BatchPipeline(sistema).run(sessions)
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Operação cancelada pelo usuário")
+        sys.exit(1)
+
+    print("\n📊 RESULTADOS")
+    print("-" * 20)
+    print(f"Sessões processadas: {stats['processed']}/{stats['sessions']}")
+    print(f"Falhas: {stats['failed']}")
+    print(f"Tempo total: {stats['elapsed_s']}s")
+    print(f"Throughput: {stats['sessions_per_hour']} sessões/hora")
+
+    if stats['processed']:
+        from speaker_analytics import SpeakerArchive
+
+        counts = SpeakerArchive().update()
+        print(f"📈 Estatísticas do acervo: {counts['updated']} sessão(ões) atualizada(s)")
+
+    if args.semantic and stats['processed']:
+        from llm_gateway import load_config_module
+        from semantic_index import SemanticIndex, SentenceEmbedder
+
+        model = getattr(load_config_module(), "EMBEDDING_MODEL", None)
+        index = SemanticIndex(embedder=SentenceEmbedder(model) if model else None)
+        try:
+            counts = index.update()
+        except ValueError as e:
+            print(f"❌ {e}")
+        else:
+            print(f"🧭 Índice semântico: {counts['passages']} trechos de {counts['indexed']} sessão(ões)")
+
+
+if __name__ == "__main__":
+    main()
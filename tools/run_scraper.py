@@ -10,6 +10,10 @@ Uso:
     python run_scraper.py --limit 10         # Buscar apenas 10 vídeos mais recentes
     python run_scraper.py --stats            # Mostrar apenas estatísticas
     python run_scraper.py --download-limit 5 # Baixar no máximo 5 vídeos
+    python run_scraper.py --workers 4        # 4 downloads simultâneos
+    python run_scraper.py --incremental      # Apenas vídeos novos (execuções agendadas)
+    python run_scraper.py --refresh-listing  # Ignorar o cache da listagem do canal
+    python run_scraper.py --stream --format flac  # Converter direto para FLAC 16 kHz
 
 Autor: Charlie Rodrigues Fonseca
 Data: 24/07/2025
@@ -22,7 +26,7 @@ from pathlib import Path
 # Adicionar o diretório src ao path para imports
 sys.path.append(str(Path(__file__).parent))
 
-from services.youtube_scraper import YouTubeScraper
+from youtube_scraper import YouTubeScraper
 
 
 def main():
@@ -37,6 +41,9 @@ Exemplos de uso:
   python run_scraper.py --stats            # Mostrar apenas estatísticas
   python run_scraper.py --download-limit 3 # Baixar no máximo 3 vídeos por execução
   python run_scraper.py --test             # Modo teste (buscar mas não baixar)
+  python run_scraper.py --workers 4        # 4 downloads simultâneos (retomáveis)
+  python run_scraper.py --incremental      # Parar no primeiro vídeo já conhecido
+  python run_scraper.py --stream           # Sem arquivo intermediário (ffmpeg direto)
         """
     )
     
@@ -53,6 +60,38 @@ Exemplos de uso:
         help='Número máximo de downloads por execução (útil para testes)'
     )
     
+    parser.add_argument(
+        '--workers', 
+        type=int, 
+        default=3, 
+        help='Número de downloads simultâneos (padrão: 3)'
+    )
+    
+    parser.add_argument(
+        '--incremental', 
+        action='store_true',
+        help='Sincronizar apenas os vídeos novos desde a última execução (ideal para cron)'
+    )
+    
+    parser.add_argument(
+        '--stream', 
+        action='store_true',
+        help='Converter o fluxo de mídia direto para o arquivo final, sem arquivo intermediário'
+    )
+    
+    parser.add_argument(
+        '--format', 
+        choices=['wav', 'flac', 'opus'], 
+        default='wav',
+        help='Formato do áudio salvo, sempre 16 kHz mono (padrão: wav)'
+    )
+    
+    parser.add_argument(
+        '--refresh-listing', 
+        action='store_true',
+        help='Buscar a listagem do canal novamente, ignorando o cache (válido por 1 hora)'
+    )
+    
     parser.add_argument(
         '--stats', 
         action='store_true',
@@ -87,7 +126,12 @@ Exemplos de uso:
         print("🎥 YouTube Scraper - Reuniões CONSU e CONEPE")
         print("=" * 50)
         
-        scraper = YouTubeScraper()  # Detecta automaticamente o diretório raiz
+        # Detecta automaticamente o diretório raiz
+        scraper = YouTubeScraper(streaming=args.stream, audio_format=args.format)
+        
+        # A listagem do canal é buscada uma vez e compartilhada por todos os modos
+        if args.refresh_listing:
+            scraper.list_channel(max(args.limit, 100), refresh=True)
         
         if args.analyze:
             # Análise completa dos vídeos
@@ -115,6 +159,9 @@ Exemplos de uso:
             print(f"Reuniões CONSU: {stats['consu']}")
             print(f"Reuniões CONEPE: {stats['conepe']}")
             print(f"Tamanho total: {stats['total_size_mb']} MB")
+            print(f"Equivalente em WAV: {stats['raw_size_mb']} MB")
+            if stats['compression_ratio'] and stats['compression_ratio'] > 1:
+                print(f"Compactação: {stats['compression_ratio']}x")
             if stats['last_update']:
                 print(f"Última atualização: {stats['last_update']}")
             else:
@@ -143,11 +190,18 @@ Exemplos de uso:
             print(f"Limite de busca: {args.limit}")
             if args.download_limit:
                 print(f"Limite de downloads: {args.download_limit}")
+            print(f"Downloads simultâneos: {args.workers}")
+            if args.stream:
+                print(f"Modo streaming: conversão direta para {args.format.upper()} 16 kHz mono")
+            if args.incremental:
+                print("Modo incremental: apenas vídeos novos no canal")
             print("-" * 50)
             
             results = scraper.run_scraper(
                 limit=args.limit,
-                download_limit=args.download_limit
+                download_limit=args.download_limit,
+                workers=args.workers,
+                incremental=args.incremental
             )
             
             print("\n📊 RESULTADOS")
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Busca Textual nas Transcrições e Atas
+=====================================
+
+Índice SQLite FTS5 (`data/processed/search.sqlite`) sobre cada segmento das
+transcrições (`data/transcricoes`) e cada parágrafo das atas geradas
+(`data/atas-geradas`), com conselho, data e número da sessão extraídos do
+padrão `FileNaming`, participante e tempos em milissegundos.
+
+Busca adaptada ao português:
+- Acentos e maiúsculas são ignorados ("votação" = "votacao" = "VOTAÇÃO")
+- Plurais e femininos comuns são reduzidos a uma forma única ("conselheiras"
+  e "conselheiro" se encontram), no índice e na consulta
+- Palavras muito frequentes (artigos, preposições) não entram na busca
+- Cada termo casa também por prefixo; frases entre aspas exigem a sequência
+
+A atualização é incremental: apenas arquivos novos ou modificados (tamanho
+ou data de modificação) são reindexados, e arquivos removidos saem do
+índice. O pipeline em lote indexa cada sessão assim que ela é gravada.
+
+Uso:
+    python search_index.py --update                          # Atualiza o índice
+    python search_index.py "reforma do estatuto" --council consu
+    python search_index.py '"calendário acadêmico"' --from 2025-01-01 --kind transcricao
+    python search_index.py --stats
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories, FileNaming
+
+DEFAULT_DB_PATH = Directories.DATA_PROCESSED / "search.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    conselho TEXT NOT NULL,
+    data_reuniao TEXT NOT NULL,
+    numero_sessao TEXT NOT NULL,
+    video_id TEXT,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    conselho TEXT NOT NULL,
+    data_reuniao TEXT NOT NULL,
+    numero_sessao TEXT NOT NULL,
+    speaker TEXT,
+    start_ms INTEGER,
+    end_ms INTEGER,
+    text TEXT NOT NULL,
+    terms TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_passages_path ON passages(path);
+CREATE INDEX IF NOT EXISTS idx_passages_sessao ON passages(conselho, data_reuniao);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+    terms, content='passages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS passages_ai AFTER INSERT ON passages BEGIN
+    INSERT INTO passages_fts(rowid, terms) VALUES (new.id, new.terms);
+END;
+CREATE TRIGGER IF NOT EXISTS passages_ad AFTER DELETE ON passages BEGIN
+    INSERT INTO passages_fts(passages_fts, rowid, terms) VALUES ('delete', old.id, old.terms);
+END;
+"""
+
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das",
+    "em", "no", "na", "nos", "nas", "por", "pelo", "pela", "pelos", "pelas", "para",
+    "pra", "com", "sem", "e", "ou", "que", "se", "ao", "aos", "sobre", "entre",
+    "quando", "como", "onde", "qual", "quais", "foi", "ser", "esta", "este", "isso",
+    "esse", "essa", "mais", "muito", "ja", "nao", "sim", "la", "aqui", "me", "te",
+    "lhe", "seu", "sua", "seus", "suas", "eu", "ele", "ela", "eles", "elas",
+}
+
+# Reduções de plural e de feminino (inspiradas no RSLP), aplicadas em ordem
+PLURAL_SUFFIXES = [("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+                   ("ns", "m"), ("res", "r"), ("les", "l"), ("zes", "z")]
+FEMININE_SUFFIXES = [("eira", "eiro"), ("inha", "inho"), ("ada", "ado"), ("ida", "ido"),
+                     ("ora", "or"), ("osa", "oso"), ("iva", "ivo"), ("ica", "ico"), ("ona", "ao")]
+
+QUERY_TOKEN = re.compile(r'"([^"]+)"|(\S+)')
+TRANSCRIPT_LINE = re.compile(r"^\[(\d+(?:\.\d+)?)s - (\d+(?:\.\d+)?)s\] ([^:]+): (.*)$")
+
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def light_stem(word: str) -> str:
+    """Reduz plurais e femininos comuns do português (palavra já sem acentos)."""
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in PLURAL_SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            word = word[:-len(suffix)] + replacement
+            break
+    else:
+        if word.endswith("s") and not word.endswith(("ss", "us")):
+            word = word[:-1]
+    for suffix, replacement in FEMININE_SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def normalize_terms(text: str) -> List[str]:
+    """Termos indexáveis de um texto (sem acentos, sem palavras vazias, reduzidos)."""
+    return [light_stem(word) for word in re.findall(r"\w+", fold(text)) if word not in STOPWORDS]
+
+
+def build_match(query: str) -> str:
+    """
+    Converte a consulta do usuário em uma expressão MATCH do FTS5.
+
+    Termos soltos casam por prefixo da forma reduzida; "frases entre aspas"
+    exigem a sequência; OR e AND (em maiúsculas) são operadores. `NOT termo`
+    e `-termo` excluem trechos: no FTS5 o NOT é binário, então as exclusões
+    vão para o fim, aplicadas ao restante da consulta.
+
+    Raises:
+        ValueError: Se a consulta tiver apenas exclusões
+    """
+    parts, excluded = [], []
+    negate_next = False
+    for phrase, word in QUERY_TOKEN.findall(query):
+        if phrase:
+            terms = normalize_terms(phrase)
+            expression = '"' + " ".join(terms) + '"' if terms else ""
+            negate = negate_next
+        elif word == "NOT":
+            negate_next = True
+            continue
+        elif word in ("OR", "AND"):
+            # Operadores repetidos ou sem operando à esquerda são ignorados
+            if parts and parts[-1] not in ("OR", "AND"):
+                parts.append(word)
+            negate_next = False
+            continue
+        else:
+            negate = negate_next or (word.startswith("-") and len(word) > 1)
+            terms = normalize_terms(word[1:] if word.startswith("-") and len(word) > 1 else word)
+            expression = " ".join(f'"{term}"*' if len(term) >= 4 else f'"{term}"' for term in terms)
+        negate_next = False
+        if not expression:
+            continue
+        if negate:
+            excluded.append(expression)
+        else:
+            parts.append(expression)
+
+    while parts and parts[-1] in ("OR", "AND"):
+        parts.pop()
+    if not parts:
+        if excluded:
+            raise ValueError("A consulta precisa de ao menos um termo que não seja exclusão (NOT/-termo)")
+        return ""
+    match = " ".join(parts)
+    if excluded:
+        match = f"({match}) " + " ".join(f"NOT ({expression})" for expression in excluded)
+    return match
+
+
+def format_ms(milliseconds: Optional[int]) -> str:
+    """HH:MM:SS.mmm"""
+    if milliseconds is None:
+        return "--:--:--"
+    seconds, ms = divmod(int(milliseconds), 1000)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}.{ms:03d}"
+
+
+def deep_link(video_id: Optional[str], start_ms: Optional[int]) -> Optional[str]:
+    """Link para o vídeo da sessão no instante do trecho."""
+    if not video_id:
+        return None
+    if start_ms is None:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return f"https://www.youtube.com/watch?v={video_id}&t={start_ms // 1000}s"
+
+
+def source_files(transcripts_dir: Path, atas_dir: Path) -> List[Path]:
+    """Transcrições (JSON, ou TXT sem JSON correspondente) e atas em Markdown."""
+    files = []
+    if transcripts_dir.exists():
+        files.extend(transcripts_dir.glob("*_transcricao.json"))
+        files.extend(path for path in transcripts_dir.glob("*_transcricao.txt")
+                     if not path.with_suffix(".json").exists())
+    if atas_dir.exists():
+        files.extend(atas_dir.glob("*_ata.md"))
+    return sorted(files)
+
+
+def read_passages(path: Path, kind: str) -> Tuple[List[Tuple], Optional[str]]:
+    """
+    Trechos de uma transcrição ou ata.
+
+    Args:
+        path: Arquivo .json/.txt de transcrição ou .md de ata
+        kind: transcricao ou ata
+
+    Returns:
+        Lista de (participante, início ms, fim ms, texto) e o video_id, se conhecido
+    """
+    video_id = None
+    passages = []
+    if path.suffix == ".json":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        video_id = data.get("session", {}).get("video_id")
+        for segment in data.get("segments", []):
+            passages.append((segment.get("speaker"), round(segment["start"] * 1000),
+                             round(segment["end"] * 1000), segment["text"].strip()))
+        if not passages and data.get("full_transcription"):
+            passages.append((None, None, None, data["full_transcription"].strip()))
+    else:
+        text = path.read_text(encoding='utf-8')
+        if kind == "transcricao":
+            for line in text.splitlines():
+                match = TRANSCRIPT_LINE.match(line)
+                if match:
+                    start, end, speaker, content = match.groups()
+                    passages.append((speaker, round(float(start) * 1000),
+                                     round(float(end) * 1000), content.strip()))
+        if not passages:
+            passages = [(None, None, None, paragraph.strip())
+                        for paragraph in re.split(r"\n\s*\n", text) if paragraph.strip()]
+    return passages, video_id
+
+
+def session_video_ids() -> Dict[Tuple[str, str, str], str]:
+    """`video_id` por (conselho, data AAAA-MM-DD, número) a partir dos metadados do scraper."""
+    video_ids = {}
+    if Directories.METADATA_DB.exists():
+        from metadata_store import MetadataStore
+
+        store = MetadataStore(Directories.METADATA_DB)
+        for entry in store.all():
+            key = (entry['conselho'], FileNaming.format_date(entry['data_reuniao']),
+                   entry['numero_sessao'])
+            video_ids[key] = entry['video_id']
+        store.close()
+    return video_ids
+
+
+class SearchIndex:
+    """Índice FTS5 das transcrições e atas, seguro para uso entre threads."""
+
+    def __init__(self, db_path: Optional[Path] = None,
+                 transcripts_dir: Optional[Path] = None,
+                 atas_dir: Optional[Path] = None):
+        """
+        Abre (ou cria) o índice.
+
+        Args:
+            db_path: Arquivo SQLite (padrão: data/processed/search.sqlite)
+            transcripts_dir: Pasta das transcrições (padrão: data/transcricoes)
+            atas_dir: Pasta das atas (padrão: data/atas-geradas)
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.transcripts_dir = Path(transcripts_dir or Directories.DATA_TRANSCRICOES)
+        self.atas_dir = Path(atas_dir or Directories.DATA_ATAS_GERADAS)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._video_ids = None
+
+    def _video_id(self, council: str, date: str, number: str) -> Optional[str]:
+        """`video_id` da sessão a partir dos metadados do scraper."""
+        if self._video_ids is None:
+            self._video_ids = session_video_ids()
+        return self._video_ids.get((council, date, number))
+
+    def index_file(self, path: Path, force: bool = False) -> bool:
+        """
+        Indexa (ou reindexa) um arquivo se ele mudou desde a última indexação.
+
+        Args:
+            path: Transcrição (.json/.txt) ou ata (.md) no padrão FileNaming
+            force: Reindexar mesmo sem mudança
+
+        Returns:
+            True se o arquivo foi (re)indexado
+        """
+        path = Path(path).resolve()
+        info = FileNaming.parse_filename(path.name)
+        if info is None or info["kind"] == "audio":
+            return False
+        stat = path.stat()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime, size FROM documents WHERE path = ?", (str(path),)
+            ).fetchone()
+        if row and not force and row["mtime"] == stat.st_mtime and row["size"] == stat.st_size:
+            return False
+
+        passages, video_id = read_passages(path, info["kind"])
+        video_id = video_id or self._video_id(info["council"], info["date"], info["number"])
+        session = (info["kind"], info["council"], info["date"], info["number"])
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM passages WHERE path = ?", (str(path),))
+            self._conn.executemany(
+                "INSERT INTO passages (path, kind, conselho, data_reuniao, numero_sessao, "
+                "speaker, start_ms, end_ms, text, terms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(str(path), *session, speaker, start_ms, end_ms, text, " ".join(normalize_terms(text)))
+                 for speaker, start_ms, end_ms, text in passages if text]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (path, kind, conselho, data_reuniao, numero_sessao, "
+                "video_id, mtime, size, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), *session, video_id, stat.st_mtime, stat.st_size, datetime.now().isoformat())
+            )
+        return True
+
+    def remove_file(self, path: Path):
+        """Remove um arquivo do índice."""
+        path = str(Path(path).resolve())
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM passages WHERE path = ?", (path,))
+            self._conn.execute("DELETE FROM documents WHERE path = ?", (path,))
+
+    def update(self) -> Dict[str, int]:
+        """
+        Sincroniza o índice com as pastas de transcrições e atas.
+
+        Returns:
+            Contagem de arquivos indexados, inalterados e removidos
+        """
+        files = source_files(self.transcripts_dir, self.atas_dir)
+        current = {str(path.resolve()) for path in files}
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        for path in files:
+            counts["indexed" if self.index_file(path) else "unchanged"] += 1
+
+        with self._lock:
+            known = [row[0] for row in self._conn.execute("SELECT path FROM documents")]
+        for path in known:
+            if path not in current:
+                self.remove_file(path)
+                counts["removed"] += 1
+        return counts
+
+    def search(self, query: str, council: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               speaker: Optional[str] = None, kind: Optional[str] = None,
+               limit: int = 20) -> List[Dict]:
+        """
+        Busca trechos pela consulta, do mais ao menos relevante (BM25).
+
+        Args:
+            query: Termos, "frases entre aspas", OR, NOT ou -termo
+            council: consu ou conepe
+            date_from: Data inicial (AAAA-MM-DD)
+            date_to: Data final (AAAA-MM-DD)
+            speaker: Participante (ex.: SPEAKER_03)
+            kind: transcricao ou ata
+            limit: Máximo de resultados
+
+        Returns:
+            Trechos com sessão, participante, `start_ms`/`end_ms`, texto e
+            `link` para o vídeo no instante do trecho
+
+
+        Raises:
+            ValueError: Se a consulta for inválida (ex.: só exclusões)
+        """
+        match = build_match(query)
+        if not match:
+            return []
+
+        conditions, params = ["passages_fts MATCH ?"], [match]
+        for clause, value in (("p.conselho = ?", council), ("p.data_reuniao >= ?", date_from),
+                              ("p.data_reuniao <= ?", date_to), ("p.speaker = ?", speaker),
+                              ("p.kind = ?", kind)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT p.*, d.video_id, bm25(passages_fts) AS score FROM passages_fts "
+                    "JOIN passages p ON p.id = passages_fts.rowid "
+                    "JOIN documents d ON d.path = p.path "
+                    f"WHERE {' AND '.join(conditions)} ORDER BY score LIMIT ?",
+                    (*params, limit)
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Consulta inválida: {query} ({e})") from e
+
+        hits = []
+        for row in rows:
+            hit = dict(row)
+            del hit["terms"]
+            hit["link"] = deep_link(hit["video_id"], hit["start_ms"])
+            hits.append(hit)
+        return hits
+
+    def statistics(self) -> Dict:
+        """Documentos e trechos indexados, por tipo e por conselho."""
+        with self._lock:
+            documents = self._conn.execute(
+                "SELECT kind, conselho, COUNT(*) FROM documents GROUP BY kind, conselho"
+            ).fetchall()
+            passages = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {
+            "documents": {f"{kind}/{council}": count for kind, council, count in documents},
+            "passages": passages,
+        }
+
+    def rebuild(self) -> Dict[str, int]:
+        """Apaga e reconstrói todo o índice."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM passages")
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("INSERT INTO passages_fts(passages_fts) VALUES ('rebuild')")
+        return self.update()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Função principal para atualizar e consultar o índice."""
+    parser = argparse.ArgumentParser(description="Busca nas transcrições e atas das sessões")
+    parser.add_argument('query', nargs='?', help='Consulta (termos, "frases", OR, NOT, -termo)')
+    parser.add_argument('--council', choices=['consu', 'conepe'], help='Filtrar por conselho')
+    parser.add_argument('--from', dest='date_from', help='Data inicial (AAAA-MM-DD)')
+    parser.add_argument('--to', dest='date_to', help='Data final (AAAA-MM-DD)')
+    parser.add_argument('--speaker', help='Filtrar por participante (ex.: SPEAKER_03)')
+    parser.add_argument('--kind', choices=['transcricao', 'ata'], help='Tipo de documento')
+    parser.add_argument('--limit', type=int, default=20, help='Máximo de resultados')
+    parser.add_argument('--update', action='store_true', help='Atualizar o índice antes da busca')
+    parser.add_argument('--rebuild', action='store_true', help='Reconstruir o índice do zero')
+    parser.add_argument('--stats', action='store_true', help='Mostrar o conteúdo do índice')
+    parser.add_argument('--json', action='store_true', help='Resultados em JSON')
+    parser.add_argument('--db', type=str, help='Arquivo SQLite do índice')
+    args = parser.parse_args()
+
+    index = SearchIndex(db_path=args.db)
+
+    if args.rebuild or args.update:
+        counts = index.rebuild() if args.rebuild else index.update()
+        print(f"🔄 Índice: {counts['indexed']} indexados, {counts['unchanged']} inalterados, "
+              f"{counts['removed']} removidos")
+
+    if args.stats:
+        stats = index.statistics()
+        print("\n=== ÍNDICE DE BUSCA ===")
+        print(f"Banco: {index.db_path}")
+        for name, count in sorted(stats["documents"].items()):
+            print(f"  {name}: {count}")
+        print(f"Trechos indexados: {stats['passages']}")
+
+    if not args.query:
+        if not (args.update or args.rebuild or args.stats):
+            parser.print_help()
+        return
+
+    try:
+        hits = index.search(args.query, council=args.council, date_from=args.date_from,
+                            date_to=args.date_to, speaker=args.speaker, kind=args.kind,
+                            limit=args.limit)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(hits, ensure_ascii=False, indent=2))
+        return
+
+    print(f"🔍 {len(hits)} resultado(s) para: {args.query}\n")
+    for hit in hits:
+        date = "/".join(reversed(hit["data_reuniao"].split("-")))
+        print(f"[{hit['conselho'].upper()} {date} #{hit['numero_sessao']}] "
+              f"{hit['kind']} {format_ms(hit['start_ms'])} {hit['speaker'] or ''}".rstrip())
+        print(f"   {hit['text']}")
+        if hit["link"]:
+            print(f"   ▶ {hit['link']}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
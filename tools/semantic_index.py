@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Busca Semântica nas Deliberações dos Conselhos
+==============================================
+
+Complementa a busca por palavras (search_index.py) com busca por assunto:
+trechos das transcrições (segmentos consecutivos agrupados em ~60 palavras)
+e parágrafos das atas são convertidos em vetores por um modelo de embeddings
+local, em CPU (sentence-transformers, multilíngue), e a consulta devolve os
+trechos de significado mais próximo.
+
+Armazenamento em `data/processed/semantic/`:
+- `vectors.f32`: matriz float32 normalizada, somente acréscimo, lida por
+  `np.memmap` (o sistema operacional carrega apenas as páginas usadas)
+- `index.sqlite`: metadados de cada linha (conselho, data, sessão,
+  participante, tempos em ms, texto); conselho, data e tipo também ficam em
+  colunas NumPy na memória, que filtram as linhas antes do produto escalar
+
+Sem FAISS: a busca é exata (produto escalar em blocos sobre a matriz
+mapeada), o que cabe com folga no acervo dos conselhos (ver
+evaluation/benchmark_semantic.py).
+
+A atualização é incremental por sessão: arquivos novos ou modificados são
+embutidos em lote e acrescentados ao final; as linhas antigas de um arquivo
+modificado são marcadas como inativas e a matriz é compactada quando elas
+passam de 25% do total. A compactação grava uma nova geração da matriz
+(`vectors.N.f32`) e só então troca a geração registrada no SQLite.
+
+O índice guarda o modelo de embeddings que o criou: consultas e atualizações
+com outro modelo (mesmo de igual dimensão) são recusadas, pois misturariam
+dois espaços vetoriais; troque o modelo com `--rebuild`.
+
+Uso:
+    python semantic_index.py --update                           # Indexa sessões novas
+    python semantic_index.py --rebuild --model intfloat/multilingual-e5-small
+    python semantic_index.py "cotas para estudantes indígenas" --council consu
+    python semantic_index.py "orçamento das pró-reitorias" --from 2024-01-01 --top 5
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories, FileNaming
+from llm_gateway import load_config_module
+from search_index import deep_link, format_ms, read_passages, session_video_ids, source_files
+
+DEFAULT_INDEX_DIR = Directories.DATA_PROCESSED / "semantic"
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# Linhas processadas por bloco no produto escalar (memória constante)
+SCORE_BLOCK_ROWS = 65536
+
+# Fração de linhas inativas que dispara a compactação da matriz
+COMPACT_THRESHOLD = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    row INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    conselho TEXT NOT NULL,
+    data_reuniao TEXT NOT NULL,
+    numero_sessao TEXT NOT NULL,
+    speaker TEXT,
+    start_ms INTEGER,
+    end_ms INTEGER,
+    text TEXT NOT NULL,
+    live INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_vectors_path ON vectors(path);
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    video_id TEXT,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SentenceEmbedder:
+    """Modelo de embeddings local (sentence-transformers), carregado no primeiro uso."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, device: str = "cpu",
+                 batch_size: int = 64, query_prefix: str = "", passage_prefix: str = ""):
+        """
+        Args:
+            model_name: Modelo do Hugging Face ou diretório local
+            device: cpu ou cuda
+            batch_size: Textos por lote de inferência
+            query_prefix: Prefixo das consultas (ex.: "query: " nos modelos E5)
+            passage_prefix: Prefixo dos trechos (ex.: "passage: " nos modelos E5)
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self.query_prefix = query_prefix
+        self.passage_prefix = passage_prefix
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise RuntimeError("Instale o sentence-transformers para a busca semântica: "
+                                   "pip install sentence-transformers") from None
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=len(texts) > 10 * self.batch_size
+        ), dtype=np.float32)
+
+    def encode_passages(self, texts: List[str]) -> np.ndarray:
+        """Vetores normalizados dos trechos, calculados em lotes."""
+        return self._encode([self.passage_prefix + text for text in texts])
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Vetor normalizado de uma consulta."""
+        return self._encode([self.query_prefix + text])[0]
+
+
+def group_passages(passages: List[Tuple], min_words: int = 60) -> List[Tuple]:
+    """
+    Agrupa segmentos consecutivos em trechos de pelo menos `min_words` palavras.
+
+    Segmentos isolados do Whisper são curtos demais para um embedding
+    representativo do assunto; parágrafos sem tempo (atas) ficam como estão.
+
+    Args:
+        passages: Lista de (participante, início ms, fim ms, texto)
+        min_words: Palavras mínimas por trecho agrupado
+
+    Returns:
+        Lista no mesmo formato; o participante lista os speakers do trecho
+    """
+    grouped, current = [], []
+
+    def flush():
+        speakers = list(dict.fromkeys(p[0] for p in current if p[0]))
+        grouped.append((", ".join(speakers) or None, current[0][1], current[-1][2],
+                        " ".join(p[3] for p in current)))
+        current.clear()
+
+    for passage in passages:
+        if passage[1] is None:
+            if current:
+                flush()
+            grouped.append(passage)
+            continue
+        current.append(passage)
+        if sum(len(p[3].split()) for p in current) >= min_words:
+            flush()
+    if current:
+        flush()
+    return grouped
+
+
+class SemanticIndex:
+    """Índice vetorial mapeado em memória, com metadados em SQLite."""
+
+    def __init__(self, directory: Optional[Path] = None, embedder=None,
+                 transcripts_dir: Optional[Path] = None, atas_dir: Optional[Path] = None,
+                 dim: Optional[int] = None):
+        """
+        Abre (ou cria) o índice.
+
+        Args:
+            directory: Pasta do índice (padrão: data/processed/semantic)
+            embedder: Objeto com `encode_passages`, `encode_query` e `dim`
+                (padrão: SentenceEmbedder com o modelo padrão)
+            transcripts_dir: Pasta das transcrições (padrão: data/transcricoes)
+            atas_dir: Pasta das atas (padrão: data/atas-geradas)
+            dim: Dimensão dos vetores, para índices criados sem embedder
+                (ex.: benchmarks com vetores sintéticos)
+        """
+        self.directory = Path(directory or DEFAULT_INDEX_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder if embedder is not None else SentenceEmbedder()
+        self.transcripts_dir = Path(transcripts_dir or Directories.DATA_TRANSCRICOES)
+        self.atas_dir = Path(atas_dir or Directories.DATA_ATAS_GERADAS)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.vectors_path = self._vectors_file(int(self._get_info("generation") or 0))
+        self._dim = dim or self._get_info("dim")
+        self._dim = int(self._dim) if self._dim else None
+        self._matrix = None
+        self._columns = None
+        self._repair()
+
+    def _get_info(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:
+            self._dim = int(self.embedder.dim)
+        return self._dim
+
+    @property
+    def rows(self) -> int:
+        """Linhas gravadas na matriz (ativas e inativas)."""
+        if not self.vectors_path.exists() or self._dim is None:
+            return 0
+        return self.vectors_path.stat().st_size // (self._dim * 4)
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Modelo de embeddings que gerou os vetores do índice."""
+        with self._lock:
+            return self._get_info("model")
+
+    def _check_model(self):
+        """
+        Garante que o embedder atual é o mesmo que gerou o índice.
+
+        Raises:
+            ValueError: Se o índice tiver sido criado com outro modelo
+        """
+        indexed = self.model_name
+        current = getattr(self.embedder, "model_name", None)
+        if indexed and current and indexed != current:
+            raise ValueError(f"Índice semântico criado com {indexed}, mas o modelo atual é "
+                             f"{current}; reconstrua o índice (--rebuild) para trocar de modelo")
+
+    def _vectors_file(self, generation: int) -> Path:
+        """Arquivo da matriz de uma geração (cada compactação cria uma nova)."""
+        name = "vectors.f32" if generation == 0 else f"vectors.{generation}.f32"
+        return self.directory / name
+
+    def _repair(self):
+        """
+        Recupera o índice após uma interrupção.
+
+        Matrizes de outras gerações sobram de uma compactação interrompida
+        (antes ou depois do commit que troca a geração) e são apagadas; vetores
+        gravados sem metadados (interrupção entre as duas escritas de
+        `add_vectors`) são descartados.
+        """
+        for path in self.directory.glob("vectors*.f32*"):
+            if path != self.vectors_path:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        if self._dim is None or not self.vectors_path.exists():
+            return
+        last = self._conn.execute("SELECT MAX(row) FROM vectors").fetchone()[0]
+        expected = 0 if last is None else last + 1
+        if self.rows > expected:
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(expected * self._dim * 4)
+
+    def _invalidate(self):
+        self._matrix = None
+        self._columns = None
+
+    def _open_matrix(self) -> np.ndarray:
+        """Matriz de vetores mapeada em memória (somente leitura)."""
+        rows = self.rows
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = (np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                      shape=(rows, self.dim))
+                            if rows else np.zeros((0, self.dim), dtype=np.float32))
+        return self._matrix
+
+    def add_vectors(self, entries: List[Dict], vectors: np.ndarray):
+        """
+        Acrescenta trechos já embutidos ao final da matriz.
+
+        Args:
+            entries: Metadados de cada trecho (path, kind, conselho, data_reuniao,
+                numero_sessao, speaker, start_ms, end_ms, text)
+            vectors: Matriz (len(entries), dim) com vetores normalizados
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(entries), self.dim):
+            raise ValueError(f"Vetores com forma {vectors.shape}, esperado ({len(entries)}, {self.dim})")
+
+        with self._lock:
+            first = self.rows
+            # Vetores primeiro: metadados sem vetor nunca existem (ver _repair)
+            with open(self.vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            with self._conn:
+                self._set_info("dim", str(self.dim))
+                model = getattr(self.embedder, "model_name", None)
+                if model and not self.model_name:
+                    self._set_info("model", model)
+                self._conn.executemany(
+                    "INSERT INTO vectors (row, path, kind, conselho, data_reuniao, numero_sessao, "
+                    "speaker, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(first + offset, entry["path"], entry["kind"], entry["conselho"],
+                      entry["data_reuniao"], entry["numero_sessao"], entry.get("speaker"),
+                      entry.get("start_ms"), entry.get("end_ms"), entry["text"])
+                     for offset, entry in enumerate(entries)]
+                )
+            self._invalidate()
+
+    def _changed_documents(self) -> List[Tuple[Path, Dict]]:
+        """Arquivos novos ou modificados desde a última indexação."""
+        changed = []
+        for path in source_files(self.transcripts_dir, self.atas_dir):
+            info = FileNaming.parse_filename(path.name)
+            if info is None:
+                continue
+            stat = path.stat()
+            row = self._conn.execute(
+                "SELECT mtime, size FROM documents WHERE path = ?", (str(path.resolve()),)
+            ).fetchone()
+            if not row or row["mtime"] != stat.st_mtime or row["size"] != stat.st_size:
+                changed.append((path.resolve(), info))
+        return changed
+
+    def update(self, min_words: int = 60) -> Dict[str, int]:
+        """
+        Embute as sessões novas ou modificadas e remove as que saíram das pastas.
+
+        Os trechos de todas as sessões pendentes são embutidos em lotes; cada
+        sessão é gravada em uma transação própria.
+
+        Returns:
+            Contagem de documentos indexados, removidos e trechos acrescentados
+
+        Raises:
+            ValueError: Se o índice tiver sido criado com outro modelo
+        """
+        self._check_model()
+        with self._lock:
+            changed = self._changed_documents()
+            current = {str(path.resolve()) for path in source_files(self.transcripts_dir, self.atas_dir)}
+            removed = [row[0] for row in self._conn.execute("SELECT path FROM documents")
+                       if row[0] not in current]
+
+        counts = {"indexed": len(changed), "removed": len(removed), "passages": 0}
+        video_ids = session_video_ids() if changed else {}
+
+        documents, texts = [], []
+        for path, info in changed:
+            passages, video_id = read_passages(path, info["kind"])
+            passages = [p for p in group_passages(passages, min_words) if p[3]]
+            documents.append((path, info, passages,
+                              video_id or video_ids.get((info["council"], info["date"], info["number"]))))
+            texts.extend(p[3] for p in passages)
+
+        vectors = self.embedder.encode_passages(texts) if texts else np.zeros((0, self.dim), np.float32)
+
+        offset = 0
+        for path, info, passages, video_id in documents:
+            stat = path.stat()
+            entries = [{
+                "path": str(path), "kind": info["kind"], "conselho": info["council"],
+                "data_reuniao": info["date"], "numero_sessao": info["number"],
+                "speaker": speaker, "start_ms": start_ms, "end_ms": end_ms, "text": text,
+            } for speaker, start_ms, end_ms, text in passages]
+            with self._lock:
+                self._deactivate(str(path))
+                if entries:
+                    self.add_vectors(entries, vectors[offset:offset + len(entries)])
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO documents (path, video_id, mtime, size, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (str(path), video_id, stat.st_mtime, stat.st_size, datetime.now().isoformat())
+                    )
+            offset += len(entries)
+            counts["passages"] += len(entries)
+
+        with self._lock:
+            for path in removed:
+                self._deactivate(path)
+                with self._conn:
+                    self._conn.execute("DELETE FROM documents WHERE path = ?", (path,))
+            dead = self._conn.execute("SELECT COUNT(*) FROM vectors WHERE live = 0").fetchone()[0]
+            if self.rows and dead / self.rows > COMPACT_THRESHOLD:
+                self.compact()
+        return counts
+
+    def _deactivate(self, path: str):
+        with self._conn:
+            self._conn.execute("UPDATE vectors SET live = 0 WHERE path = ? AND live = 1", (path,))
+        self._columns = None
+
+    def _filter_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Colunas de filtro (conselho, data, tipo, ativa) indexadas pela linha.
+
+        Lidas do SQLite uma vez e mantidas em memória até a próxima escrita:
+        filtrar em NumPy custa milissegundos mesmo com milhões de linhas,
+        enquanto devolver milhões de números de linha do SQLite custaria
+        mais que a própria varredura da matriz.
+        """
+        if self._columns is None:
+            rows = self._conn.execute(
+                "SELECT conselho, data_reuniao, kind, live FROM vectors ORDER BY row"
+            ).fetchall()
+            self._columns = {
+                "conselho": np.array([row[0] for row in rows], dtype="U8"),
+                "data_reuniao": np.array([row[1] for row in rows], dtype="U10"),
+                "kind": np.array([row[2] for row in rows], dtype="U12"),
+                "live": np.array([row[3] for row in rows], dtype=bool),
+            }
+        return self._columns
+
+    def compact(self):
+        """
+        Reescreve a matriz apenas com as linhas ativas e renumera os metadados.
+
+        A nova matriz é gravada por completo em um arquivo da geração seguinte;
+        a renumeração e a troca de geração entram na mesma transação, de modo
+        que uma interrupção em qualquer ponto deixa uma matriz coerente com os
+        metadados (a outra é apagada por `_repair`).
+        """
+        with self._lock:
+            matrix = self._open_matrix()
+            live = np.array([row[0] for row in self._conn.execute(
+                "SELECT row FROM vectors WHERE live = 1 ORDER BY row")], dtype=np.int64)
+            generation = int(self._get_info("generation") or 0) + 1
+            new_path = self._vectors_file(generation)
+            with open(new_path, 'wb') as f:
+                for start in range(0, live.size, SCORE_BLOCK_ROWS):
+                    f.write(np.ascontiguousarray(matrix[live[start:start + SCORE_BLOCK_ROWS]]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with self._conn:
+                self._conn.execute("DELETE FROM vectors WHERE live = 0")
+                self._conn.execute("CREATE TEMP TABLE renumber (old INTEGER PRIMARY KEY, new INTEGER)")
+                self._conn.executemany("INSERT INTO renumber VALUES (?, ?)",
+                                       ((int(old), new) for new, old in enumerate(live)))
+                # Deslocamento temporário evita colisões de chave durante a renumeração
+                self._conn.execute("UPDATE vectors SET row = -1 - "
+                                   "(SELECT new FROM renumber WHERE old = vectors.row)")
+                self._conn.execute("UPDATE vectors SET row = -1 - row")
+                self._conn.execute("DROP TABLE renumber")
+                self._set_info("generation", str(generation))
+            # O mapeamento precisa ser fechado antes de apagar o arquivo (Windows)
+            del matrix
+            self._invalidate()
+            old_path, self.vectors_path = self.vectors_path, new_path
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+
+    def search_vector(self, vector: np.ndarray, top_k: int = 10, council: Optional[str] = None,
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      kind: Optional[str] = None) -> List[Dict]:
+        """
+        Os `top_k` trechos mais próximos de um vetor de consulta normalizado.
+
+        Args:
+            vector: Vetor da consulta (dim,)
+            top_k: Número de resultados
+            council: consu ou conepe
+            date_from: Data inicial (AAAA-MM-DD)
+            date_to: Data final (AAAA-MM-DD)
+            kind: transcricao ou ata
+
+        Returns:
+            Trechos com sessão, participante, tempos em ms, texto, `score`
+            (similaridade de cosseno) e `link` para o vídeo
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            matrix = self._open_matrix()
+            if matrix.shape[0] == 0:
+                return []
+
+            columns = self._filter_columns()
+            mask = columns["live"].copy()
+            if council is not None:
+                mask &= columns["conselho"] == council
+            if date_from is not None:
+                mask &= columns["data_reuniao"] >= date_from
+            if date_to is not None:
+                mask &= columns["data_reuniao"] <= date_to
+            if kind is not None:
+                mask &= columns["kind"] == kind
+
+            candidates = np.flatnonzero(mask)
+            if candidates.size < matrix.shape[0] // 4:
+                # Filtro seletivo: calcula apenas as linhas candidatas
+                scores = np.empty(candidates.size, dtype=np.float32)
+                for start in range(0, candidates.size, SCORE_BLOCK_ROWS):
+                    block = candidates[start:start + SCORE_BLOCK_ROWS]
+                    scores[start:start + block.size] = matrix[block] @ vector
+            else:
+                # Leitura sequencial da matriz inteira é mais rápida que a indexada
+                candidates = None
+                scores = np.empty(matrix.shape[0], dtype=np.float32)
+                for start in range(0, matrix.shape[0], SCORE_BLOCK_ROWS):
+                    scores[start:start + SCORE_BLOCK_ROWS] = matrix[start:start + SCORE_BLOCK_ROWS] @ vector
+                scores[~mask] = -np.inf
+
+            if scores.size == 0:
+                return []
+            k = min(top_k, scores.size)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            rows = candidates[best] if candidates is not None else best
+
+            placeholders = ", ".join("?" for _ in rows)
+            metadata = {row["row"]: dict(row) for row in self._conn.execute(
+                f"SELECT v.*, d.video_id FROM vectors v LEFT JOIN documents d ON d.path = v.path "
+                f"WHERE v.row IN ({placeholders})", [int(row) for row in rows])}
+
+        hits = []
+        for row, index in zip(rows, best):
+            hit = metadata.get(int(row))
+            if hit is None or not np.isfinite(scores[index]):
+                continue
+            hit["score"] = float(scores[index])
+            hit["link"] = deep_link(hit["video_id"], hit["start_ms"])
+            hits.append(hit)
+        return hits
+
+    def search(self, query: str, top_k: int = 10, **filters) -> List[Dict]:
+        """
+        Busca semântica por texto (ver `search_vector` para os filtros).
+
+        Raises:
+            ValueError: Se o índice tiver sido criado com outro modelo
+        """
+        self._check_model()
+        return self.search_vector(self.embedder.encode_query(query), top_k, **filters)
+
+    def statistics(self) -> Dict:
+        """Linhas ativas, inativas, sessões indexadas e tamanho da matriz."""
+        with self._lock:
+            live, dead = self._conn.execute(
+                "SELECT COALESCE(SUM(live = 1), 0), COALESCE(SUM(live = 0), 0) FROM vectors"
+            ).fetchone()
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        return {
+            "documents": documents,
+            "live": live,
+            "dead": dead,
+            "dim": self._dim,
+            "model": self.model_name or getattr(self.embedder, "model_name", None),
+            "size_mb": round(size / 1024 / 1024, 1),
+        }
+
+    def rebuild(self, min_words: int = 60) -> Dict[str, int]:
+        """Apaga o índice e embute todas as sessões com o embedder atual."""
+        with self._lock:
+            self._invalidate()
+            with self._conn:
+                self._conn.execute("DELETE FROM vectors")
+                self._conn.execute("DELETE FROM documents")
+                self._conn.execute("DELETE FROM info WHERE key IN ('dim', 'model')")
+            self.vectors_path.unlink(missing_ok=True)
+            self._dim = None
+        return self.update(min_words)
+
+    def close(self):
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
+
+
+def main():
+    """Função principal para atualizar e consultar o índice semântico."""
+    parser = argparse.ArgumentParser(description="Busca semântica nas sessões dos conselhos")
+    parser.add_argument('query', nargs='?', help='Assunto a buscar')
+    parser.add_argument('--council', choices=['consu', 'conepe'], help='Filtrar por conselho')
+    parser.add_argument('--from', dest='date_from', help='Data inicial (AAAA-MM-DD)')
+    parser.add_argument('--to', dest='date_to', help='Data final (AAAA-MM-DD)')
+    parser.add_argument('--kind', choices=['transcricao', 'ata'], help='Tipo de documento')
+    parser.add_argument('--top', type=int, default=10, help='Número de resultados')
+    parser.add_argument('--update', action='store_true', help='Indexar sessões novas ou modificadas')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Reconstruir o índice do zero (necessário ao trocar de modelo)')
+    parser.add_argument('--stats', action='store_true', help='Mostrar o conteúdo do índice')
+    parser.add_argument('--model', help='Modelo de embeddings (padrão: EMBEDDING_MODEL do config)')
+    parser.add_argument('--dir', type=str, help='Pasta do índice')
+    args = parser.parse_args()
+
+    model = args.model or getattr(load_config_module(), "EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+    index = SemanticIndex(directory=args.dir, embedder=SentenceEmbedder(model))
+
+    try:
+        if args.rebuild or args.update:
+            counts = index.rebuild() if args.rebuild else index.update()
+            print(f"🔄 Índice semântico: {counts['indexed']} sessão(ões) indexada(s), "
+                  f"{counts['removed']} removida(s), {counts['passages']} trechos novos")
+        hits = (index.search(args.query, top_k=args.top, council=args.council,
+                             date_from=args.date_from, date_to=args.date_to, kind=args.kind)
+                if args.query else [])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.stats:
+        stats = index.statistics()
+        print("\n=== ÍNDICE SEMÂNTICO ===")
+        print(f"Pasta: {index.directory}")
+        print(f"Sessões: {stats['documents']} | Trechos ativos: {stats['live']} "
+              f"(inativos: {stats['dead']}) | {stats['size_mb']} MB")
+        print(f"Modelo: {stats['model']}")
+
+    if not args.query:
+        if not (args.update or args.rebuild or args.stats):
+            parser.print_help()
+        return
+
+    print(f"🧭 {len(hits)} trecho(s) sobre: {args.query}\n")
+    for hit in hits:
+        date = "/".join(reversed(hit["data_reuniao"].split("-")))
+        print(f"[{hit['conselho'].upper()} {date} #{hit['numero_sessao']}] {hit['score']:.3f} "
+              f"{hit['kind']} {format_ms(hit['start_ms'])} {hit['speaker'] or ''}".rstrip())
+        print(f"   {hit['text'][:300]}{'...' if len(hit['text']) > 300 else ''}")
+        if hit["link"]:
+            print(f"   ▶ {hit['link']}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
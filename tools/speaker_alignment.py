@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alinhamento entre Transcrição e Diarização
+==========================================
+
+Atribui a cada segmento do Whisper o participante com maior sobreposição
+temporal entre os turnos produzidos pelo pyannote.
+
+Os turnos ficam em uma árvore de intervalos centrada: cada nó guarda os
+turnos que contêm o seu ponto central (ordenados por início e por fim) e as
+subárvores guardam os que terminam antes ou começam depois dele. A consulta
+visita O(log n) nós mais os turnos que de fato sobrepõem o intervalo, mesmo
+quando há turnos longos (ex.: um participante ao longo de toda a sessão);
+o custo total fica em O(n log n), em vez da varredura de todos os turnos
+para cada segmento.
+
+Quando o Whisper devolve timestamps por palavra, um segmento que atravessa
+uma troca de participante pode ser dividido nos pontos de troca.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+DEFAULT_SPEAKER = "PARTICIPANTE"
+
+
+class _Node:
+    """Nó da árvore de intervalos: turnos que contêm `center`."""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center: float, by_start: List[int], by_end: List[int]):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left = None
+        self.right = None
+
+
+class SpeakerIndex:
+    """Árvore de intervalos dos turnos de diarização para consultas por intervalo."""
+
+    def __init__(self, speakers_info: List[Dict]):
+        """
+        Constrói o índice.
+
+        Args:
+            speakers_info: Turnos no formato de `perform_diarization`
+                (`speaker`, `start`, `end`)
+        """
+        self.starts = [turn["start"] for turn in speakers_info]
+        self.ends = [turn["end"] for turn in speakers_info]
+        self.speakers = [turn["speaker"] for turn in speakers_info]
+        self.root = self._build(list(range(len(self.starts))))
+
+    def _build(self, turns: List[int]) -> Optional[_Node]:
+        """Constrói a subárvore; o centro é a mediana dos extremos dos turnos."""
+        if not turns:
+            return None
+        points = sorted([self.starts[i] for i in turns] + [self.ends[i] for i in turns])
+        center = points[len(points) // 2]
+        left, right, here = [], [], []
+        for i in turns:
+            if self.ends[i] < center:
+                left.append(i)
+            elif self.starts[i] > center:
+                right.append(i)
+            else:
+                here.append(i)
+        node = _Node(center,
+                     sorted(here, key=lambda i: self.starts[i]),
+                     sorted(here, key=lambda i: self.ends[i], reverse=True))
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start: float, end: float) -> Dict[str, float]:
+        """
+        Soma a sobreposição de cada participante com o intervalo [start, end).
+
+        Args:
+            start: Início do intervalo em segundos
+            end: Fim do intervalo em segundos
+
+        Returns:
+            Dicionário participante → segundos de sobreposição
+        """
+        totals = defaultdict(float)
+        candidates = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end <= node.center:
+                # Turnos do nó terminam depois do intervalo: basta começar antes do fim
+                for i in node.by_start:
+                    if self.starts[i] >= end:
+                        break
+                    candidates.append(i)
+                stack.append(node.left)
+            elif start >= node.center:
+                # Turnos do nó começam antes do intervalo: basta terminar depois do início
+                for i in node.by_end:
+                    if self.ends[i] <= start:
+                        break
+                    candidates.append(i)
+                stack.append(node.right)
+            else:
+                candidates.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+
+        for i in candidates:
+            overlap = min(end, self.ends[i]) - max(start, self.starts[i])
+            if overlap > 0:
+                totals[self.speakers[i]] += overlap
+        return totals
+
+    def speaker_for(self, start: float, end: float) -> Optional[str]:
+        """Participante com maior sobreposição no intervalo, ou None."""
+        if end <= start:
+            # Intervalos degenerados: usar o ponto como intervalo mínimo
+            end = start + 1e-3
+        totals = self.overlaps(start, end)
+        if not totals:
+            return None
+        return max(totals, key=totals.get)
+
+
+def _make_segment(speaker: str, start: float, end: float, text: str) -> Dict:
+    return {
+        "speaker": speaker,
+        "start": start,
+        "end": end,
+        "text": text.strip(),
+        "duration": end - start,
+    }
+
+
+def _split_by_words(index: SpeakerIndex, segment: Dict, default: str) -> List[Dict]:
+    """Divide um segmento nos pontos em que o participante das palavras muda."""
+    pieces = []
+    current_speaker, current_words, current_start, current_end = None, [], None, None
+
+    for word in segment["words"]:
+        speaker = index.speaker_for(word["start"], word["end"]) or current_speaker or default
+        if current_words and speaker != current_speaker:
+            pieces.append(_make_segment(current_speaker, current_start, current_end, "".join(current_words)))
+            current_words = []
+        if not current_words:
+            current_speaker, current_start = speaker, word["start"]
+        current_words.append(word["word"])
+        current_end = word["end"]
+
+    if current_words:
+        pieces.append(_make_segment(current_speaker, current_start, current_end, "".join(current_words)))
+    return pieces
+
+
+def assign_speakers(segments: List[Dict], speakers_info: List[Dict],
+                    default: str = DEFAULT_SPEAKER,
+                    split_on_speaker_change: bool = False) -> List[Dict]:
+    """
+    Atribui participantes aos segmentos transcritos.
+
+    Args:
+        segments: Segmentos do Whisper (`start`, `end`, `text` e, opcionalmente, `words`)
+        speakers_info: Turnos de diarização
+        default: Rótulo usado quando nenhum turno sobrepõe o segmento
+        split_on_speaker_change: Dividir segmentos com timestamps por palavra
+            nos pontos de troca de participante
+
+    Returns:
+        Lista no formato `speaker_transcriptions` (`speaker`, `start`, `end`,
+        `text`, `duration`)
+    """
+    index = SpeakerIndex(speakers_info)
+    aligned = []
+
+    for segment in segments:
+        if split_on_speaker_change and segment.get("words"):
+            aligned.extend(_split_by_words(index, segment, default))
+            continue
+
+        speaker = index.speaker_for(segment["start"], segment["end"]) or default
+        aligned.append(_make_segment(speaker, segment["start"], segment["end"], segment["text"]))
+
+    return aligned
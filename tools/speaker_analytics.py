@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estatísticas de Participação Calculadas em Colunas
+==================================================
+
+Os segmentos de todas as sessões processadas ficam em uma tabela colunar
+(`data/processed/analytics/segments.parquet`, Apache Arrow/Parquet) com
+sessão, participante, início, fim e número de palavras. As estatísticas são
+calculadas com operações vetorizadas do NumPy sobre as colunas inteiras, sem
+laços em Python por segmento:
+
+- tempo de fala, segmentos e palavras por participante
+- turnos: sequências de segmentos consecutivos do mesmo participante
+- interrupções: troca de participante com menos de `INTERRUPTION_MAX_GAP`
+  segundos de silêncio (ou com sobreposição) após o turno anterior
+- sobreposição: tempo em que o novo turno começa antes do anterior terminar
+
+A mesma rotina atende a aba de estatísticas da interface (uma sessão) e o
+relatório do acervo inteiro. A tabela é atualizada de forma incremental: só
+as transcrições novas ou modificadas são relidas.
+
+Uso:
+    python speaker_analytics.py --update                    # Sincroniza com data/transcricoes
+    python speaker_analytics.py --council consu --from 2024-01-01
+    python speaker_analytics.py --json > relatorio.json
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories, FileNaming
+from search_index import read_passages
+
+DEFAULT_ANALYTICS_DIR = Directories.DATA_PROCESSED / "analytics"
+
+# Silêncio máximo (s) entre turnos de participantes diferentes para contar
+# como interrupção
+INTERRUPTION_MAX_GAP = 0.2
+
+
+class SegmentTable:
+    """Segmentos em colunas NumPy; sessão e participante codificados como inteiros."""
+
+    def __init__(self, session_ids: np.ndarray, speaker_ids: np.ndarray, start: np.ndarray,
+                 end: np.ndarray, words: np.ndarray, sessions: List[str], speakers: List[str]):
+        """
+        Args:
+            session_ids: Índice da sessão de cada segmento em `sessions`
+            speaker_ids: Índice do participante de cada segmento em `speakers`
+            start: Início de cada segmento (s)
+            end: Fim de cada segmento (s)
+            words: Palavras de cada segmento
+            sessions: Nomes das sessões (ex.: 2024-03-01_consu_#12)
+            speakers: Rótulos dos participantes (ex.: SPEAKER_00)
+        """
+        self.session_ids = np.asarray(session_ids, dtype=np.int32)
+        self.speaker_ids = np.asarray(speaker_ids, dtype=np.int32)
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+        self.words = np.asarray(words, dtype=np.int32)
+        self.sessions = list(sessions)
+        self.speakers = list(speakers)
+
+    def __len__(self) -> int:
+        return self.start.size
+
+    @classmethod
+    def empty(cls) -> "SegmentTable":
+        return cls([], [], [], [], [], [], [])
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict], session: str = "sessao") -> "SegmentTable":
+        """
+        Tabela de uma sessão a partir dos segmentos alinhados do pipeline.
+
+        Args:
+            segments: Dicionários com speaker, start, end e text
+            session: Nome da sessão
+        """
+        labels = [segment.get("speaker") or "SPEAKER_??" for segment in segments]
+        speakers, speaker_ids = np.unique(np.array(labels, dtype=str), return_inverse=True) \
+            if labels else (np.array([], dtype=str), np.array([], dtype=np.int32))
+        return cls(
+            np.zeros(len(segments), dtype=np.int32),
+            speaker_ids,
+            [segment["start"] for segment in segments],
+            [segment["end"] for segment in segments],
+            [len(segment["text"].split()) for segment in segments],
+            [session],
+            speakers.tolist(),
+        )
+
+    @classmethod
+    def concat(cls, tables: List["SegmentTable"]) -> "SegmentTable":
+        """Junta tabelas, unificando os dicionários de sessões e participantes."""
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            return cls.empty()
+        sessions, speakers = {}, {}
+        session_ids, speaker_ids = [], []
+        for table in tables:
+            # Apenas os nomes ainda referenciados entram no dicionário unificado
+            for names, source, unified, ids in ((table.sessions, table.session_ids, sessions, session_ids),
+                                                 (table.speakers, table.speaker_ids, speakers, speaker_ids)):
+                used, inverse = np.unique(source, return_inverse=True)
+                mapping = np.array([unified.setdefault(names[index], len(unified)) for index in used],
+                                   dtype=np.int32)
+                ids.append(mapping[inverse])
+        return cls(
+            np.concatenate(session_ids), np.concatenate(speaker_ids),
+            np.concatenate([table.start for table in tables]),
+            np.concatenate([table.end for table in tables]),
+            np.concatenate([table.words for table in tables]),
+            list(sessions), list(speakers),
+        )
+
+    def select(self, mask: np.ndarray) -> "SegmentTable":
+        """Subconjunto das linhas (os dicionários são mantidos)."""
+        return SegmentTable(self.session_ids[mask], self.speaker_ids[mask], self.start[mask],
+                            self.end[mask], self.words[mask], self.sessions, self.speakers)
+
+    def sorted(self) -> "SegmentTable":
+        """Linhas ordenadas por sessão e início (sem cópia se já estiverem)."""
+        session_step = np.diff(self.session_ids)
+        if np.all((session_step > 0) | ((session_step == 0) & (np.diff(self.start) >= 0))):
+            return self
+        return self.select(np.lexsort((self.start, self.session_ids)))
+
+    def to_arrow(self):
+        """Tabela Arrow com sessão e participante como colunas de dicionário."""
+        import pyarrow as pa
+
+        return pa.table({
+            "session": pa.DictionaryArray.from_arrays(pa.array(self.session_ids, pa.int32()),
+                                                      pa.array(self.sessions, pa.string())),
+            "speaker": pa.DictionaryArray.from_arrays(pa.array(self.speaker_ids, pa.int32()),
+                                                      pa.array(self.speakers, pa.string())),
+            "start": self.start,
+            "end": self.end,
+            "words": self.words,
+        })
+
+    @classmethod
+    def from_arrow(cls, table) -> "SegmentTable":
+        """Converte uma tabela Arrow (como a lida do Parquet) sem copiar as colunas numéricas."""
+        table = table.unify_dictionaries().combine_chunks()
+        if table.num_rows == 0:
+            return cls.empty()
+
+        def encoded(name):
+            column = table.column(name).chunk(0)
+            return column.indices.to_numpy(), column.dictionary.to_pylist()
+
+        session_ids, sessions = encoded("session")
+        speaker_ids, speakers = encoded("speaker")
+        return cls(session_ids, speaker_ids,
+                   *(table.column(name).to_numpy() for name in ("start", "end", "words")),
+                   sessions, speakers)
+
+
+def compute_stats(table: SegmentTable) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Estatísticas por participante e por sessão, calculadas sobre as colunas.
+
+    Args:
+        table: Segmentos de uma ou mais sessões
+
+    Returns:
+        {"speakers": colunas por (sessão, participante), "sessions": colunas
+        por sessão}; os campos `session` e `speaker` são índices em
+        `table.sessions` e `table.speakers`
+    """
+    if len(table) == 0:
+        speaker_fields = ("session", "speaker", "total_time", "segments", "words", "turns",
+                          "interruptions", "interrupted", "overlap_time")
+        session_fields = ("session", "duration", "speaking_time", "speakers", "segments", "words",
+                          "turns", "interruptions", "overlap_time")
+        return {"speakers": {field: np.zeros(0, dtype=np.int64) for field in speaker_fields},
+                "sessions": {field: np.zeros(0, dtype=np.int64) for field in session_fields}}
+
+    table = table.sorted()
+    session = table.session_ids.astype(np.int64)
+    speaker = table.speaker_ids.astype(np.int64)
+    start, end, words = table.start, table.end, table.words
+
+    same_session = np.r_[False, session[1:] == session[:-1]]
+    change = same_session & np.r_[False, speaker[1:] != speaker[:-1]]
+    new_turn = ~same_session | change
+    previous_end = np.r_[-np.inf, end[:-1]]
+    interruption = change & (start - previous_end < INTERRUPTION_MAX_GAP)
+    overlap = np.where(change, np.clip(np.minimum(end, previous_end) - start, 0.0, None), 0.0)
+    duration = np.clip(end - start, 0.0, None)
+
+    # Grupo (sessão, participante) de cada segmento e do segmento anterior
+    keys = session * len(table.speakers) + speaker
+    key_space = len(table.sessions) * len(table.speakers)
+    if key_space <= 4 * keys.size:
+        # Tabela de consulta densa: evita a ordenação do np.unique
+        pairs = np.flatnonzero(np.bincount(keys, minlength=key_space))
+        lookup = np.empty(key_space, dtype=np.int64)
+        lookup[pairs] = np.arange(pairs.size)
+        group = lookup[keys]
+    else:
+        pairs, group = np.unique(keys, return_inverse=True)
+    previous_group = np.r_[0, group[:-1]]
+    groups = pairs.size
+
+    def per_group(weights=None, rows=None, index=group):
+        if rows is not None:
+            index = index[rows]
+            weights = weights[rows] if weights is not None else None
+        return np.bincount(index, weights=weights, minlength=groups)
+
+    speakers = {
+        "session": pairs // len(table.speakers),
+        "speaker": pairs % len(table.speakers),
+        "total_time": per_group(duration),
+        "segments": per_group().astype(np.int64),
+        "words": per_group(words).astype(np.int64),
+        "turns": per_group(rows=new_turn).astype(np.int64),
+        "interruptions": per_group(rows=interruption).astype(np.int64),
+        "interrupted": per_group(rows=interruption, index=previous_group).astype(np.int64),
+        # A sobreposição conta para os dois participantes envolvidos
+        "overlap_time": per_group(overlap) + per_group(overlap, index=previous_group),
+    }
+
+    session_count = len(table.sessions)
+    first = np.flatnonzero(~same_session)
+    present = session[first]
+
+    def per_session(values):
+        return np.bincount(session, weights=values, minlength=session_count)[present]
+
+    sessions = {
+        "session": present,
+        "duration": np.maximum.reduceat(end, first) - start[first],
+        "speaking_time": per_session(duration),
+        "speakers": np.bincount(speakers["session"], minlength=session_count)[present],
+        "segments": np.bincount(session, minlength=session_count)[present],
+        "words": per_session(words).astype(np.int64),
+        "turns": per_session(new_turn).astype(np.int64),
+        "interruptions": per_session(interruption).astype(np.int64),
+        "overlap_time": per_session(overlap),
+    }
+    return {"speakers": speakers, "sessions": sessions}
+
+
+def summarize_segments(segments: List[Dict]) -> Dict[str, Dict]:
+    """
+    Participação por speaker de uma única sessão (aba de estatísticas).
+
+    Args:
+        segments: Segmentos alinhados (speaker, start, end, text)
+
+    Returns:
+        {speaker: {total_time, segments, words, turns, interruptions,
+        interrupted, overlap_time}}
+    """
+    table = SegmentTable.from_segments(segments)
+    columns = compute_stats(table)["speakers"]
+    fields = ("total_time", "segments", "words", "turns", "interruptions", "interrupted", "overlap_time")
+    return {
+        table.speakers[speaker]: {field: columns[field][index].item() for field in fields}
+        for index, speaker in enumerate(columns["speaker"])
+    }
+
+
+class SpeakerArchive:
+    """Tabela colunar dos segmentos de todas as sessões transcritas."""
+
+    def __init__(self, directory: Optional[Path] = None, transcripts_dir: Optional[Path] = None):
+        """
+        Args:
+            directory: Pasta da tabela (padrão: data/processed/analytics)
+            transcripts_dir: Pasta das transcrições (padrão: data/transcricoes)
+        """
+        self.directory = Path(directory or DEFAULT_ANALYTICS_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.table_path = self.directory / "segments.parquet"
+        self.manifest_path = self.directory / "sessions.json"
+        self.transcripts_dir = Path(transcripts_dir or Directories.DATA_TRANSCRICOES)
+        self._table = None
+        self._table_mtime = None
+
+    def _manifest(self) -> Dict[str, Dict]:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _transcripts(self) -> Dict[str, Path]:
+        """Transcrição de cada sessão (JSON, ou TXT sem JSON correspondente)."""
+        files = {}
+        if self.transcripts_dir.exists():
+            for path in sorted(self.transcripts_dir.glob("*_transcricao.*")):
+                info = FileNaming.parse_filename(path.name)
+                if info is None or info["extension"] not in ("json", "txt"):
+                    continue
+                session = path.name[:-len(f"_transcricao.{info['extension']}")]
+                if session not in files or info["extension"] == "json":
+                    files[session] = path
+        return files
+
+    def load(self) -> SegmentTable:
+        """Tabela do acervo (relida apenas quando o arquivo muda)."""
+        if not self.table_path.exists():
+            return SegmentTable.empty()
+        mtime = self.table_path.stat().st_mtime
+        if self._table is None or self._table_mtime != mtime:
+            import pyarrow.parquet as pq
+
+            self._table = SegmentTable.from_arrow(pq.read_table(self.table_path))
+            self._table_mtime = mtime
+        return self._table
+
+    def _save(self, table: SegmentTable, manifest: Dict[str, Dict]):
+        import pyarrow.parquet as pq
+
+        temp_path = self.table_path.with_name(self.table_path.name + ".tmp")
+        pq.write_table(table.to_arrow(), temp_path, compression="zstd")
+        os.replace(temp_path, self.table_path)
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def update(self) -> Dict[str, int]:
+        """
+        Relê as transcrições novas ou modificadas e remove as que saíram da pasta.
+
+        Returns:
+            Contagem de sessões atualizadas e removidas
+        """
+        manifest = self._manifest()
+        transcripts = self._transcripts()
+        changed = {}
+        for session, path in transcripts.items():
+            stat = path.stat()
+            entry = manifest.get(session)
+            if not entry or (entry["path"], entry["mtime"], entry["size"]) != (str(path), stat.st_mtime, stat.st_size):
+                changed[session] = path
+        removed = [session for session in manifest if session not in transcripts]
+        if not changed and not removed:
+            return {"updated": 0, "removed": 0}
+
+        table = self.load()
+        stale = {index for index, name in enumerate(table.sessions) if name in changed or name in removed}
+        if stale:
+            table = table.select(~np.isin(table.session_ids, list(stale)))
+
+        tables = [table]
+        for session, path in changed.items():
+            passages, _ = read_passages(path, "transcricao")
+            segments = [{"speaker": speaker, "start": start_ms / 1000, "end": end_ms / 1000, "text": text}
+                        for speaker, start_ms, end_ms, text in passages if start_ms is not None]
+            tables.append(SegmentTable.from_segments(segments, session))
+            info = FileNaming.parse_filename(path.name)
+            stat = path.stat()
+            manifest[session] = {"path": str(path), "mtime": stat.st_mtime, "size": stat.st_size,
+                                 "council": info["council"], "date": info["date"], "number": info["number"]}
+        for session in removed:
+            manifest.pop(session)
+
+        # Descarta sessões e participantes que não têm mais segmentos; a
+        # tabela é gravada já ordenada para o relatório não precisar reordenar
+        merged = SegmentTable.concat(tables).sorted()
+        self._save(merged, manifest)
+        return {"updated": len(changed), "removed": len(removed)}
+
+    def report(self, council: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None) -> Dict:
+        """
+        Relatório de participação do acervo.
+
+        Args:
+            council: consu ou conepe
+            date_from: Data inicial (AAAA-MM-DD)
+            date_to: Data final (AAAA-MM-DD)
+
+        Returns:
+            Sessões (com os participantes de cada uma), totais por conselho
+            e o tempo de cálculo em ms
+        """
+        began = time.perf_counter()
+        table = self.load()
+        manifest = self._manifest()
+        info = [manifest.get(name, {}) for name in table.sessions]
+        councils = np.array([entry.get("council", "") for entry in info], dtype="U8")
+        dates = np.array([entry.get("date", "") for entry in info], dtype="U10")
+
+        keep = np.ones(len(table.sessions), dtype=bool)
+        if council is not None:
+            keep &= councils == council
+        if date_from is not None:
+            keep &= dates >= date_from
+        if date_to is not None:
+            keep &= dates <= date_to
+        if not keep.all():
+            table = table.select(keep[table.session_ids])
+        stats = compute_stats(table)
+        speakers, sessions = stats["speakers"], stats["sessions"]
+
+        session_rows = {}
+        for i, index in enumerate(sessions["session"]):
+            session_rows[index] = {
+                "session": table.sessions[index], "council": councils[index].item(),
+                "date": dates[index].item(), "number": info[index].get("number"),
+                **{key: sessions[key][i].item() for key in sessions if key != "session"},
+                "participants": [],
+            }
+        for i, index in enumerate(speakers["session"]):
+            session_rows[index]["participants"].append({
+                "speaker": table.speakers[speakers["speaker"][i]],
+                **{key: speakers[key][i].item() for key in speakers if key not in ("session", "speaker")},
+            })
+        for row in session_rows.values():
+            row["participants"].sort(key=lambda participant: -participant["total_time"])
+
+        totals = {}
+        session_councils = councils[sessions["session"]]
+        for name in np.unique(session_councils):
+            mask = session_councils == name
+            totals[name.item()] = {
+                "sessions": int(mask.sum()),
+                **{key: sessions[key][mask].sum().item()
+                   for key in ("duration", "speaking_time", "turns", "interruptions", "overlap_time", "words")},
+            }
+
+        return {
+            "sessions": sorted(session_rows.values(), key=lambda row: (row["date"], row["session"])),
+            "totals": totals,
+            "segments": len(table),
+            "elapsed_ms": round((time.perf_counter() - began) * 1000, 1),
+        }
+
+
+def format_minutes(seconds: float) -> str:
+    return f"{seconds / 60:.1f} min"
+
+
+def format_report(report: Dict, participants: int = 5, names: Optional[Dict[str, str]] = None) -> str:
+    """
+    Relatório do acervo em Markdown (interface e linha de comando).
+
+    Args:
+        report: Resultado de `SpeakerArchive.report`
+        participants: Participantes listados por sessão
+        names: Nome de exibição de cada rótulo (ver speaker_registry.py)
+    """
+    names = names or {}
+    if not report["sessions"]:
+        return "## 📈 Participação no Acervo\n\nNenhuma sessão transcrita encontrada."
+
+    lines = ["## 📈 Participação no Acervo", "",
+             f"_{len(report['sessions'])} sessões, {report['segments']} segmentos — "
+             f"calculado em {report['elapsed_ms']:.0f} ms_", "",
+             "| Conselho | Sessões | Duração | Fala | Turnos | Interrupções | Sobreposição |",
+             "|---|---|---|---|---|---|---|"]
+    for council, total in sorted(report["totals"].items()):
+        lines.append(f"| {council.upper()} | {total['sessions']} | {format_minutes(total['duration'])} "
+                     f"| {format_minutes(total['speaking_time'])} | {total['turns']} "
+                     f"| {total['interruptions']} | {format_minutes(total['overlap_time'])} |")
+
+    lines += ["", "### Sessões", "",
+              "| Sessão | Duração | Participantes | Turnos | Interrupções | Mais falaram |",
+              "|---|---|---|---|---|---|"]
+    for row in report["sessions"]:
+        date = "/".join(reversed(row["date"].split("-"))) if row["date"] else row["session"]
+        top = ", ".join(f"{names.get(p['speaker'], p['speaker'])} ({p['total_time'] / max(row['speaking_time'], 1e-9):.0%})"
+                        for p in row["participants"][:participants])
+        lines.append(f"| {row['council'].upper()} {date} #{row['number']} | {format_minutes(row['duration'])} "
+                     f"| {row['speakers']} | {row['turns']} | {row['interruptions']} | {top} |")
+    return "\n".join(lines)
+
+
+def main():
+    """Função principal para atualizar a tabela e gerar o relatório do acervo."""
+    parser = argparse.ArgumentParser(description="Estatísticas de participação do acervo")
+    parser.add_argument('--update', action='store_true', help='Sincronizar com as transcrições')
+    parser.add_argument('--council', choices=['consu', 'conepe'], help='Filtrar por conselho')
+    parser.add_argument('--from', dest='date_from', help='Data inicial (AAAA-MM-DD)')
+    parser.add_argument('--to', dest='date_to', help='Data final (AAAA-MM-DD)')
+    parser.add_argument('--json', action='store_true', help='Relatório em JSON')
+    parser.add_argument('--dir', type=str, help='Pasta da tabela')
+    args = parser.parse_args()
+
+    archive = SpeakerArchive(directory=args.dir)
+    if args.update or not archive.table_path.exists():
+        counts = archive.update()
+        if not args.json:
+            print(f"🔄 Tabela de segmentos: {counts['updated']} sessão(ões) atualizada(s), "
+                  f"{counts['removed']} removida(s)\n")
+
+    report = archive.report(council=args.council, date_from=args.date_from, date_to=args.date_to)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        names = None
+        from speaker_registry import DEFAULT_DB_PATH, SpeakerRegistry
+
+        if DEFAULT_DB_PATH.exists():
+            names = SpeakerRegistry().display_names()
+        print(format_report(report, names=names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de Vozes entre Sessões
+===============================
+
+Os rótulos do pyannote (`SPEAKER_00`, `SPEAKER_01`...) valem apenas dentro
+de uma sessão. O registro guarda uma galeria persistente de vozes
+conhecidas (`data/processed/speakers.sqlite`) e associa cada participante
+diarizado a um identificador estável (`VOZ_0001`...), antes de as
+estatísticas e a ata serem geradas:
+
+1. Um embedding por participante da sessão: o próprio pipeline de
+   diarização o devolve (pyannote 3.1, `return_embeddings=True`) ou ele é
+   extraído dos turnos mais longos pelo `SpeakerEmbedder`
+2. Busca do vizinho mais próximo na galeria: uma multiplicação de matrizes
+   entre os embeddings da sessão e os centroides normalizados, mantidos em
+   memória; cada voz da galeria recebe no máximo um participante por sessão
+3. Participante com similaridade acima do limiar atualiza o centroide da voz
+   (média ponderada pelo tempo de fala); os demais viram vozes novas
+
+Nomes são atribuídos às vozes pela linha de comando; vozes duplicadas podem
+ser unidas, e os identificadores antigos continuam resolvendo para a voz
+resultante.
+
+Uso:
+    python speaker_registry.py --list                          # Vozes conhecidas
+    python speaker_registry.py --name VOZ_0003 "Prof. Fulano"  # Nomeia uma voz
+    python speaker_registry.py --merge VOZ_0003 VOZ_0011       # Une duplicatas
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories
+
+DEFAULT_DB_PATH = Directories.DATA_PROCESSED / "speakers.sqlite"
+DEFAULT_SPEAKER_EMBEDDING_MODEL = "pyannote/wespeaker-voxceleb-resnet34-LM"
+
+# Similaridade de cosseno mínima para reconhecer uma voz da galeria
+MATCH_THRESHOLD = 0.6
+
+# Tempo de fala (s) a partir do qual o centroide deixa de ganhar peso: a
+# voz continua se adaptando a microfones e salas novos
+MAX_CENTROID_WEIGHT = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS voices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    voice_id TEXT UNIQUE,
+    name TEXT,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    centroid BLOB NOT NULL,
+    merged_into TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS appearances (
+    voice_id TEXT NOT NULL,
+    session TEXT,
+    label TEXT NOT NULL,
+    score REAL,
+    seconds REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_appearances_voice ON appearances(voice_id);
+"""
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Vetores com norma 1 (linha a linha)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class SpeakerEmbedder:
+    """Embeddings de voz extraídos dos turnos de cada participante (pyannote)."""
+
+    def __init__(self, model_name: str = DEFAULT_SPEAKER_EMBEDDING_MODEL, device: str = "cpu",
+                 max_seconds: float = 30.0, min_turn_seconds: float = 1.0):
+        """
+        Args:
+            model_name: Modelo de embedding do Hugging Face
+            device: cpu ou cuda
+            max_seconds: Fala máxima usada por participante (turnos mais longos primeiro)
+            min_turn_seconds: Turnos mais curtos são ignorados
+        """
+        from pyannote.audio import Inference, Model
+        import torch
+
+        self.model_name = model_name
+        self.max_seconds = max_seconds
+        self.min_turn_seconds = min_turn_seconds
+        self.inference = Inference(Model.from_pretrained(model_name), window="whole")
+        self.inference.to(torch.device(device))
+
+    def embed(self, samples: np.ndarray, turns: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Um embedding normalizado por participante.
+
+        Args:
+            samples: Áudio float32 mono a 16 kHz
+            turns: Turnos da diarização (speaker, start, end)
+
+        Returns:
+            {rótulo: embedding}; participantes sem turnos longos o bastante ficam de fora
+        """
+        from audio_loader import SAMPLE_RATE, as_pyannote_input
+
+        by_speaker: Dict[str, List[Dict]] = {}
+        for turn in turns:
+            if turn["end"] - turn["start"] >= self.min_turn_seconds:
+                by_speaker.setdefault(turn["speaker"], []).append(turn)
+
+        embeddings = {}
+        for speaker, speaker_turns in by_speaker.items():
+            total, weighted = 0.0, None
+            for turn in sorted(speaker_turns, key=lambda t: t["start"] - t["end"]):
+                if total >= self.max_seconds:
+                    break
+                seconds = min(turn["end"] - turn["start"], self.max_seconds - total)
+                start = int(turn["start"] * SAMPLE_RATE)
+                chunk = samples[start:start + int(seconds * SAMPLE_RATE)]
+                vector = normalize(np.asarray(self.inference(as_pyannote_input(chunk))).reshape(-1))
+                weighted = vector * seconds if weighted is None else weighted + vector * seconds
+                total += seconds
+            if weighted is not None:
+                embeddings[speaker] = normalize(weighted)
+        return embeddings
+
+
+class SpeakerRegistry:
+    """Galeria persistente de vozes com busca do vizinho mais próximo."""
+
+    def __init__(self, db_path: Optional[Path] = None, threshold: float = MATCH_THRESHOLD):
+        """
+        Abre (ou cria) a galeria e carrega os centroides na memória.
+
+        Args:
+            db_path: Arquivo SQLite (padrão: data/processed/speakers.sqlite)
+            threshold: Similaridade mínima para reconhecer uma voz
+        """
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._load_gallery()
+
+    def _load_gallery(self):
+        """Centroides das vozes ativas (não unidas) em uma matriz (vozes × dimensão)."""
+        rows = self._conn.execute(
+            "SELECT voice_id, seconds, centroid FROM voices WHERE merged_into IS NULL ORDER BY id"
+        ).fetchall()
+        self._ids = [row["voice_id"] for row in rows]
+        self._seconds = np.array([row["seconds"] for row in rows], dtype=np.float64)
+        self._matrix = (np.stack([np.frombuffer(row["centroid"], dtype=np.float32) for row in rows])
+                        if rows else None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def identify(self, embeddings: Dict[str, np.ndarray], seconds: Dict[str, float],
+                 session: Optional[str] = None, enroll: bool = True) -> Dict[str, str]:
+        """
+        Associa os participantes de uma sessão às vozes da galeria.
+
+        Args:
+            embeddings: Embedding de cada rótulo da diarização
+            seconds: Tempo de fala de cada rótulo (peso na atualização do centroide)
+            session: Nome da sessão (histórico de aparições)
+            enroll: Cadastrar como vozes novas os participantes não reconhecidos
+
+        Returns:
+            {rótulo da diarização: voice_id}; sem `enroll`, os não reconhecidos ficam de fora
+
+        Raises:
+            ValueError: Se a dimensão dos embeddings diferir da galeria
+                (modelo de embedding trocado)
+        """
+        labels = list(embeddings)
+        if not labels:
+            return {}
+        vectors = normalize(np.stack([np.asarray(embeddings[label]).reshape(-1) for label in labels]))
+
+        with self._lock:
+            mapping, scores = {}, {}
+            if self._matrix is not None:
+                if vectors.shape[1] != self._matrix.shape[1]:
+                    raise ValueError(f"Embeddings de dimensão {vectors.shape[1]}, galeria com "
+                                     f"{self._matrix.shape[1]}: modelo de embedding diferente")
+                similarity = vectors @ self._matrix.T
+                # Com n participantes, basta considerar as n vozes mais próximas de
+                # cada um: a ordenação não cresce com o tamanho da galeria
+                k = min(len(labels), similarity.shape[1])
+                nearest = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+                candidates = sorted(
+                    ((float(similarity[row, column]), row, int(column))
+                     for row in range(len(labels)) for column in nearest[row]),
+                    reverse=True
+                )
+                # Atribuição gulosa pela maior similaridade: uma voz por participante
+                taken = set()
+                for score, row, column in candidates:
+                    if score < self.threshold:
+                        break
+                    if labels[row] in mapping or column in taken:
+                        continue
+                    mapping[labels[row]] = column
+                    scores[labels[row]] = score
+                    taken.add(column)
+
+            now = datetime.now().isoformat()
+            result = {}
+            with self._conn:
+                for row, label in enumerate(labels):
+                    weight = float(seconds.get(label, 0.0))
+                    if label in mapping:
+                        result[label] = self._update_voice(mapping[label], vectors[row], weight, now)
+                    elif enroll:
+                        result[label] = self._enroll(vectors[row], weight, now)
+                    else:
+                        continue
+                    self._conn.execute(
+                        "INSERT INTO appearances (voice_id, session, label, score, seconds, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (result[label], session, label, scores.get(label), weight, now)
+                    )
+        return result
+
+    def _update_voice(self, index: int, vector: np.ndarray, seconds: float, now: str) -> str:
+        """Incorpora o embedding ao centroide da voz (média ponderada pelo tempo de fala)."""
+        previous = min(self._seconds[index], MAX_CENTROID_WEIGHT)
+        centroid = normalize(self._matrix[index] * previous + vector * max(seconds, 1e-6))
+        self._matrix[index] = centroid
+        self._seconds[index] += seconds
+        voice_id = self._ids[index]
+        self._conn.execute(
+            "UPDATE voices SET centroid = ?, seconds = seconds + ?, sessions = sessions + 1, "
+            "updated_at = ? WHERE voice_id = ?",
+            (centroid.tobytes(), seconds, now, voice_id)
+        )
+        return voice_id
+
+    def _enroll(self, vector: np.ndarray, seconds: float, now: str) -> str:
+        """Cadastra uma voz nova e a acrescenta à matriz da galeria."""
+        cursor = self._conn.execute(
+            "INSERT INTO voices (sessions, seconds, centroid, created_at, updated_at) "
+            "VALUES (1, ?, ?, ?, ?)",
+            (seconds, vector.astype(np.float32).tobytes(), now, now)
+        )
+        voice_id = f"VOZ_{cursor.lastrowid:04d}"
+        self._conn.execute("UPDATE voices SET voice_id = ? WHERE id = ?", (voice_id, cursor.lastrowid))
+        self._ids.append(voice_id)
+        self._seconds = np.append(self._seconds, seconds)
+        vector = vector.astype(np.float32)[None, :]
+        self._matrix = vector.copy() if self._matrix is None else np.vstack([self._matrix, vector])
+        return voice_id
+
+    def display_names(self) -> Dict[str, str]:
+        """
+        Rótulo de exibição de cada identificador conhecido.
+
+        Vozes unidas resolvem para a voz resultante; vozes com nome usam o nome.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT voice_id, name, merged_into FROM voices").fetchall()
+        voices = {row["voice_id"]: (row["name"], row["merged_into"]) for row in rows}
+        names = {}
+        for voice_id in voices:
+            current, seen = voice_id, set()
+            while voices[current][1] and voices[current][1] in voices and current not in seen:
+                seen.add(current)
+                current = voices[current][1]
+            names[voice_id] = voices[current][0] or current
+        return names
+
+    def rename(self, voice_id: str, name: Optional[str]) -> bool:
+        """Atribui (ou remove, com None) o nome de uma voz."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE voices SET name = ?, updated_at = ? WHERE voice_id = ?",
+                (name, datetime.now().isoformat(), voice_id)
+            )
+        return cursor.rowcount > 0
+
+    def merge(self, keep: str, other: str) -> bool:
+        """
+        Une duas vozes: `other` passa a resolver para `keep`.
+
+        Returns:
+            False se alguma das vozes não existir ou já tiver sido unida
+        """
+        with self._lock:
+            if keep == other or keep not in self._ids or other not in self._ids:
+                return False
+            a, b = self._ids.index(keep), self._ids.index(other)
+            weight_a = max(min(self._seconds[a], MAX_CENTROID_WEIGHT), 1e-6)
+            weight_b = max(min(self._seconds[b], MAX_CENTROID_WEIGHT), 1e-6)
+            centroid = normalize(self._matrix[a] * weight_a + self._matrix[b] * weight_b)
+            now = datetime.now().isoformat()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE voices SET centroid = ?, seconds = seconds + ?, sessions = sessions + ?, "
+                    "name = COALESCE(name, (SELECT name FROM voices WHERE voice_id = ?)), "
+                    "updated_at = ? WHERE voice_id = ?",
+                    (centroid.tobytes(), float(self._seconds[b]),
+                     self._conn.execute("SELECT sessions FROM voices WHERE voice_id = ?",
+                                        (other,)).fetchone()[0],
+                     other, now, keep)
+                )
+                self._conn.execute("UPDATE voices SET merged_into = ?, updated_at = ? WHERE voice_id = ?",
+                                   (keep, now, other))
+                self._conn.execute("UPDATE voices SET merged_into = ? WHERE merged_into = ?", (keep, other))
+            self._load_gallery()
+        return True
+
+    def voices(self) -> List[Dict]:
+        """Vozes ativas, das que mais falaram para as que menos falaram."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT voice_id, name, sessions, seconds, created_at, updated_at FROM voices "
+                "WHERE merged_into IS NULL ORDER BY seconds DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def speaking_seconds(turns: List[Dict]) -> Dict[str, float]:
+    """Tempo de fala total de cada rótulo nos turnos da diarização."""
+    totals: Dict[str, float] = {}
+    for turn in turns:
+        totals[turn["speaker"]] = totals.get(turn["speaker"], 0.0) + turn["end"] - turn["start"]
+    return totals
+
+
+def relabel(items: List[Dict], mapping: Dict[str, str]) -> List[Dict]:
+    """Cópias de turnos ou segmentos com os rótulos trocados por `mapping`."""
+    return [{**item, "speaker": mapping.get(item.get("speaker"), item.get("speaker"))} for item in items]
+
+
+def main():
+    """Função principal para consultar e editar a galeria de vozes."""
+    parser = argparse.ArgumentParser(description="Registro de vozes entre sessões")
+    parser.add_argument('--list', action='store_true', help='Listar as vozes conhecidas')
+    parser.add_argument('--name', nargs=2, metavar=('VOZ', 'NOME'), help='Atribuir um nome a uma voz')
+    parser.add_argument('--unname', metavar='VOZ', help='Remover o nome de uma voz')
+    parser.add_argument('--merge', nargs=2, metavar=('MANTER', 'UNIR'), help='Unir duas vozes')
+    parser.add_argument('--db', type=str, help='Arquivo SQLite da galeria')
+    args = parser.parse_args()
+
+    registry = SpeakerRegistry(db_path=args.db)
+
+    if args.name or args.unname:
+        voice_id, name = args.name if args.name else (args.unname, None)
+        if not registry.rename(voice_id, name):
+            print(f"❌ Voz não encontrada: {voice_id}")
+            sys.exit(1)
+        print(f"✅ {voice_id}: {name or 'sem nome'}")
+
+    if args.merge:
+        if not registry.merge(*args.merge):
+            print(f"❌ Não foi possível unir {args.merge[1]} a {args.merge[0]}")
+            sys.exit(1)
+        print(f"✅ {args.merge[1]} unida a {args.merge[0]}")
+
+    if args.list or not (args.name or args.unname or args.merge):
+        print("\n=== VOZES CONHECIDAS ===")
+        for voice in registry.voices():
+            print(f"{voice['voice_id']}  {voice['name'] or '-':<30} {voice['sessions']:>4} sessão(ões) "
+                  f"{voice['seconds'] / 60:>8.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcrição em Streaming para Sessões Longas
+============================================
+
+Lê o áudio em janelas de tamanho fixo com sobreposição e transcreve cada
+janela separadamente com o Whisper. Os segmentos são devolvidos por um
+gerador, já com timestamps absolutos, assim que cada janela termina.
+
+O pico de memória depende apenas do tamanho da janela, e não da duração da
+gravação: uma sessão de 3 horas do CONSU ocupa o mesmo espaço que uma de
+10 minutos.
+
+Costura entre janelas:
+- Segmentos que começam na região de sobreposição ao final de uma janela
+  são descartados, pois serão retranscritos com contexto completo na janela
+  seguinte.
+- Na janela seguinte, segmentos que terminam antes do último trecho já
+  emitido são ignorados e palavras repetidas no início do primeiro segmento
+  são removidas.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import wave
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Quantidade máxima de palavras comparadas ao costurar duas janelas
+MAX_OVERLAP_WORDS = 12
+
+
+def iter_audio_windows(audio: Union[str, np.ndarray], window_seconds: float,
+                       overlap_seconds: float,
+                       sample_rate: int = SAMPLE_RATE) -> Iterator[Tuple[float, np.ndarray, bool]]:
+    """
+    Lê o áudio em janelas sobrepostas sem carregar o arquivo inteiro.
+
+    Vetores já decodificados (ver `audio_loader.load_audio`) são fatiados sem
+    cópia; visões fatiáveis como `voice_activity.SpeechView` são lidas
+    janela a janela. WAVs PCM 16-bit mono já em 16 kHz (o formato do scraper) são lidos
+    diretamente com o módulo `wave`; qualquer outro formato é decodificado
+    pelo FFmpeg em streaming via pipe.
+
+    Args:
+        audio: Caminho do arquivo de áudio ou vetor float32 a 16 kHz (ou
+            visão fatiável)
+        window_seconds: Tamanho de cada janela em segundos
+        overlap_seconds: Sobreposição entre janelas consecutivas em segundos
+        sample_rate: Taxa de amostragem esperada pelo modelo
+
+    Yields:
+        Tuplas (inicio_em_segundos, amostras_float32, e_ultima_janela)
+    """
+    if overlap_seconds >= window_seconds:
+        raise ValueError("A sobreposição deve ser menor que a janela")
+
+    window = int(window_seconds * sample_rate)
+    step = window - int(overlap_seconds * sample_rate)
+
+    if not isinstance(audio, (str, os.PathLike)):
+        total = audio.shape[0]
+        for offset in range(0, max(total, 1), step):
+            is_last = offset + window >= total
+            yield offset / sample_rate, np.asarray(audio[offset:offset + window]), is_last
+            if is_last:
+                break
+        return
+
+    reader, closer = open_pcm_reader(audio, sample_rate)
+    try:
+        buffer = read_samples(reader, window)
+        offset = 0
+        while buffer.size:
+            fresh = read_samples(reader, step)
+            is_last = fresh.size == 0
+            yield offset / sample_rate, buffer, is_last
+            if is_last:
+                break
+            buffer = np.concatenate((buffer[step:], fresh))
+            offset += step
+    finally:
+        closer()
+
+
+def read_audio_range(audio: Union[str, np.ndarray], start: float, end: float,
+                     sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Lê apenas o trecho [start, end) do áudio.
+
+    Args:
+        audio: Caminho do arquivo de áudio ou vetor float32 a 16 kHz (ou
+            visão fatiável)
+        start: Início do trecho em segundos
+        end: Fim do trecho em segundos
+        sample_rate: Taxa de amostragem esperada pelo modelo
+
+    Returns:
+        Amostras float32 mono do trecho
+    """
+    if not isinstance(audio, (str, os.PathLike)):
+        return np.asarray(audio[int(start * sample_rate):int(end * sample_rate)])
+
+    count = int((end - start) * sample_rate)
+    reader, closer = open_pcm_reader(audio, sample_rate, start)
+    try:
+        return read_samples(reader, count)
+    finally:
+        closer()
+
+
+def open_pcm_reader(audio_path: str, sample_rate: int, start: float = 0.0):
+    """Retorna uma função que lê N bytes de PCM s16le mono e outra que fecha a fonte."""
+    try:
+        wav = wave.open(str(audio_path), 'rb')
+        if (wav.getframerate() == sample_rate and wav.getnchannels() == 1
+                and wav.getsampwidth() == 2 and wav.getcomptype() == 'NONE'):
+            wav.setpos(min(int(start * sample_rate), wav.getnframes()))
+            return (lambda n: wav.readframes(n // 2)), wav.close
+        wav.close()
+    except (wave.Error, EOFError):
+        pass
+
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("FFmpeg não encontrado para decodificar o áudio")
+
+    process = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-loglevel", "error",
+         "-ss", f"{start:.3f}", "-i", str(audio_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"],
+        stdout=subprocess.PIPE,
+    )
+
+    def close():
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+    return process.stdout.read, close
+
+
+def read_samples(read, count: int) -> np.ndarray:
+    """Lê até `count` amostras da fonte PCM e converte para float32 em [-1, 1]."""
+    wanted = count * 2
+    chunks = []
+    while wanted > 0:
+        data = read(wanted)
+        if not data:
+            break
+        chunks.append(data)
+        wanted -= len(data)
+    raw = b"".join(chunks)
+    raw = raw[:len(raw) - len(raw) % 2]
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _normalize_words(text: str) -> List[str]:
+    """Normaliza palavras para comparação (minúsculas e sem pontuação)."""
+    return [re.sub(r"[^\w]", "", word.lower()) for word in text.split()]
+
+
+def strip_repeated_prefix(previous_text: str, text: str,
+                          max_words: int = MAX_OVERLAP_WORDS) -> str:
+    """
+    Remove do início de `text` as palavras que repetem o final de `previous_text`.
+
+    Args:
+        previous_text: Texto já emitido antes da fronteira entre janelas
+        text: Texto do primeiro segmento novo após a fronteira
+        max_words: Maior sequência de palavras considerada
+
+    Returns:
+        Texto sem a repetição
+    """
+    tail = _normalize_words(previous_text)[-max_words:]
+    words = text.split()
+    head = _normalize_words(text)[:max_words]
+
+    for size in range(min(len(tail), len(head)), 0, -1):
+        if tail[-size:] == head[:size]:
+            return " ".join(words[size:])
+    return text
+
+
+class StreamingTranscriber:
+    """Transcreve áudios longos em janelas, com memória constante."""
+
+    def __init__(self, whisper_model, language: str = "pt",
+                 window_seconds: float = 120.0, overlap_seconds: float = 5.0,
+                 prompt_chars: int = 200):
+        """
+        Inicializa o transcritor.
+
+        Args:
+            whisper_model: Modelo Whisper já carregado
+            language: Idioma da transcrição
+            window_seconds: Tamanho de cada janela em segundos
+            overlap_seconds: Sobreposição entre janelas em segundos
+            prompt_chars: Caracteres do texto anterior usados como contexto
+        """
+        self.whisper_model = whisper_model
+        self.language = language
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.prompt_chars = prompt_chars
+
+    def transcribe_window(self, samples: np.ndarray,
+                          initial_prompt: Optional[str] = None) -> List[Dict]:
+        """Transcreve uma janela isolada e devolve os segmentos relativos a ela."""
+        result = self.whisper_model.transcribe(
+            samples,
+            language=self.language,
+            initial_prompt=initial_prompt or None,
+        )
+        return result.get("segments", [])
+
+    def iter_segments(self, audio: Union[str, np.ndarray]) -> Iterator[Dict]:
+        """
+        Gera os segmentos transcritos da gravação inteira.
+
+        Args:
+            audio: Caminho do arquivo de áudio ou vetor float32 a 16 kHz
+
+        Yields:
+            Dicionários com `start`, `end` (absolutos, em segundos) e `text`
+        """
+        committed_end = 0.0
+        previous_text = ""
+
+        for window_start, samples, is_last in iter_audio_windows(
+                audio, self.window_seconds, self.overlap_seconds):
+            window_end = window_start + samples.size / SAMPLE_RATE
+            # Segmentos que começam na sobreposição final serão retranscritos
+            cutoff = window_end if is_last else window_end - self.overlap_seconds
+
+            prompt = previous_text[-self.prompt_chars:]
+            for segment in self.transcribe_window(samples, prompt):
+                start = window_start + segment["start"]
+                end = window_start + segment["end"]
+                text = segment["text"].strip()
+
+                if start >= cutoff or end <= committed_end:
+                    continue
+                if start < committed_end:
+                    text = strip_repeated_prefix(previous_text, text)
+                    start = committed_end
+                if not text:
+                    continue
+
+                committed_end = end
+                previous_text = f"{previous_text} {text}"[-2000:]
+                yield {"start": start, "end": end, "text": text}
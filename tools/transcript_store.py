@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcrição Parcial e Paginada em Disco
+=======================================
+
+Cada trabalho da fila grava a sua transcrição em
+`data/processed/jobs/<codigo>/`, à medida que o pipeline avança:
+
+- `segments.jsonl`: um segmento por linha, acrescentado assim que é
+  transcrito; ao final é substituído (atomicamente) pelos segmentos já
+  alinhados aos participantes
+- `speakers.json`: turnos da diarização, gravados quando ela termina
+
+A interface lê esses arquivos para mostrar o andamento (últimos segmentos e
+estatísticas parciais por participante) e, depois, a transcrição completa
+em páginas, sem carregá-la inteira na memória nem truncá-la.
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories
+
+DEFAULT_JOBS_DIR = Directories.DATA_PROCESSED / "jobs"
+
+
+class TranscriptStore:
+    """Segmentos e turnos de um trabalho, gravados em disco conforme chegam."""
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory: Pasta do trabalho (criada se não existir)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segments_path = self.directory / "segments.jsonl"
+        self.speakers_path = self.directory / "speakers.json"
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_job(cls, job_id: str, jobs_dir: Optional[Path] = None) -> "TranscriptStore":
+        """Armazenamento do trabalho `job_id` em data/processed/jobs."""
+        return cls(Path(jobs_dir or DEFAULT_JOBS_DIR) / job_id)
+
+    def append_segments(self, segments: List[Dict]):
+        """Acrescenta segmentos recém-transcritos (chamado da thread de transcrição)."""
+        with self._lock, open(self.segments_path, 'a', encoding='utf-8') as f:
+            for segment in segments:
+                f.write(json.dumps(
+                    {key: segment[key] for key in ("speaker", "start", "end", "text") if key in segment},
+                    ensure_ascii=False
+                ) + "\n")
+
+    def save_speakers(self, speakers_info: List[Dict]):
+        """Grava os turnos da diarização."""
+        self._write_atomic(self.speakers_path, json.dumps(speakers_info, ensure_ascii=False))
+
+    def write_final(self, segments: List[Dict]):
+        """Substitui os segmentos parciais pelos segmentos finais (alinhados)."""
+        self._write_atomic(self.segments_path, "".join(
+            json.dumps(segment, ensure_ascii=False) + "\n" for segment in segments
+        ))
+
+    def _write_atomic(self, path: Path, content: str):
+        temp_path = path.with_name(path.name + ".tmp")
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+
+    def speakers(self) -> Optional[List[Dict]]:
+        """Turnos da diarização, ou None se ela ainda não terminou."""
+        if not self.speakers_path.exists():
+            return None
+        with open(self.speakers_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _lines(self):
+        if not self.segments_path.exists():
+            return
+        with open(self.segments_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # Linha incompleta: o escritor ainda está gravando
+                if line.endswith("\n"):
+                    yield line
+
+    def count(self) -> int:
+        """Número de segmentos gravados até agora."""
+        return sum(1 for _ in self._lines())
+
+    def segments(self) -> List[Dict]:
+        """Todos os segmentos gravados até agora."""
+        return [json.loads(line) for line in self._lines()]
+
+    def tail(self, count: int) -> List[Dict]:
+        """Os `count` segmentos mais recentes."""
+        return [json.loads(line) for line in deque(self._lines(), maxlen=count)]
+
+    def page(self, page: int, page_size: int = 50) -> List[Dict]:
+        """
+        Uma página da transcrição, lida do disco.
+
+        Args:
+            page: Número da página (a partir de 1)
+            page_size: Segmentos por página
+
+        Returns:
+            Segmentos da página (lista vazia após o fim)
+        """
+        start = (max(page, 1) - 1) * page_size
+        return [json.loads(line) for line in islice(self._lines(), start, start + page_size)]
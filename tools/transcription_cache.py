@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache Persistente de Diarização e Transcrição
+=============================================
+
+Guarda em `data/processed/cache` o resultado da diarização e da transcrição
+de cada áudio já processado. A chave é o hash SHA-256 do conteúdo do áudio
+combinado com o modelo, o idioma e a versão do pipeline, de modo que o mesmo
+arquivo reenviado com outro nome também é reaproveitado.
+
+O índice fica em SQLite (`index.sqlite`, modo WAL), como os demais bancos
+do projeto: o servidor Gradio e o pipeline em lote podem usar o mesmo cache
+ao mesmo tempo, e um acerto atualiza uma única linha em vez de regravar o
+índice inteiro. O hash do conteúdo é memorizado pela identidade do arquivo
+(dispositivo, inode, tamanho e data de modificação), não pelo caminho, e
+memórias sem uso há mais de HASH_MEMO_DAYS dias são descartadas.
+
+O cache tem limite de tamanho e descarta as entradas menos usadas (LRU).
+
+Uso:
+    python transcription_cache.py --stats          # Resumo do cache
+    python transcription_cache.py --list           # Lista as entradas
+    python transcription_cache.py --purge          # Remove todas as entradas
+    python transcription_cache.py --purge-older 30 # Remove entradas sem uso há 30 dias
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import Directories
+
+# Incrementar quando a forma dos resultados mudar, invalidando o cache antigo
+PIPELINE_VERSION = "2"
+
+DEFAULT_CACHE_DIR = Directories.DATA_PROCESSED / "cache"
+DEFAULT_MAX_SIZE_MB = 512
+
+# Dias sem uso após os quais o hash memorizado de um arquivo é esquecido
+HASH_MEMO_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS hashes (
+    fingerprint TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hashes_last_used ON hashes(last_used);
+"""
+
+
+def hash_file(path: str, block_size: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo lendo em blocos."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """Cache em disco, com despejo LRU, dos resultados de diarização e transcrição."""
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório do cache (padrão: data/processed/cache)
+            max_size_mb: Tamanho máximo das entradas em MB
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "index.sqlite"
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._import_legacy_index()
+
+    def _import_legacy_index(self):
+        """Importa as entradas do index.json de versões anteriores e o remove."""
+        legacy_path = self.cache_dir / "index.json"
+        if not legacy_path.exists():
+            return
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            entries = {}
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (key, source, size, created, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, entry.get("source"), entry["size"], entry["created"],
+                  entry["last_access"], entry.get("hits", 0)) for key, entry in entries.items()]
+            )
+        legacy_path.unlink(missing_ok=True)
+
+    def _content_hash(self, audio_path: str) -> str:
+        """Hash do conteúdo, reaproveitado enquanto o arquivo não mudar."""
+        stat = os.stat(audio_path)
+        fingerprint = f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM hashes WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE hashes SET last_used = ? WHERE fingerprint = ?",
+                                   (now, fingerprint))
+                self._conn.commit()
+                return row[0]
+
+        sha256 = hash_file(audio_path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (fingerprint, sha256, last_used) VALUES (?, ?, ?)",
+                (fingerprint, sha256, now)
+            )
+        return sha256
+
+    def make_key(self, audio_path: str, model: str, language: str,
+                 diarization_model: Optional[str] = None,
+                 options: Optional[Dict] = None) -> str:
+        """
+        Gera a chave de cache de um áudio.
+
+        Args:
+            audio_path: Caminho do arquivo de áudio
+            model: Modelo de transcrição
+            language: Idioma da transcrição
+            diarization_model: Modelo de diarização (None se desativada)
+            options: Demais opções que alteram o resultado
+
+        Returns:
+            Chave hexadecimal
+        """
+        content = self._content_hash(audio_path)
+        extra = json.dumps(options or {}, sort_keys=True)
+        settings = f"{content}|{model}|{language}|{diarization_model or 'none'}|{extra}|{PIPELINE_VERSION}"
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retorna o resultado armazenado ou None."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                # Arquivo removido (ou corrompido) por outro processo
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+            return result
+
+    def put(self, key: str, result: Dict, source: Optional[str] = None):
+        """
+        Armazena um resultado e aplica o limite de tamanho.
+
+        Args:
+            key: Chave gerada por make_key
+            result: Dicionário serializável em JSON
+            source: Nome do arquivo de origem (apenas informativo)
+        """
+        path = self._entry_path(key)
+        # Temporário próprio: outro processo pode gravar a mesma chave
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, source, size, created, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, source, path.stat().st_size, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Remove as entradas menos usadas até respeitar o limite de tamanho."""
+        self._conn.execute("DELETE FROM hashes WHERE last_used < ?",
+                           (now - HASH_MEMO_DAYS * 86400,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_size_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def _remove(self, key: str):
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        """
+        Remove entradas do cache.
+
+        Args:
+            older_than_days: Remove apenas entradas sem uso há mais dias
+                que isso (None = remove tudo)
+
+        Returns:
+            Número de entradas removidas
+        """
+        limit = time.time() if older_than_days is None else time.time() - older_than_days * 86400
+        with self._lock, self._conn:
+            keys = [row[0] for row in self._conn.execute(
+                "SELECT key FROM entries WHERE ? OR last_access < ?",
+                (older_than_days is None, limit)
+            )]
+            for key in keys:
+                self._remove(key)
+            self._conn.execute("DELETE FROM hashes WHERE ? OR last_used < ?",
+                               (older_than_days is None, limit))
+        return len(keys)
+
+    def list_entries(self) -> List[Dict]:
+        """Entradas do cache, das mais recentes para as mais antigas."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT key, source, size, created, last_access, hits FROM entries "
+                "ORDER BY last_access DESC"
+            )
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def statistics(self) -> Dict:
+        """Resumo de ocupação do cache."""
+        with self._lock:
+            entries, total, hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM entries"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_mb": round(total / 1024 / 1024, 2),
+            "max_size_mb": round(self.max_size_bytes / 1024 / 1024, 2),
+            "hits": hits,
+            "cache_dir": str(self.cache_dir),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Função principal para inspecionar ou limpar o cache via linha de comando."""
+    parser = argparse.ArgumentParser(description="Cache de diarização e transcrição")
+    parser.add_argument('--stats', action='store_true', help='Mostrar resumo do cache')
+    parser.add_argument('--list', action='store_true', help='Listar as entradas')
+    parser.add_argument('--purge', action='store_true', help='Remover todas as entradas')
+    parser.add_argument('--purge-older', type=float, metavar='DIAS',
+                        help='Remover entradas sem uso há mais de DIAS dias')
+    parser.add_argument('--cache-dir', type=str, help='Diretório do cache')
+    args = parser.parse_args()
+
+    cache = TranscriptionCache(cache_dir=args.cache_dir)
+
+    if args.purge:
+        print(f"🗑️ Entradas removidas: {cache.purge()}")
+    elif args.purge_older is not None:
+        print(f"🗑️ Entradas removidas: {cache.purge(args.purge_older)}")
+
+    if args.list:
+        for entry in cache.list_entries():
+            last_access = time.strftime('%d/%m/%Y %H:%M', time.localtime(entry["last_access"]))
+            print(f"{entry['key'][:12]}  {entry['size'] / 1024:8.1f} KB  "
+                  f"{entry.get('hits', 0):4d} hits  {last_access}  {entry.get('source') or '-'}")
+
+    if args.stats or not (args.list or args.purge or args.purge_older is not None):
+        stats = cache.statistics()
+        print("\n=== CACHE DE TRANSCRIÇÕES ===")
+        print(f"Diretório: {stats['cache_dir']}")
+        print(f"Entradas: {stats['entries']}")
+        print(f"Tamanho: {stats['size_mb']} / {stats['max_size_mb']} MB")
+        print(f"Acertos acumulados: {stats['hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detecção de Atividade de Voz (VAD) antes da Transcrição
+=======================================================
+
+As transmissões dos conselhos têm longas pausas, intervalos e minutos de
+tela parada antes e depois da sessão. Este módulo localiza os trechos com
+fala por energia (limiar adaptativo ao ruído de fundo da gravação) e monta
+uma linha do tempo compacta apenas com a fala:
+
+- `detect_speech` devolve as regiões de fala [(inicio, fim), ...]
+- `SpeechTimeline.compact` concatena as regiões (entrada do Whisper e da
+  diarização) e `map_segments` / `map_turns` levam os tempos de volta para
+  a linha do tempo original
+- `SpeechTimeline.speech_view` é a mesma linha compacta sem cópia: cada
+  fatia é lida das regiões do vetor mapeado sob demanda, mantendo a
+  memória constante no modo streaming; nesse modo a diarização recebe o
+  áudio original e `clip_turns` descarta os turnos fora da fala
+- `pack_regions` agrupa as regiões em blocos para a transcrição paralela
+
+O Whisper processa janelas fixas de 30 s, então concatenar a fala (em vez de
+transcrever cada região isoladamente) evita desperdiçar janelas com trechos
+curtos.
+
+Uso:
+    python voice_activity.py sessao.wav        # Resumo das regiões de fala
+
+Autor: Charlie Rodrigues Fonseca
+Data: Agosto 2025
+"""
+
+import argparse
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+Region = Tuple[float, float]
+
+
+def frame_energy_db(samples: np.ndarray, frame: int, block_frames: int = 20000) -> np.ndarray:
+    """
+    Energia RMS em dBFS por quadro, calculada em blocos (memória constante
+    mesmo para vetores mapeados de sessões de várias horas).
+    """
+    total = samples.shape[0] // frame
+    energy = np.empty(total, dtype=np.float32)
+    for first in range(0, total, block_frames):
+        last = min(first + block_frames, total)
+        block = np.asarray(samples[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        energy[first:last] = np.sqrt(np.mean(block ** 2, axis=1))
+    return 20 * np.log10(energy + 1e-10)
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Sequências contíguas de True como pares (inicio, fim) em índices."""
+    padded = np.concatenate(([False], mask, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(changes[::2], changes[1::2]))
+
+
+def detect_speech(samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                  frame_seconds: float = 0.03, margin_db: float = 10.0,
+                  min_threshold_db: float = -60.0, min_speech_seconds: float = 0.25,
+                  min_silence_seconds: float = 1.0,
+                  padding_seconds: float = 0.3) -> List[Region]:
+    """
+    Localiza as regiões com fala.
+
+    O limiar fica `margin_db` acima do ruído de fundo (percentil 10 da energia
+    dos quadros). Pausas menores que `min_silence_seconds` não interrompem a
+    região, rajadas menores que `min_speech_seconds` são descartadas e cada
+    região ganha `padding_seconds` de margem para não cortar sílabas.
+
+    Args:
+        samples: Áudio float32 mono
+        sample_rate: Taxa de amostragem
+        frame_seconds: Duração de cada quadro de energia
+        margin_db: Distância do limiar em relação ao ruído de fundo
+        min_threshold_db: Limiar mínimo absoluto (gravações quase sem ruído)
+        min_speech_seconds: Duração mínima de uma região de fala
+        min_silence_seconds: Pausa mínima para separar duas regiões
+        padding_seconds: Margem adicionada em cada lado da região
+
+    Returns:
+        Lista de tuplas (inicio, fim) em segundos, ordenadas e sem sobreposição
+    """
+    frame = int(frame_seconds * sample_rate)
+    energy = frame_energy_db(samples, frame)
+    if energy.size == 0:
+        return []
+
+    threshold = max(float(np.percentile(energy, 10)) + margin_db, min_threshold_db)
+    voiced = energy > threshold
+
+    # Preencher pausas curtas dentro da fala
+    max_gap = int(min_silence_seconds / frame_seconds)
+    for start, end in _runs(~voiced):
+        if 0 < start and end < voiced.size and end - start < max_gap:
+            voiced[start:end] = True
+
+    duration = samples.shape[0] / sample_rate
+    min_frames = int(min_speech_seconds / frame_seconds)
+    regions: List[Region] = []
+    for start, end in _runs(voiced):
+        if end - start < min_frames:
+            continue
+        begin = max(0.0, start * frame_seconds - padding_seconds)
+        finish = min(duration, end * frame_seconds + padding_seconds)
+        if regions and begin <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], finish)
+        else:
+            regions.append((begin, finish))
+    return [(round(float(start), 3), round(float(end), 3)) for start, end in regions]
+
+
+class SpeechTimeline:
+    """Linha do tempo compacta (só fala) e conversão de volta para a original."""
+
+    def __init__(self, regions: List[Region], total_seconds: float):
+        """
+        Args:
+            regions: Regiões de fala na linha do tempo original
+            total_seconds: Duração total do áudio original
+        """
+        self.regions = list(regions)
+        self.total_seconds = total_seconds
+        lengths = np.array([end - start for start, end in self.regions], dtype=np.float64)
+        # Início de cada região na linha do tempo compacta
+        self._compact_starts = np.concatenate(([0.0], np.cumsum(lengths)))[:-1]
+        self.speech_seconds = float(lengths.sum())
+
+    @property
+    def skipped_seconds(self) -> float:
+        return max(0.0, self.total_seconds - self.speech_seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Totais de fala e de áudio ignorado, em segundos."""
+        return {
+            "total_seconds": round(self.total_seconds, 1),
+            "speech_seconds": round(self.speech_seconds, 1),
+            "skipped_seconds": round(self.skipped_seconds, 1),
+            "regions": len(self.regions),
+        }
+
+    def compact(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+        """Concatena apenas as regiões de fala."""
+        if not self.regions:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate([
+            np.asarray(samples[int(start * sample_rate):int(end * sample_rate)], dtype=np.float32)
+            for start, end in self.regions
+        ])
+
+    def speech_view(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> "SpeechView":
+        """Linha compacta fatiável, lida de `samples` sob demanda (sem cópia)."""
+        return SpeechView(self.regions, samples, sample_rate)
+
+    def clip_turns(self, turns: List[Dict]) -> List[Dict]:
+        """Turnos da linha original recortados às regiões de fala."""
+        if not self.regions:
+            return []
+        starts = np.array([start for start, _ in self.regions])
+        clipped = []
+        for turn in turns:
+            index = max(0, int(np.searchsorted(starts, turn["start"], side='right')) - 1)
+            while index < len(self.regions) and self.regions[index][0] < turn["end"]:
+                region_start, region_end = self.regions[index]
+                start = float(max(region_start, turn["start"]))
+                end = float(min(region_end, turn["end"]))
+                if end > start:
+                    clipped.append({**turn, "start": start, "end": end, "duration": end - start})
+                index += 1
+        return clipped
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """
+        Converte um instante da linha compacta para a original.
+
+        Em uma junção entre regiões, inícios pertencem à região seguinte e
+        fins à anterior, para que nenhum trecho englobe o silêncio removido.
+        """
+        if not self.regions:
+            return t
+        side = 'left' if is_end else 'right'
+        index = max(0, int(np.searchsorted(self._compact_starts, t, side=side)) - 1)
+        start, end = self.regions[index]
+        return float(min(start + (t - self._compact_starts[index]), end))
+
+    def map_segments(self, segments: List[Dict]) -> List[Dict]:
+        """Segmentos do Whisper (e suas palavras) com tempos da linha original."""
+        mapped = []
+        for segment in segments:
+            segment = dict(segment)
+            segment["start"] = self.to_original(segment["start"])
+            segment["end"] = max(segment["start"], self.to_original(segment["end"], is_end=True))
+            if segment.get("words"):
+                segment["words"] = [
+                    {**word,
+                     "start": self.to_original(word["start"]),
+                     "end": self.to_original(word["end"], is_end=True)}
+                    for word in segment["words"]
+                ]
+            mapped.append(segment)
+        return mapped
+
+    def map_turns(self, turns: List[Dict]) -> List[Dict]:
+        """Turnos da diarização na linha original, divididos nas junções entre regiões."""
+        mapped = []
+        for turn in turns:
+            first = max(0, int(np.searchsorted(self._compact_starts, turn["start"], side='right')) - 1)
+            last = max(0, int(np.searchsorted(self._compact_starts, turn["end"], side='left')) - 1)
+            for index in range(first, last + 1):
+                offset = self._compact_starts[index]
+                region_start, region_end = self.regions[index]
+                start = float(max(region_start, region_start + turn["start"] - offset))
+                end = float(min(region_end, region_start + turn["end"] - offset))
+                if end > start:
+                    mapped.append({**turn, "start": start, "end": end, "duration": end - start})
+        return mapped
+
+
+class SpeechView:
+    """
+    Regiões de fala concatenadas, sem materializar o vetor compacto.
+
+    Aceita `len`, `shape` e fatias contíguas (`view[a:b]`), como um vetor
+    1-D: cada fatia copia apenas as amostras pedidas das regiões de origem.
+    """
+
+    def __init__(self, regions: List[Region], samples: np.ndarray,
+                 sample_rate: int = SAMPLE_RATE):
+        """
+        Args:
+            regions: Regiões de fala na linha do tempo original
+            samples: Áudio original (tipicamente o .npy mapeado)
+            sample_rate: Taxa de amostragem
+        """
+        self.samples = samples
+        # Mesmos limites em amostras que `SpeechTimeline.compact`
+        self._bounds = [(int(start * sample_rate), int(end * sample_rate)) for start, end in regions]
+        lengths = np.array([end - start for start, end in self._bounds], dtype=np.int64)
+        self._offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.shape = (int(self._offsets[-1]),)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key) -> np.ndarray:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("SpeechView aceita apenas fatias contíguas")
+        first, last, _ = key.indices(len(self))
+        if last <= first:
+            return np.zeros(0, dtype=np.float32)
+        index = int(np.searchsorted(self._offsets, first, side='right')) - 1
+        pieces = []
+        while first < last:
+            region_start, region_end = self._bounds[index]
+            skip = first - self._offsets[index]
+            take = min(last - first, region_end - region_start - skip)
+            pieces.append(np.asarray(self.samples[region_start + skip:region_start + skip + take],
+                                     dtype=np.float32))
+            first += take
+            index += 1
+        return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+
+def pack_regions(regions: List[Region], chunk_seconds: float) -> List[List[Region]]:
+    """
+    Agrupa regiões consecutivas em blocos com até `chunk_seconds` de fala.
+
+    Regiões maiores que o bloco são divididas. Cada bloco é transcrito como
+    um único áudio concatenado (ver `SpeechTimeline`).
+    """
+    chunks, current, current_seconds = [], [], 0.0
+    for start, end in regions:
+        while end - start > 0:
+            room = chunk_seconds - current_seconds
+            piece_end = min(end, start + room)
+            current.append((start, piece_end))
+            current_seconds += piece_end - start
+            start = piece_end
+            if current_seconds >= chunk_seconds - 1e-6:
+                chunks.append(current)
+                current, current_seconds = [], 0.0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def main():
+    """Mostra as regiões de fala detectadas em um arquivo."""
+    from audio_loader import load_audio
+
+    parser = argparse.ArgumentParser(description="Detecção de atividade de voz")
+    parser.add_argument('audio', help='Arquivo de áudio')
+    parser.add_argument('--margin-db', type=float, default=10.0, help='Margem acima do ruído de fundo')
+    args = parser.parse_args()
+
+    samples = load_audio(args.audio)
+    regions = detect_speech(samples, margin_db=args.margin_db)
+    timeline = SpeechTimeline(regions, samples.shape[0] / SAMPLE_RATE)
+    summary = timeline.summary()
+    print(f"🎙️ Regiões de fala: {summary['regions']}")
+    print(f"Fala: {summary['speech_seconds'] / 60:.1f} min de {summary['total_seconds'] / 60:.1f} min")
+    print(f"Ignorado: {summary['skipped_seconds'] / 60:.1f} min "
+          f"({100 * summary['skipped_seconds'] / max(summary['total_seconds'], 1e-9):.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,22 @@ Estrutura de saída:
 - data/raw/audio/consu/AAAA-MM-DD_consu_#XX.wav
 - data/raw/audio/conepe/AAAA-MM-DD_conepe_#XX.wav
 
+Os downloads rodam em paralelo (`workers`) e são retomáveis: arquivos
+parciais (.part) continuam de onde pararam e cada download concluído é
+registrado nos metadados imediatamente, de modo que uma execução
+interrompida não baixa novamente o que já terminou.
+
+Os metadados ficam em `data/raw/audio/metadata.sqlite` (metadata_store.py);
+um `metadata.json` de versões anteriores é importado sem ser alterado.
+
+No modo streaming (`--stream`), o fluxo de mídia é lido diretamente pelo
+ffmpeg e reamostrado para 16 kHz mono, gravando o arquivo final (WAV, FLAC
+ou Opus) sem o contêiner intermediário: metade da E/S e do pico de disco.
+
+No modo incremental (`--incremental`), o feed do canal é percorrido do mais
+recente para o mais antigo e a listagem para no primeiro vídeo já conhecido,
+de modo que execuções agendadas buscam apenas as sessões novas.
+
 Autor: Charlie Rodrigues Fonseca
 Data: 24/07/2025
 """
@@ -21,18 +37,39 @@ import os
 import re
 import json
 import logging
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import yt_dlp
 from urllib.parse import urlparse
 
+# Adicionar o diretório src ao path para imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.project_config import YouTubeConfig
+from audio_archive import AUDIO_CODECS, file_sizes
+from metadata_store import MetadataStore
+
+# Listagens do canal já buscadas neste processo (por URL do canal)
+_LISTING_MEMO: Dict[str, Dict] = {}
+
 
 class YouTubeScraper:
     """Scraper para baixar áudios das reuniões CONSU e CONEPE do canal TV UFS."""
     
     CHANNEL_URL = "https://www.youtube.com/@TVUFS/streams"
     
+    # Classe de download do yt-dlp (substituível por um extrator falso em testes)
+    ydl_class = yt_dlp.YoutubeDL
+    
+    # Parâmetros do ffmpeg por formato de saída (16 kHz mono, ver audio_archive.py)
+    AUDIO_CODECS = AUDIO_CODECS
+    
     # Regex simples para identificar vídeos da "Sala dos Conselhos"
     TITULO_PATTERN = re.compile(
         r"^Sala dos Conselhos",
@@ -45,13 +82,25 @@ class YouTubeScraper:
         re.IGNORECASE
     )
     
-    def __init__(self, base_dir: str = None):
+    # Número de sessão dos títulos fora do padrão (seguido do ID do vídeo)
+    NUMERO_FALLBACK = "000"
+    
+    def __init__(self, base_dir: str = None, listing_ttl_minutes: float = 60,
+                 streaming: bool = False, audio_format: str = YouTubeConfig.FORMAT):
         """
         Inicializa o scraper.
         
         Args:
             base_dir: Diretório base do projeto. Se None, detecta automaticamente.
+            listing_ttl_minutes: Validade do cache em disco da listagem do canal
+            streaming: Converter o fluxo de mídia direto para o arquivo final,
+                sem gravar o contêiner original em disco
+            audio_format: Formato de saída (wav, flac ou opus)
         """
+        if audio_format not in self.AUDIO_CODECS:
+            raise ValueError(f"Formato de áudio não suportado: {audio_format}")
+        self.streaming = streaming
+        self.audio_format = audio_format
         if base_dir is None:
             # Detectar o diretório raiz do projeto automaticamente
             # A partir de qualquer lugar, procura pela pasta que contém requirements.txt
@@ -71,6 +120,9 @@ class YouTubeScraper:
         self.consu_dir = self.audio_dir / "consu"
         self.conepe_dir = self.audio_dir / "conepe"
         self.metadata_file = self.audio_dir / "metadata.json"
+        self.metadata_db = self.audio_dir / "metadata.sqlite"
+        self.listing_cache_file = self.base_dir / "data" / "processed" / "channel_listing.json"
+        self.listing_ttl_minutes = listing_ttl_minutes
         
         # Criar diretórios necessários
         self._setup_directories()
@@ -78,7 +130,7 @@ class YouTubeScraper:
         # Configurar logging
         self._setup_logging()
         
-        # Carregar metadados existentes
+        # Abrir metadados existentes (migrando o metadata.json legado)
         self.metadata = self._load_metadata()
     
     def _setup_directories(self):
@@ -101,35 +153,33 @@ class YouTubeScraper:
         )
         self.logger = logging.getLogger(__name__)
     
-    def _load_metadata(self) -> Dict:
-        """Carrega metadados dos downloads anteriores."""
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.warning(f"Erro ao carregar metadados: {e}")
-                return {"downloads": [], "last_update": None}
-        return {"downloads": [], "last_update": None}
+    def _load_metadata(self) -> MetadataStore:
+        """Abre o banco de metadados dos downloads anteriores."""
+        store = MetadataStore(self.metadata_db, self.metadata_file)
+        if store.migrated:
+            self.logger.info(f"{store.migrated} downloads importados de {self.metadata_file}")
+        return store
     
-    def _save_metadata(self):
-        """Salva os metadados dos downloads."""
-        self.metadata["last_update"] = datetime.now().isoformat()
+    def _record_download(self, entry: Dict):
+        """Registra um download concluído (gravação atômica e incremental)."""
         try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+            self.metadata.add(entry)
         except Exception as e:
             self.logger.error(f"Erro ao salvar metadados: {e}")
     
-    def _parse_title(self, title: str) -> Optional[Tuple[str, str, str]]:
+    def _parse_title(self, title: str, video_id: str = "") -> Optional[Tuple[str, str, str, bool]]:
         """
         Extrai informações do título do vídeo.
         
         Args:
             title: Título do vídeo
+            video_id: ID do vídeo, usado no número de sessão de fallback
+                para que títulos fora do padrão não gerem o mesmo arquivo
             
         Returns:
-            Tupla com (data, conselho, numero) ou None se não encontrar padrão
+            Tupla com (data, conselho, numero, detalhado) ou None se não
+            encontrar padrão; `detalhado` indica se o título seguiu o padrão
+            completo ou se data e número vieram do fallback
         """
         # Primeiro verificar se é um vídeo da "Sala dos Conselhos"
         if not self.TITULO_PATTERN.search(title):
@@ -139,7 +189,7 @@ class YouTubeScraper:
         match = self.TITULO_DETALHADO.search(title)
         if match:
             data_str, conselho, numero = match.groups()
-            return data_str, conselho.lower(), numero
+            return data_str, conselho.lower(), numero, True
         
         # Se não conseguir extrair informações detalhadas, 
         # criar valores padrão baseados no título
@@ -152,11 +202,12 @@ class YouTubeScraper:
         elif "CONEPE" in title.upper():
             conselho = "conepe"
         
-        # Usar timestamp atual como fallback para data
+        # Usar timestamp atual como fallback para data; o ID do vídeo
+        # (só letras e dígitos, como o padrão de FileNaming) distingue os arquivos
         data_atual = datetime.now().strftime("%d/%m/%Y")
-        numero_fallback = "000"
+        numero_fallback = self.NUMERO_FALLBACK + re.sub(r"[^0-9A-Za-z]", "", video_id)
         
-        return data_atual, conselho, numero_fallback
+        return data_atual, conselho, numero_fallback, False
     
     def _format_filename(self, data_str: str, conselho: str, numero: str) -> str:
         """
@@ -173,7 +224,7 @@ class YouTubeScraper:
         # Converter data de DD/MM/AAAA para AAAA-MM-DD
         dia, mes, ano = data_str.split('/')
         data_iso = f"{ano}-{mes}-{dia}"
-        return f"{data_iso}_{conselho}_#{numero}.wav"
+        return f"{data_iso}_{conselho}_#{numero}.{self.audio_format}"
     
     def _get_output_path(self, data_str: str, conselho: str, numero: str) -> Path:
         """
@@ -203,19 +254,88 @@ class YouTubeScraper:
         Returns:
             True se já foi baixado, False caso contrário
         """
-        return any(download.get('video_id') == video_id 
-                  for download in self.metadata['downloads'])
+        return video_id in self.metadata
     
-    def get_channel_videos(self, limit: int = 50) -> List[Dict]:
+    def _video_from_entry(self, entry: Dict) -> Optional[Dict]:
         """
-        Obtém lista de vídeos do canal da TV UFS.
+        Converte uma entrada do canal em informações de reunião.
         
         Args:
-            limit: Número máximo de vídeos para processar
+            entry: Entrada do yt-dlp com `id`, `title` e `url`
             
         Returns:
-            Lista de dicionários com informações dos vídeos
+            Dicionário com informações do vídeo ou None se não for uma reunião
+        """
+        if 'status' not in entry:
+            entry = self._classify_entry(entry)
+        if entry['status'] == 'outro':
+            return None
+        return {
+            'video_id': entry['id'],
+            'title': entry['title'],
+            'url': entry['url'],
+            'data': entry['data'],
+            'conselho': entry['conselho'],
+            'numero': entry['numero'],
+            'parsed_info': (entry['data'], entry['conselho'], entry['numero'])
+        }
+    
+    def _classify_entry(self, entry: Dict) -> Dict:
         """
+        Classifica uma entrada do canal uma única vez.
+        
+        Args:
+            entry: Entrada do yt-dlp com `id`, `title` e `url`
+            
+        Returns:
+            Entrada com `status` (padrao_ok, padrao_diferente ou outro) e,
+            para reuniões, `data`, `conselho` e `numero`
+        """
+        classified = {'id': entry['id'], 'title': entry['title'], 'url': entry['url']}
+        parsed = self._parse_title(entry['title'], entry['id'])
+        if not parsed:
+            classified['status'] = 'outro'
+            return classified
+        data, conselho, numero, detalhado = parsed
+        classified.update({
+            'status': 'padrao_ok' if detalhado else 'padrao_diferente',
+            'data': data,
+            'conselho': conselho,
+            'numero': numero
+        })
+        return classified
+    
+    def list_channel(self, limit: int = 100, refresh: bool = False) -> List[Dict]:
+        """
+        Listagem classificada do canal, compartilhada por todos os modos.
+        
+        O feed é buscado no máximo uma vez por processo; entre processos, a
+        listagem fica em cache em disco por `listing_ttl_minutes`. Uma
+        listagem guardada atende pedidos com `limit` menor ou igual ao da
+        busca (ou qualquer `limit`, se o canal inteiro foi lido).
+        
+        Args:
+            limit: Número máximo de vídeos do canal
+            refresh: Ignorar os caches e buscar o feed novamente
+            
+        Returns:
+            Entradas classificadas (ver `_classify_entry`), mais recentes primeiro
+        """
+        def usable(listing: Optional[Dict]) -> bool:
+            if not listing or refresh:
+                return False
+            age = datetime.now() - datetime.fromisoformat(listing['fetched_at'])
+            complete = len(listing['entries']) < listing['limit']
+            return (age.total_seconds() <= self.listing_ttl_minutes * 60
+                    and (listing['limit'] >= limit or complete))
+        
+        listing = _LISTING_MEMO.get(self.CHANNEL_URL)
+        if not usable(listing):
+            listing = self._read_listing_cache()
+        if usable(listing):
+            _LISTING_MEMO[self.CHANNEL_URL] = listing
+            return listing['entries'][:limit]
+        
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -223,36 +343,130 @@ class YouTubeScraper:
             'playlistend': limit,
         }
         
-        videos = []
+        entries = []
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_class(ydl_opts) as ydl:
                 self.logger.info(f"Buscando vídeos do canal: {self.CHANNEL_URL}")
                 
                 # Extrair informações do canal/playlist
                 info = ydl.extract_info(self.CHANNEL_URL, download=False)
                 
-                if 'entries' in info:
-                    for entry in info['entries']:
-                        if entry and 'title' in entry:
-                            # Verificar se é uma reunião do CONSU ou CONEPE
-                            parsed = self._parse_title(entry['title'])
-                            if parsed:
-                                videos.append({
-                                    'video_id': entry['id'],
-                                    'title': entry['title'],
-                                    'url': entry['url'],
-                                    'data': parsed[0],
-                                    'conselho': parsed[1],
-                                    'numero': parsed[2],
-                                    'parsed_info': parsed
-                                })
-                                self.logger.info(f"Encontrado: {entry['title']}")
-                            else:
-                                self.logger.debug(f"Título ignorado: {entry['title']}")
-                
+                for entry in info.get('entries') or []:
+                    if entry and 'title' in entry:
+                        entries.append(self._classify_entry(entry))
         except Exception as e:
             self.logger.error(f"Erro ao buscar vídeos do canal: {e}")
+            return []
+        
+        listing = {'fetched_at': datetime.now().isoformat(), 'limit': limit, 'entries': entries}
+        _LISTING_MEMO[self.CHANNEL_URL] = listing
+        self._write_listing_cache(listing)
+        return entries
+    
+    def _read_listing_cache(self) -> Optional[Dict]:
+        """Listagem do canal guardada em disco, se houver."""
+        if not self.listing_cache_file.exists():
+            return None
+        try:
+            with open(self.listing_cache_file, 'r', encoding='utf-8') as f:
+                listing = json.load(f)
+            return listing if listing.get('channel_url') == self.CHANNEL_URL else None
+        except Exception as e:
+            self.logger.warning(f"Erro ao ler cache da listagem: {e}")
+            return None
+    
+    def _write_listing_cache(self, listing: Dict):
+        """Grava a listagem do canal em disco (substituição atômica)."""
+        try:
+            self.listing_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.listing_cache_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'channel_url': self.CHANNEL_URL, **listing}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.listing_cache_file)
+        except Exception as e:
+            self.logger.warning(f"Erro ao gravar cache da listagem: {e}")
+    
+    def sync_channel_videos(self, max_entries: int = None) -> List[Dict]:
+        """
+        Sincroniza incrementalmente a listagem do canal.
+        
+        Percorre o feed do mais recente para o mais antigo (listagem
+        preguiçosa, sem buscar as páginas seguintes) e para no primeiro vídeo
+        já conhecido. Os vídeos novos e o cursor são gravados nos metadados.
+        
+        Args:
+            max_entries: Máximo de entradas percorridas (None = até um vídeo
+                conhecido ou o fim do canal)
             
+        Returns:
+            Entradas novas do canal (mais recentes primeiro)
+        """
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': True,
+            'lazy_playlist': True,
+        }
+        
+        new_entries = []
+        try:
+            with self.ydl_class(ydl_opts) as ydl:
+                self.logger.info(f"Sincronizando canal (cursor: {self.metadata.sync_cursor})")
+                info = ydl.extract_info(self.CHANNEL_URL, download=False)
+                
+                for entry in info.get('entries') or []:
+                    if not entry or 'title' not in entry:
+                        continue
+                    if self.metadata.is_known(entry['id']):
+                        self.logger.info(f"Vídeo já conhecido alcançado: {entry['title']}")
+                        break
+                    new_entries.append({'id': entry['id'], 'title': entry['title'], 'url': entry['url']})
+                    if max_entries and len(new_entries) >= max_entries:
+                        break
+        except Exception as e:
+            self.logger.error(f"Erro ao sincronizar o canal: {e}")
+            return []
+        
+        if new_entries:
+            self.metadata.add_listed(new_entries, cursor=new_entries[0]['id'])
+        self.logger.info(f"Vídeos novos no canal: {len(new_entries)}")
+        return new_entries
+    
+    def get_channel_videos(self, limit: int = 50, incremental: bool = False) -> List[Dict]:
+        """
+        Obtém lista de vídeos do canal da TV UFS.
+        
+        Args:
+            limit: Número máximo de vídeos para processar
+            incremental: Sincronizar apenas os vídeos novos e retornar todas
+                as reuniões vistas no canal que ainda não foram baixadas
+            
+        Returns:
+            Lista de dicionários com informações dos vídeos
+        """
+        if incremental:
+            first_sync = self.metadata.sync_cursor is None
+            self.sync_channel_videos(max_entries=limit if first_sync else None)
+            videos = []
+            for entry in self.metadata.listed():
+                if entry['id'] in self.metadata:
+                    continue
+                video = self._video_from_entry(entry)
+                if video:
+                    videos.append(video)
+            self.logger.info(f"Reuniões pendentes: {len(videos)}")
+            return videos
+        
+        videos = []
+        for entry in self.list_channel(limit):
+            # Verificar se é uma reunião do CONSU ou CONEPE
+            video = self._video_from_entry(entry)
+            if video:
+                videos.append(video)
+                self.logger.info(f"Encontrado: {entry['title']}")
+            else:
+                self.logger.debug(f"Título ignorado: {entry['title']}")
+        
         self.logger.info(f"Total de reuniões encontradas: {len(videos)}")
         return videos
     
@@ -284,7 +498,7 @@ class YouTubeScraper:
         if output_path.exists():
             self.logger.info(f"Arquivo já existe: {output_path}")
             # Adicionar aos metadados se não estiver lá
-            self.metadata['downloads'].append({
+            self._record_download({
                 'video_id': video_id,
                 'title': video_info['title'],
                 'output_path': str(output_path),
@@ -295,62 +509,235 @@ class YouTubeScraper:
             })
             return True
         
+        try:
+            self.logger.info(f"Baixando: {video_info['title']}")
+            self.logger.info(f"Salvando em: {output_path}")
+            
+            if self.streaming:
+                self._stream_audio(video_info, output_path)
+            else:
+                self._download_and_convert(video_info, output_path)
+            
+            # Verificar se o arquivo foi criado
+            if output_path.exists():
+                sizes = file_sizes(output_path)
+                self.logger.info(f"Download concluído: {output_path} ({sizes['file_size_mb']} MB)")
+                
+                # Adicionar aos metadados
+                self._record_download({
+                    'video_id': video_id,
+                    'title': video_info['title'],
+                    'output_path': str(output_path),
+                    'download_date': datetime.now().isoformat(),
+                    'conselho': video_info['conselho'],
+                    'data_reuniao': video_info['data'],
+                    'numero_sessao': video_info['numero'],
+                    **sizes
+                })
+                
+                return True
+            else:
+                self.logger.error(f"Arquivo não foi criado: {output_path}")
+                return False
+                
+        except Exception as e:
+            self.logger.error(f"Erro ao baixar {video_info['title']}: {e}")
+            return False
+    
+    def _download_and_convert(self, video_info: Dict, output_path: Path):
+        """
+        Baixa o contêiner original (retomável) e o converte com o ffmpeg.
+        
+        Args:
+            video_info: Dicionário com informações do vídeo
+            output_path: Arquivo de áudio final
+        """
+        postprocessor_args = [
+            '-ar', YouTubeConfig.SAMPLE_RATE,  # Sample rate 16kHz (bom para speech recognition)
+            '-ac', YouTubeConfig.CHANNELS,     # Mono
+        ]
+        if self.audio_format == 'opus':
+            postprocessor_args += ['-b:a', YouTubeConfig.OPUS_BITRATE, '-application', 'voip']
+        
         # Configurações do yt-dlp para download de áudio
         ydl_opts = {
             'format': 'bestaudio/best',
             'outtmpl': str(output_path.with_suffix('')),  # Sem extensão, yt-dlp adiciona
+            'continuedl': True,   # Retomar arquivos .part de execuções interrompidas
+            'nopart': False,
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'progress_hooks': [self._progress_hook(video_info)],
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-                'preferredquality': '192',
+                'preferredcodec': self.audio_format,
+                'preferredquality': YouTubeConfig.AUDIO_QUALITY,
             }],
-            'postprocessor_args': [
-                '-ar', '16000',  # Sample rate 16kHz (bom para speech recognition)
-                '-ac', '1',      # Mono
-            ],
+            'postprocessor_args': postprocessor_args,
             'ignoreerrors': False,
         }
         
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self.logger.info(f"Baixando: {video_info['title']}")
-                self.logger.info(f"Salvando em: {output_path}")
-                
-                ydl.download([video_info['url']])
-                
-                # Verificar se o arquivo foi criado
-                if output_path.exists():
-                    file_size = output_path.stat().st_size
-                    self.logger.info(f"Download concluído: {output_path} ({file_size/1024/1024:.1f} MB)")
-                    
-                    # Adicionar aos metadados
-                    self.metadata['downloads'].append({
-                        'video_id': video_id,
-                        'title': video_info['title'],
-                        'output_path': str(output_path),
-                        'download_date': datetime.now().isoformat(),
-                        'conselho': video_info['conselho'],
-                        'data_reuniao': video_info['data'],
-                        'numero_sessao': video_info['numero'],
-                        'file_size_mb': round(file_size/1024/1024, 1)
-                    })
-                    
-                    return True
-                else:
-                    self.logger.error(f"Arquivo não foi criado: {output_path}")
-                    return False
-                    
-        except Exception as e:
-            self.logger.error(f"Erro ao baixar {video_info['title']}: {e}")
-            return False
+        with self.ydl_class(ydl_opts) as ydl:
+            ydl.download([video_info['url']])
+    
+    def _stream_audio(self, video_info: Dict, output_path: Path):
+        """
+        Converte o fluxo de mídia diretamente para o arquivo final.
+        
+        O yt-dlp apenas resolve a URL do melhor áudio; o ffmpeg lê o fluxo
+        (HTTP ou HLS, com reconexão), reamostra para 16 kHz mono e grava em
+        `<arquivo>.part`, renomeado ao final. Uma interrupção recomeça a
+        sessão, pois a conversão não é retomável.
+        
+        Args:
+            video_info: Dicionário com informações do vídeo
+            output_path: Arquivo de áudio final
+            
+        Raises:
+            RuntimeError: Se o ffmpeg falhar
+        """
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            # Formatos que o ffmpeg lê diretamente (sem fragmentos DASH)
+            'format': 'bestaudio[protocol^=http]/bestaudio[protocol*=m3u8]/bestaudio/best',
+        }
+        with self.ydl_class(ydl_opts) as ydl:
+            info = ydl.extract_info(video_info['url'], download=False)
+        
+        media = info['requested_formats'][0] if info.get('requested_formats') else info
+        headers = media.get('http_headers') or info.get('http_headers') or {}
+        part_path = output_path.with_name(output_path.name + '.part')
+        
+        command = ['ffmpeg', '-hide_banner', '-nostdin', '-y', '-loglevel', 'error']
+        if media['url'].startswith('http'):
+            command += ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '30']
+        if headers:
+            command += ['-headers', ''.join(f"{key}: {value}\r\n" for key, value in headers.items())]
+        command += [
+            '-i', media['url'],
+            '-vn', '-ar', YouTubeConfig.SAMPLE_RATE, '-ac', YouTubeConfig.CHANNELS,
+            *self.AUDIO_CODECS[self.audio_format],
+            '-progress', 'pipe:1', '-nostats',
+            str(part_path)
+        ]
+        
+        # Progresso por worker a partir da saída -progress do ffmpeg
+        worker = threading.current_thread().name
+        label = f"{video_info['conselho'].upper()} #{video_info['numero']}"
+        duration = info.get('duration')
+        next_log = 10
+        
+        # stderr vai para um arquivo temporário: um pipe lido só após o fim do
+        # stdout trava o ffmpeg quando ele escreve mais que o buffer do pipe
+        with tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace') as errors:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors, text=True)
+            for line in process.stdout:
+                if not (duration and line.startswith('out_time_us=')):
+                    continue
+                try:
+                    percent = int(line.split('=', 1)[1]) / 1e6 / duration * 100
+                except ValueError:
+                    continue
+                if percent >= next_log:
+                    self.logger.info(f"[{worker}] {label}: {int(percent)}% convertido")
+                    next_log = (int(percent) // 10 + 1) * 10
+            returncode = process.wait()
+            errors.seek(0)
+            stderr = errors.read()
+        
+        if returncode != 0:
+            part_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg falhou: {stderr.strip()[-500:]}")
+        os.replace(part_path, output_path)
     
-    def run_scraper(self, limit: int = 50, download_limit: int = None) -> Dict:
+    def _progress_hook(self, video_info: Dict):
+        """
+        Cria um hook de progresso do yt-dlp que registra o andamento por worker.
+        
+        Args:
+            video_info: Dicionário com informações do vídeo
+            
+        Returns:
+            Função chamada pelo yt-dlp a cada atualização de progresso
+        """
+        label = f"{video_info['conselho'].upper()} #{video_info['numero']}"
+        last_logged = {'percent': -10}
+        
+        def hook(status: Dict):
+            worker = threading.current_thread().name
+            if status.get('status') == 'downloading':
+                total = status.get('total_bytes') or status.get('total_bytes_estimate')
+                if not total:
+                    return
+                percent = int(status.get('downloaded_bytes', 0) * 100 / total)
+                if percent >= last_logged['percent'] + 10:
+                    last_logged['percent'] = percent - percent % 10
+                    self.logger.info(f"[{worker}] {label}: {percent}% "
+                                     f"({status.get('downloaded_bytes', 0)/1024/1024:.1f} MB)")
+            elif status.get('status') == 'finished':
+                self.logger.info(f"[{worker}] {label}: download concluído, convertendo áudio")
+        
+        return hook
+    
+    def download_videos(self, videos: List[Dict], workers: int = 3) -> int:
+        """
+        Baixa uma lista de vídeos com `workers` downloads simultâneos.
+        
+        Cada download concluído é gravado nos metadados assim que termina;
+        arquivos parciais de execuções anteriores são retomados pelo yt-dlp.
+        
+        Args:
+            videos: Lista de dicionários com informações dos vídeos
+            workers: Número de downloads simultâneos
+            
+        Returns:
+            Número de downloads bem-sucedidos
+        """
+        # Vídeos com o mesmo arquivo de saída (ex.: reenvios da mesma sessão)
+        # são baixados em sequência, nunca por dois workers ao mesmo tempo
+        groups: Dict[Path, List[Dict]] = {}
+        for video in videos:
+            output_path = self._get_output_path(video['data'], video['conselho'], video['numero'])
+            groups.setdefault(output_path, []).append(video)
+        
+        successful_downloads = 0
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="download") as executor:
+            futures = {executor.submit(self._download_group, group): group
+                       for group in groups.values()}
+            for future in as_completed(futures):
+                for video, ok in future.result():
+                    completed += 1
+                    if ok:
+                        successful_downloads += 1
+                    self.logger.info(f"Download {completed}/{len(videos)} "
+                                     f"{'concluído' if ok else 'falhou'}: {video['title']}")
+        return successful_downloads
+    
+    def _download_group(self, videos: List[Dict]) -> List[Tuple[Dict, bool]]:
+        """Baixa em sequência vídeos que compartilham o arquivo de saída."""
+        results = []
+        for video in videos:
+            try:
+                ok = self.download_audio(video)
+            except Exception as e:
+                self.logger.error(f"Erro inesperado em {video['title']}: {e}")
+                ok = False
+            results.append((video, ok))
+        return results
+    
+    def run_scraper(self, limit: int = 50, download_limit: int = None,
+                    workers: int = 3, incremental: bool = False) -> Dict:
         """
         Executa o processo completo de scraping.
         
         Args:
             limit: Número máximo de vídeos para buscar
             download_limit: Número máximo de downloads (None = sem limite)
+            workers: Número de downloads simultâneos
+            incremental: Listar apenas os vídeos novos desde a última execução
             
         Returns:
             Dicionário com estatísticas do processo
@@ -358,11 +745,12 @@ class YouTubeScraper:
         self.logger.info("Iniciando processo de scraping...")
         
         # Buscar vídeos
-        videos = self.get_channel_videos(limit)
+        videos = self.get_channel_videos(limit, incremental=incremental)
         
         if not videos:
             self.logger.warning("Nenhum vídeo de reunião encontrado")
-            return {"videos_found": 0, "downloads_attempted": 0, "downloads_successful": 0}
+            return {"videos_found": 0, "downloads_attempted": 0, "downloads_successful": 0,
+                    "total_downloaded": len(self.metadata)}
         
         # Filtrar vídeos já baixados
         videos_to_download = [
@@ -377,24 +765,14 @@ class YouTubeScraper:
             videos_to_download = videos_to_download[:download_limit]
             self.logger.info(f"Limitando downloads a: {download_limit}")
         
-        # Baixar áudios
-        successful_downloads = 0
-        for i, video in enumerate(videos_to_download, 1):
-            self.logger.info(f"Download {i}/{len(videos_to_download)}")
-            if self.download_audio(video):
-                successful_downloads += 1
-            
-            # Salvar metadados a cada download
-            self._save_metadata()
-        
-        # Salvar metadados finais
-        self._save_metadata()
+        # Baixar áudios em paralelo
+        successful_downloads = self.download_videos(videos_to_download, workers)
         
         stats = {
             "videos_found": len(videos),
             "downloads_attempted": len(videos_to_download),
             "downloads_successful": successful_downloads,
-            "total_downloaded": len(self.metadata['downloads'])
+            "total_downloaded": len(self.metadata)
         }
         
         self.logger.info(f"Scraping concluído: {stats}")
@@ -407,23 +785,7 @@ class YouTubeScraper:
         Returns:
             Dicionário com estatísticas detalhadas
         """
-        downloads = self.metadata.get('downloads', [])
-        
-        if not downloads:
-            return {"total": 0, "consu": 0, "conepe": 0}
-        
-        consu_count = sum(1 for d in downloads if d.get('conselho') == 'consu')
-        conepe_count = sum(1 for d in downloads if d.get('conselho') == 'conepe')
-        
-        total_size = sum(d.get('file_size_mb', 0) for d in downloads)
-        
-        return {
-            "total": len(downloads),
-            "consu": consu_count,
-            "conepe": conepe_count,
-            "total_size_mb": round(total_size, 1),
-            "last_update": self.metadata.get('last_update')
-        }
+        return self.metadata.statistics()
     
     def get_all_sala_conselhos_videos(self, limit: int = 100) -> List[Dict]:
         """
@@ -435,62 +797,30 @@ class YouTubeScraper:
         Returns:
             Lista com todos os vídeos encontrados, mesmo os com padrão diferente
         """
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-            'playlistend': limit,
-        }
-
         todos_videos = []
-        videos_padrao = []
-        videos_diferentes = []
-
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self.logger.info(f"Analisando vídeos do canal: {self.CHANNEL_URL}")
-                
-                info = ydl.extract_info(self.CHANNEL_URL, download=False)
-                
-                if 'entries' in info:
-                    for entry in info['entries']:
-                        if entry and 'title' in entry:
-                            title = entry['title']
-                            
-                            # Verificar se é da "Sala dos Conselhos"
-                            if self.TITULO_PATTERN.search(title):
-                                video_info = {
-                                    'video_id': entry['id'],
-                                    'title': title,
-                                    'url': entry['url']
-                                }
-                                
-                                # Tentar fazer parse
-                                parsed = self._parse_title(title)
-                                if parsed and parsed[2] != "000":  # Se conseguiu extrair info real
-                                    video_info.update({
-                                        'data': parsed[0],
-                                        'conselho': parsed[1],
-                                        'numero': parsed[2],
-                                        'status': 'padrao_ok'
-                                    })
-                                    videos_padrao.append(video_info)
-                                else:
-                                    video_info.update({
-                                        'status': 'padrao_diferente'
-                                    })
-                                    videos_diferentes.append(video_info)
-                                
-                                todos_videos.append(video_info)
-                                self.logger.info(f"[{video_info['status']}] {title}")
-
-        except Exception as e:
-            self.logger.error(f"Erro ao analisar vídeos: {e}")
+        for entry in self.list_channel(limit):
+            if entry['status'] == 'outro':
+                continue
+            video_info = {
+                'video_id': entry['id'],
+                'title': entry['title'],
+                'url': entry['url'],
+                'status': entry['status']
+            }
+            if entry['status'] == 'padrao_ok':
+                video_info.update({
+                    'data': entry['data'],
+                    'conselho': entry['conselho'],
+                    'numero': entry['numero']
+                })
+            todos_videos.append(video_info)
+            self.logger.info(f"[{video_info['status']}] {entry['title']}")
 
+        padrao_ok = sum(1 for v in todos_videos if v['status'] == 'padrao_ok')
         self.logger.info(f"=== ANÁLISE COMPLETA ===")
         self.logger.info(f"Total 'Sala dos Conselhos': {len(todos_videos)}")
-        self.logger.info(f"Padrão correto: {len(videos_padrao)}")
-        self.logger.info(f"Padrão diferente: {len(videos_diferentes)}")
+        self.logger.info(f"Padrão correto: {padrao_ok}")
+        self.logger.info(f"Padrão diferente: {len(todos_videos) - padrao_ok}")
 
         return todos_videos
 
@@ -504,6 +834,16 @@ def main():
                        help='Número máximo de vídeos para buscar (padrão: 50)')
     parser.add_argument('--download-limit', type=int, 
                        help='Número máximo de downloads por execução')
+    parser.add_argument('--stream', action='store_true',
+                       help='Converter o fluxo direto para o arquivo final (sem arquivo intermediário)')
+    parser.add_argument('--format', choices=['wav', 'flac', 'opus'], default=YouTubeConfig.FORMAT,
+                       help='Formato do áudio salvo (padrão: wav)')
+    parser.add_argument('--refresh-listing', action='store_true',
+                       help='Ignorar o cache da listagem do canal')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Listar apenas os vídeos novos desde a última execução')
+    parser.add_argument('--workers', type=int, default=3,
+                       help='Downloads simultâneos (padrão: 3)')
     parser.add_argument('--stats-only', action='store_true',
                        help='Mostrar apenas estatísticas sem fazer downloads')
     parser.add_argument('--base-dir', type=str,
@@ -512,7 +852,8 @@ def main():
     args = parser.parse_args()
     
     # Inicializar scraper
-    scraper = YouTubeScraper(base_dir=args.base_dir)
+    scraper = YouTubeScraper(base_dir=args.base_dir, streaming=args.stream,
+                             audio_format=args.format)
     
     if args.stats_only:
         # Mostrar apenas estatísticas
@@ -522,13 +863,19 @@ def main():
         print(f"Reuniões CONSU: {stats['consu']}")
         print(f"Reuniões CONEPE: {stats['conepe']}")
         print(f"Tamanho total: {stats['total_size_mb']} MB")
+        print(f"Tamanho equivalente em WAV: {stats['raw_size_mb']} MB")
         if stats['last_update']:
             print(f"Última atualização: {stats['last_update']}")
     else:
+        if args.refresh_listing:
+            scraper.list_channel(args.limit, refresh=True)
+        
         # Executar scraping
         results = scraper.run_scraper(
             limit=args.limit,
-            download_limit=args.download_limit
+            download_limit=args.download_limit,
+            workers=args.workers,
+            incremental=args.incremental
         )
         
         print("\n=== RESULTADOS DO SCRAPING ===")